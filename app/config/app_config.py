@@ -10,10 +10,23 @@ class AppConfig:
     def __init__(self):
         """Initialize config values when the app starts."""
         self.database_uri = self._get_database_uri()
+        self.replica_uri = os.environ.get("DB_REPLICA_URL") or None
         self.track_modifications = False
         self.echo = os.environ.get("SQL_ECHO") == "1"
         self.secret_key = self._get_secret_key()
         self.reset_db_on_startup = os.environ.get("RESET_DB_ON_STARTUP", "0") == "1"
+        self.auto_migrate = os.environ.get("AUTO_MIGRATE", "1") == "1"
+        self.catalog_cache_ttl = float(os.environ.get("CATALOG_CACHE_TTL", "300"))
+        self.metrics_enabled = os.environ.get("METRICS_ENABLED", "1") == "1"
+        self.slow_query_ms = float(os.environ.get("SLOW_QUERY_MS", "0"))
+        self.lazy_startup = os.environ.get("LAZY_APP", "0") == "1"
+        self.idempotency_ttl = float(os.environ.get("IDEMPOTENCY_TTL", "86400"))
+        self.menu_max_age = int(os.environ.get("MENU_MAX_AGE", "0"))
+        self.columnar_reports = os.environ.get("COLUMNAR_REPORTS", "0") == "1"
+        self.columnar_reports_refresh = float(os.environ.get("COLUMNAR_REPORTS_REFRESH", "1"))
+        self.columnar_reports_reload = float(os.environ.get("COLUMNAR_REPORTS_RELOAD", "300"))
+        self.replica_max_lag = float(os.environ.get("REPLICA_MAX_LAG", "5"))
+        self.replica_check_interval = float(os.environ.get("REPLICA_CHECK_INTERVAL", "1"))
 
     def _get_secret_key(self):
         """Return a configured secret key"""
@@ -26,6 +39,6 @@ class AppConfig:
             return "sqlite:///pizza_ordering.db"
         return os.environ.get("DB_URL", default_mysql)
 
-    def get_masked_uri(self):
+    def get_masked_uri(self, uri=None):
         """Return the database URI with the right credentials"""
-        return re.sub(r"//([^:]+):[^@]*@", r"//\\1:***@", self.database_uri)
+        return re.sub(r"//([^:]+):[^@]*@", r"//\\1:***@", uri or self.database_uri)
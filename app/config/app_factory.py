@@ -1,5 +1,7 @@
 """Flask application factory"""
 
+import threading
+
 from flask import Flask, redirect, render_template, session, url_for
 from pathlib import Path
 from app.config.app_config import AppConfig
@@ -9,14 +11,57 @@ def _register_blueprints(app):
     from app.presentation.controllers.auth import auth_bp
     from app.presentation.controllers.customers import customers_bp
     from app.presentation.controllers.menu import menu_bp
+    from app.presentation.controllers.metrics import metrics_bp
     from app.presentation.controllers.orders import orders_bp
     from app.presentation.controllers.reports import reports_bp
     app.register_blueprint(auth_bp)
     app.register_blueprint(customers_bp)
     app.register_blueprint(menu_bp)
+    app.register_blueprint(metrics_bp)
     app.register_blueprint(orders_bp)
     app.register_blueprint(reports_bp)
 
+def _load_deferred_modules(app):
+    """Import the models and the session hooks that keep in-process caches coherent."""
+    from app.integration.models import import_all_models
+    import_all_models()
+
+    from app.integration.catalog_cache import catalog_cache
+    # Imported for their session hooks, which refresh prices and invalidate dispatchers.
+    from app.integration.repositories import menu_price_repository  # noqa: F401
+    from app.ownership.services import driver_dispatcher  # noqa: F401
+    catalog_cache.configure(ttl_seconds=app.config["CATALOG_CACHE_TTL"])
+
+    from app.integration.columnar_reports import columnar_reports
+
+    columnar_reports.configure(
+        enabled=app.config["COLUMNAR_REPORTS"],
+        refresh_seconds=app.config["COLUMNAR_REPORTS_REFRESH"],
+        reload_seconds=app.config["COLUMNAR_REPORTS_RELOAD"],
+    )
+
+    from app.integration.read_routing import replica_router
+
+    replica_router.configure(
+        max_lag_seconds=app.config["REPLICA_MAX_LAG"],
+        check_interval=app.config["REPLICA_CHECK_INTERVAL"],
+    )
+
+
+def _defer_until_first_request(app):
+    """Run ``_load_deferred_modules`` once, before the first request is handled."""
+    lock = threading.Lock()
+    loaded = []
+
+    @app.before_request
+    def _load_on_first_request():
+        if loaded:
+            return
+        with lock:
+            if not loaded:
+                _load_deferred_modules(app)
+                loaded.append(True)
+
 def create_app():
     """Configure and return Flask application"""
     base_app_dir  = Path(__file__).resolve().parents[1]
@@ -35,25 +80,60 @@ def create_app():
     app.config["SQLALCHEMY_ECHO"] = config.echo
     app.config["SECRET_KEY"] = config.secret_key
     app.config["RESET_DB_ON_STARTUP"] = config.reset_db_on_startup
+    app.config["AUTO_MIGRATE"] = config.auto_migrate
+    app.config["CATALOG_CACHE_TTL"] = config.catalog_cache_ttl
+    app.config["METRICS_ENABLED"] = config.metrics_enabled
+    app.config["SLOW_QUERY_MS"] = config.slow_query_ms
+    app.config["LAZY_APP"] = config.lazy_startup
+    app.config["IDEMPOTENCY_TTL"] = config.idempotency_ttl
+    app.config["MENU_MAX_AGE"] = config.menu_max_age
+    app.config["COLUMNAR_REPORTS"] = config.columnar_reports
+    app.config["COLUMNAR_REPORTS_REFRESH"] = config.columnar_reports_refresh
+    app.config["COLUMNAR_REPORTS_RELOAD"] = config.columnar_reports_reload
+    app.config["REPLICA_MAX_LAG"] = config.replica_max_lag
+    app.config["REPLICA_CHECK_INTERVAL"] = config.replica_check_interval
+    if config.replica_uri:
+        from app.integration.read_routing import REPLICA_BIND
+        # Read-only repository methods use this bind while it keeps up with the primary.
+        app.config["SQLALCHEMY_BINDS"] = {REPLICA_BIND: config.replica_uri}
 
 
     app.config["TEMPLATES_AUTO_RELOAD"] = True
     app.jinja_env.auto_reload = True
 
     app.logger.info(f"Using database URL: {config.get_masked_uri()}")
+    if config.replica_uri:
+        app.logger.info(f"Using replica URL: {config.get_masked_uri(config.replica_uri)}")
 
     from app.integration.models import db
     db.init_app(app)
 
+    # Lazy workers boot on `db` alone and pull in models, services and cache hooks on first use.
+    if config.lazy_startup:
+        _defer_until_first_request(app)
+    else:
+        _load_deferred_modules(app)
+
     with app.app_context():
-        db.create_all()
+        if config.metrics_enabled:
+            from app.presentation.instrumentation import Instrumentation
+            Instrumentation(slow_query_ms=config.slow_query_ms).init_app(app, db.engines.values())
         from app.integration.database_manager import DatabaseManager
-        DatabaseManager(app).setup_schema(reset=config.reset_db_on_startup)
-        from app.integration.models import seed_data
-        seed_data()
+        manager = DatabaseManager(app)
+        # Workers only compare fingerprints; `flask migrate-schema` does the heavy work once per deploy.
+        if config.reset_db_on_startup:
+            manager.migrate(reset=True)
+        elif not manager.schema_is_current():
+            if config.auto_migrate:
+                manager.migrate()
+            else:
+                app.logger.warning("Database schema is out of date; run `flask migrate-schema`.")
 
     _register_blueprints(app)
 
+    from app.presentation.cli import register_commands
+    register_commands(app)
+
     @app.route("/")
     def index():
         """Redirect users to the menu or show the landing page."""
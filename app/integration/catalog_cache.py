@@ -0,0 +1,226 @@
+"""Shared in-process cache of menu prices and dietary flags."""
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.integration.models.ingredient import Ingredient
+from app.integration.models.menu_item import MenuItem
+from app.integration.models.pizza import Pizza, PizzaIngredient, PizzaMenuPrice
+from app.integration.read_routing import use_primary
+from app.integration.repositories.menu_repository import MenuRepository
+
+CATALOG_MODELS = (Ingredient, MenuItem, Pizza, PizzaIngredient, PizzaMenuPrice)
+
+_caches: "weakref.WeakSet[CatalogCache]" = weakref.WeakSet()
+
+
+@dataclass(frozen=True)
+class PizzaSnapshot:
+    """Immutable price and flag information for a single pizza."""
+
+    pizza_id: int
+    pizza_name: Optional[str]
+    calculated_price: Decimal
+    is_vegan: bool
+    is_vegetarian: bool
+    ingredients: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class MenuItemSnapshot:
+    """Immutable price and flag information for a drink, dessert or other extra."""
+
+    item_id: int
+    name: str
+    type: str
+    base_price: Optional[Decimal]
+    is_vegan: bool
+    is_vegetarian: bool
+    active: bool
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """A consistent view of the whole catalog taken at one point in time."""
+
+    version: int
+    loaded_at: float
+    pizzas: Mapping[int, PizzaSnapshot]
+    menu_items: Mapping[int, MenuItemSnapshot]
+
+
+class CatalogCache:
+    """Keep catalog snapshots in memory until they expire or are invalidated."""
+
+    def __init__(
+        self,
+        repository: Optional[MenuRepository] = None,
+        *,
+        ttl_seconds: float = 300.0,
+    ) -> None:
+        """Create an empty cache that loads through ``repository`` on demand."""
+        self._repository = repository or MenuRepository()
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        _caches.add(self)
+
+    @property
+    def enabled(self) -> bool:
+        """True when snapshots may be reused between calls."""
+        return self._ttl_seconds > 0
+
+    @property
+    def version(self) -> int:
+        """Return the current catalog version; it changes on every invalidation."""
+        return self._version
+
+    def configure(self, *, ttl_seconds: float) -> None:
+        """Change the snapshot lifetime and drop whatever is currently cached."""
+        self._ttl_seconds = ttl_seconds
+        self.invalidate()
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Return a fresh catalog snapshot, loading it from the database on a miss."""
+        current = self._snapshot
+        if self._is_fresh(current):
+            self.hits += 1
+            return current
+        with self._lock:
+            current = self._snapshot
+            if self._is_fresh(current):
+                self.hits += 1
+                return current
+            self.misses += 1
+            current = self._load(self._version)
+            self._snapshot = current
+            return current
+
+    def pizzas(self, pizza_ids: Iterable[int]) -> Dict[int, PizzaSnapshot]:
+        """Return snapshots for the requested pizzas that are currently priced."""
+        catalog = self.snapshot().pizzas
+        return {pizza_id: catalog[pizza_id] for pizza_id in pizza_ids if pizza_id in catalog}
+
+    def menu_items(self, item_ids: Iterable[int]) -> Dict[int, MenuItemSnapshot]:
+        """Return snapshots for the requested menu items that exist."""
+        catalog = self.snapshot().menu_items
+        return {item_id: catalog[item_id] for item_id in item_ids if item_id in catalog}
+
+    def invalidate(self) -> None:
+        """Discard the cached snapshot so the next read reloads it."""
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss and invalidation counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "version": self._version,
+        }
+
+    def _is_fresh(self, snapshot: Optional[CatalogSnapshot]) -> bool:
+        """Check the snapshot against the current version and the TTL."""
+        if snapshot is None or not self.enabled:
+            return False
+        if snapshot.version != self._version:
+            return False
+        return time.monotonic() - snapshot.loaded_at < self._ttl_seconds
+
+    def _load(self, version: int) -> CatalogSnapshot:
+        """Build a new snapshot from the repository.
+
+        Always read from the primary: checkout prices from this snapshot, and a
+        lagging replica would cache pre-change prices under the new version.
+        """
+        with use_primary():
+            return self._build(version)
+
+    def _build(self, version: int) -> CatalogSnapshot:
+        pizzas = {
+            row["pizza_id"]: PizzaSnapshot(
+                pizza_id=row["pizza_id"],
+                pizza_name=row["pizza_name"],
+                calculated_price=row["calculated_price"],
+                is_vegan=bool(row["is_vegan"]),
+                is_vegetarian=bool(row["is_vegetarian"]),
+                ingredients=tuple(row["ingredients"]),
+            )
+            for row in self._repository.fetch_pizza_catalog()
+        }
+        menu_items = {
+            row["item_id"]: MenuItemSnapshot(
+                item_id=row["item_id"],
+                name=row["name"],
+                type=row["type"],
+                base_price=row["base_price"],
+                is_vegan=bool(row["is_vegan"]),
+                is_vegetarian=bool(row["is_vegetarian"]),
+                active=bool(row["active"]),
+            )
+            for row in self._repository.fetch_menu_item_catalog()
+        }
+        return CatalogSnapshot(
+            version=version,
+            loaded_at=time.monotonic(),
+            pizzas=MappingProxyType(pizzas),
+            menu_items=MappingProxyType(menu_items),
+        )
+
+
+def invalidate_catalog_caches() -> None:
+    """Invalidate every catalog cache living in this process."""
+    for cache in list(_caches):
+        cache.invalidate()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_catalog_changes(session, flush_context) -> None:
+    """Remember whether the flush touched any table the catalog is built from."""
+    if session.info.get("catalog_changed"):
+        return
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, CATALOG_MODELS):
+            session.info["catalog_changed"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session) -> None:
+    """Drop cached snapshots once catalog changes are committed."""
+    if session.info.pop("catalog_changed", False):
+        invalidate_catalog_caches()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_catalog_changes(session) -> None:
+    """Forget pending catalog changes that were rolled back."""
+    session.info.pop("catalog_changed", None)
+
+
+catalog_cache = CatalogCache()
+
+__all__ = [
+    "CatalogCache",
+    "CatalogSnapshot",
+    "MenuItemSnapshot",
+    "PizzaSnapshot",
+    "catalog_cache",
+    "invalidate_catalog_caches",
+]
@@ -0,0 +1,366 @@
+"""Array-backed, in-memory column store answering the staff reports."""
+from __future__ import annotations
+
+import threading
+import time
+from array import array
+from datetime import date, datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+
+from app.integration.models import db
+from app.integration.models.customer import Customer
+from app.integration.models.order import Order, OrderItem
+from app.integration.models.pizza import Pizza
+from app.integration.models.postcode import Postcode
+from app.integration.repositories.earnings_rollup_repository import AGE_GROUPS, age_group_label, gender_label
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_CENT = Decimal("0.01")
+_NO_CUSTOMER = -1
+_STREAM_ROWS = 5000
+
+
+def _timestamp(value: datetime) -> int:
+    """Exact integer microseconds since the epoch for a naive UTC datetime."""
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _month_key(year: int, month: int) -> int:
+    return year * 12 + month - 1
+
+
+def _month_days(key: int) -> range:
+    """Day ordinals of the month identified by ``key``."""
+    year, month = divmod(key, 12)
+    first = date(year, month + 1, 1)
+    following = date(year + 1, 1, 1) if month == 11 else date(year, month + 2, 1)
+    return range(first.toordinal(), following.toordinal())
+
+
+def _cents(value: object) -> int:
+    """Whole cents of a money value, whatever numeric type the driver returned."""
+    return int((Decimal(str(value)) * 100).to_integral_value(ROUND_HALF_UP))
+
+
+def _money(cents: int) -> Decimal:
+    return (Decimal(cents) / 100).quantize(_CENT)
+
+
+class _Labels:
+    """Interns repeated strings as small integer codes."""
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class _Columns:
+    """One snapshot: a column per order attribute plus the orders' pizza lines.
+
+    Row ``i`` of every order column describes the same order; rows are kept in
+    ``Order_ID`` order. The pizza lines of row ``i`` are the slice
+    ``pizza_end[i - 1]:pizza_end[i]`` of the line columns.
+    """
+
+    def __init__(self) -> None:
+        self.order_id = array("q")
+        self.placed_at = array("q")
+        self.failed = array("b")
+        self.gender = array("h")
+        self.age_group = array("b")
+        self.postcode = array("l")
+        self.revenue = array("q")
+        self.line_count = array("l")
+        self.pizza_end = array("l")
+        self.pizza_id = array("l")
+        self.pizza_quantity = array("l")
+        self.pizza_revenue = array("q")
+        # Row numbers per day ordinal, so a report scans only its own days.
+        self.days: Dict[int, array] = {}
+        self.genders = _Labels()
+        self.postcodes = _Labels()
+        self.pizza_names: Dict[int, str] = {}
+        # Aggregates per month and per day, dropped when new orders land in them.
+        self.earnings: Dict[int, Dict[str, Dict[int, List[int]]]] = {}
+        self.day_pizzas: Dict[int, Dict[int, List[int]]] = {}
+
+    @property
+    def high_water(self) -> int:
+        return self.order_id[-1] if self.order_id else 0
+
+
+class ColumnarOrderStore:
+    """Keep orders and pizza lines as compact columns and aggregate them in memory.
+
+    The snapshot grows incrementally: each refresh reads only orders above
+    the highest ``Order_ID`` already held. Status or customer changes to
+    existing orders are picked up by a full reload every ``reload_seconds``.
+    Aggregations follow the staff reporting views: failed orders and orders
+    without lines are left out of earnings, gender and age group need the
+    customer, and top pizzas only count lines whose pizza still exists.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = False,
+        refresh_seconds: float = 1.0,
+        reload_seconds: float = 300.0,
+    ) -> None:
+        """Create an empty store; nothing is loaded until the first report."""
+        self._enabled = enabled
+        self._refresh_seconds = refresh_seconds
+        self._reload_seconds = reload_seconds
+        self._lock = threading.Lock()
+        self._columns: Optional[_Columns] = None
+        self._loaded_at = 0.0
+        self._refreshed_at = 0.0
+        self.full_loads = 0
+        self.incremental_loads = 0
+
+    @property
+    def enabled(self) -> bool:
+        """True when reports should be answered from memory."""
+        return self._enabled
+
+    def configure(self, *, enabled: bool, refresh_seconds: float, reload_seconds: float) -> None:
+        """Switch the store on or off and drop whatever it holds."""
+        with self._lock:
+            self._enabled = enabled
+            self._refresh_seconds = refresh_seconds
+            self._reload_seconds = reload_seconds
+            self._columns = None
+
+    def invalidate(self) -> None:
+        """Forget the snapshot so the next report reloads everything."""
+        with self._lock:
+            self._columns = None
+
+    def stats(self) -> Dict[str, int]:
+        """Return the snapshot size and load counters."""
+        columns = self._columns
+        return {
+            "orders": len(columns.order_id) if columns else 0,
+            "pizza_lines": len(columns.pizza_id) if columns else 0,
+            "full_loads": self.full_loads,
+            "incremental_loads": self.incremental_loads,
+        }
+
+    def earnings(self, dimension: str, year: int, month: int) -> List[Dict[str, object]]:
+        """One month of earnings for ``dimension``, shaped like the rollup rows."""
+        with self._lock:
+            columns = self._refreshed()
+            key = _month_key(year, month)
+            totals = columns.earnings.get(key)
+            if totals is None:
+                totals = columns.earnings[key] = self._aggregate_month(columns, key)
+            labels = {
+                "gender": columns.genders.values,
+                "age_group": AGE_GROUPS,
+                "postcode": columns.postcodes.values,
+            }[dimension]
+            return [
+                {
+                    "report_year": year,
+                    "report_month": month,
+                    dimension: labels[code],
+                    "order_count": count,
+                    "revenue": _money(cents),
+                }
+                for code, (count, cents) in totals[dimension].items()
+            ]
+
+    @staticmethod
+    def _aggregate_month(columns: _Columns, key: int) -> Dict[str, Dict[int, List[int]]]:
+        """Order counts and revenue per label code for every dimension in one pass."""
+        totals: Dict[str, Dict[int, List[int]]] = {"gender": {}, "age_group": {}, "postcode": {}}
+        by_gender, by_age, by_postcode = totals["gender"], totals["age_group"], totals["postcode"]
+        failed, line_count, order_revenue = columns.failed, columns.line_count, columns.revenue
+        gender, age_group, postcode = columns.gender, columns.age_group, columns.postcode
+        for row in (row for day in _month_days(key) for row in columns.days.get(day, ())):
+            if failed[row] or not line_count[row]:
+                continue
+            cents = order_revenue[row]
+            buckets = [by_postcode.setdefault(postcode[row], [0, 0])]
+            if gender[row] != _NO_CUSTOMER:
+                buckets.append(by_gender.setdefault(gender[row], [0, 0]))
+                buckets.append(by_age.setdefault(age_group[row], [0, 0]))
+            for bucket in buckets:
+                bucket[0] += 1
+                bucket[1] += cents
+        return totals
+
+    def top_pizzas(self, start: datetime, end: datetime, limit: int) -> List[Dict[str, object]]:
+        """Best-selling pizzas for orders placed within ``[start, end)``.
+
+        Whole days inside the range reuse per-day totals; only the first and
+        last day are filtered row by row.
+        """
+        low, high = _timestamp(start), _timestamp(end)
+        first_day, last_day = start.toordinal(), end.toordinal()
+        totals: Dict[int, List[int]] = {}
+        with self._lock:
+            columns = self._refreshed()
+            for day in range(first_day, last_day + 1):
+                if first_day < day < last_day:
+                    day_totals = columns.day_pizzas.get(day)
+                    if day_totals is None:
+                        day_totals = columns.day_pizzas[day] = self._pizza_totals(columns, day)
+                else:
+                    day_totals = self._pizza_totals(columns, day, low, high)
+                for pid, (quantity, cents) in day_totals.items():
+                    bucket = totals.setdefault(pid, [0, 0])
+                    bucket[0] += quantity
+                    bucket[1] += cents
+            names = columns.pizza_names
+        ranked = sorted(
+            (pid for pid in totals if pid in names),
+            key=lambda pid: (-totals[pid][0], pid),
+        )[:limit]
+        return [
+            {
+                "pizza_id": pid,
+                "pizza_name": names[pid],
+                "total_quantity": totals[pid][0],
+                "pizza_revenue": _money(totals[pid][1]),
+            }
+            for pid in ranked
+        ]
+
+    @staticmethod
+    def _pizza_totals(
+        columns: _Columns,
+        day: int,
+        low: Optional[int] = None,
+        high: Optional[int] = None,
+    ) -> Dict[int, List[int]]:
+        """Quantity and revenue per pizza for one day's non-failed orders, optionally within ``[low, high)``."""
+        totals: Dict[int, List[int]] = {}
+        placed_at, failed, pizza_end = columns.placed_at, columns.failed, columns.pizza_end
+        pizza_id, pizza_quantity, pizza_revenue = columns.pizza_id, columns.pizza_quantity, columns.pizza_revenue
+        for row in columns.days.get(day, ()):
+            if failed[row] or (low is not None and not low <= placed_at[row] < high):
+                continue
+            for line in range(pizza_end[row - 1] if row else 0, pizza_end[row]):
+                bucket = totals.setdefault(pizza_id[line], [0, 0])
+                bucket[0] += pizza_quantity[line]
+                bucket[1] += pizza_revenue[line]
+        return totals
+
+    def _refreshed(self) -> _Columns:
+        """Return the snapshot after a full or incremental load as due; the lock is held."""
+        now = time.monotonic()
+        if self._columns is None or now - self._loaded_at >= self._reload_seconds:
+            columns = _Columns()
+            self._load_pizza_names(columns)
+            self._append_orders(columns)
+            self._columns, self._loaded_at, self._refreshed_at = columns, now, now
+            self.full_loads += 1
+        elif now - self._refreshed_at >= self._refresh_seconds:
+            if self._append_orders(self._columns):
+                self.incremental_loads += 1
+            self._refreshed_at = now
+        return self._columns
+
+    @staticmethod
+    def _load_pizza_names(columns: _Columns) -> None:
+        columns.pizza_names = dict(db.session.execute(select(Pizza.pizza_id, Pizza.pizza_name)).all())
+
+    def _append_orders(self, columns: _Columns) -> int:
+        """Append every order above the high-water mark, then its lines; returns the count."""
+        after = columns.high_water
+        first_row = len(columns.order_id)
+        orders = db.session.execute(
+            select(
+                Order.order_id,
+                Order.placed_at,
+                Order.status,
+                Order.customer_id,
+                Customer.customer_id.label("known_customer"),
+                Customer.gender,
+                Customer.birthdate,
+                Postcode.postcode,
+            )
+            .outerjoin(Customer, Customer.customer_id == Order.customer_id)
+            .outerjoin(Postcode, Postcode.postcode_id == Order.delivery_postcode_id)
+            .where(Order.order_id > after)
+            .order_by(Order.order_id)
+            .execution_options(stream_results=True, yield_per=_STREAM_ROWS)
+        )
+        for order in orders:
+            row = len(columns.order_id)
+            columns.order_id.append(order.order_id)
+            columns.placed_at.append(_timestamp(order.placed_at))
+            columns.failed.append(order.status == "failed")
+            if order.known_customer is None:
+                columns.gender.append(_NO_CUSTOMER)
+                columns.age_group.append(_NO_CUSTOMER)
+            else:
+                columns.gender.append(columns.genders.code(gender_label(order.gender)))
+                columns.age_group.append(AGE_GROUPS.index(age_group_label(order.birthdate, order.placed_at)))
+            columns.postcode.append(columns.postcodes.code(order.postcode or ""))
+            columns.revenue.append(0)
+            columns.line_count.append(0)
+            columns.pizza_end.append(len(columns.pizza_id))
+            day = order.placed_at.toordinal()
+            columns.days.setdefault(day, array("l")).append(row)
+            columns.day_pizzas.pop(day, None)
+            columns.earnings.pop(_month_key(order.placed_at.year, order.placed_at.month), None)
+
+        loaded = len(columns.order_id) - first_row
+        if not loaded:
+            return 0
+
+        lines = db.session.execute(
+            select(
+                OrderItem.order_id,
+                OrderItem.item_type,
+                OrderItem.pizza_id,
+                OrderItem.quantity,
+                OrderItem.unit_price,
+                OrderItem.discount_amount,
+            )
+            .where(OrderItem.order_id > after, OrderItem.order_id <= columns.high_water)
+            .order_by(OrderItem.order_id, OrderItem.order_item_id)
+            .execution_options(stream_results=True, yield_per=_STREAM_ROWS)
+        )
+        # Both streams are in Order_ID order, so lines are matched by walking forward.
+        row = first_row
+        order_ids, pizza_end = columns.order_id, columns.pizza_end
+        new_pizzas = False
+        for line in lines:
+            while order_ids[row] < line.order_id:
+                row += 1
+                pizza_end[row] = len(columns.pizza_id)
+            line_cents = _cents(line.unit_price) * line.quantity - _cents(line.discount_amount)
+            columns.revenue[row] += line_cents
+            columns.line_count[row] += 1
+            if line.item_type == "pizza" and line.pizza_id is not None:
+                columns.pizza_id.append(line.pizza_id)
+                columns.pizza_quantity.append(line.quantity)
+                columns.pizza_revenue.append(line_cents)
+                pizza_end[row] = len(columns.pizza_id)
+                new_pizzas = new_pizzas or line.pizza_id not in columns.pizza_names
+        # Rows after the last one with lines end where the line columns end.
+        for later in range(row + 1, len(order_ids)):
+            pizza_end[later] = len(columns.pizza_id)
+        if new_pizzas:
+            # A pizza created since the last full load.
+            self._load_pizza_names(columns)
+        return loaded
+
+
+columnar_reports = ColumnarOrderStore()
+
+__all__ = ["ColumnarOrderStore", "columnar_reports"]
@@ -1,12 +1,52 @@
 """Utility class for the database."""
 
+import hashlib
+from datetime import datetime
 from pathlib import Path
 
-from sqlalchemy import inspect, text
-from sqlalchemy.exc import OperationalError
+from sqlalchemy import inspect, select, text
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
 
 from app.integration.models import db
 
+INTEGRATION_DIR = Path(__file__).resolve().parent
+SCHEMA_VERSION_ID = 1
+
+# Code outside the models that ``migrate`` runs to build or backfill tables; a
+# change to any of it (such as the menu price formula) must trigger a migration.
+MIGRATION_MODULES = (
+    "repositories/menu_price_repository.py",
+    "repositories/earnings_rollup_repository.py",
+    "sql_loader.py",
+)
+
+# Indexes earlier releases created that no query uses any more; they only cost writes.
+RETIRED_INDEXES = (
+    # Dispatch loads the whole roster; claim_driver updates by primary key.
+    ("delivery_person", "ix_delivery_person_unavailable_until"),
+    ("delivery_person_postcode", "ix_delivery_person_postcode_postcode"),
+)
+
+
+def schema_fingerprint() -> str:
+    """Hash the model sources, SQL scripts and the code that applies them without importing anything."""
+    sources = sorted(
+        [
+            *(INTEGRATION_DIR / "models").glob("*.py"),
+            *(INTEGRATION_DIR / "sql").glob("*.sql"),
+            *(INTEGRATION_DIR / module for module in MIGRATION_MODULES),
+            Path(__file__).resolve(),
+        ]
+    )
+    digest = hashlib.sha256()
+    for path in sources:
+        digest.update(path.relative_to(INTEGRATION_DIR).as_posix().encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
 class DatabaseManager:
     """Coordinate schema preparation and compatibility tasks"""
 
@@ -15,17 +55,57 @@ class DatabaseManager:
         self.app = app
         self._using_sqlite = str(app.config.get("SQLALCHEMY_DATABASE_URI", "")).startswith("sqlite")
 
-    def execute_sql_file(self, path):
-        """Run SQL statements contained in the given file."""
-        with open(path, "r", encoding="utf-8") as f:
-            sql_script = f.read()
-        for stmt in [s.strip() for s in sql_script.split(";") if s.strip()]:
-            normalized = self._prepare_statement(stmt)
-            db.session.execute(text(normalized))
+    def schema_is_current(self) -> bool:
+        """True when the recorded schema fingerprint matches the code on disk."""
+        from app.integration.models.schema_version import SchemaVersion
+
+        try:
+            # Core columns keep this check from configuring (and importing) every mapper.
+            table = SchemaVersion.__table__
+            stored = db.session.execute(
+                select(table.c.fingerprint).where(table.c.version_id == SCHEMA_VERSION_ID)
+            ).scalar()
+            db.session.commit()
+        except (OperationalError, ProgrammingError):
+            # The schema_version table does not exist before the first migration.
+            db.session.rollback()
+            return False
+        return stored == schema_fingerprint()
+
+    def migrate(self, *, reset: bool = False) -> str:
+        """Create, reconcile and seed the schema, then record its fingerprint."""
+        from app.integration.models import import_all_models, seed_data
+        from app.integration.models.schema_version import SchemaVersion
+
+        import_all_models()
+        db.create_all()
+        self.setup_schema(reset=reset)
+        seed_data()
+
+        fingerprint = schema_fingerprint()
+        db.session.merge(
+            SchemaVersion(
+                version_id=SCHEMA_VERSION_ID,
+                fingerprint=fingerprint,
+                applied_at=datetime.utcnow(),
+            )
+        )
         db.session.commit()
+        return fingerprint
+
+    def execute_sql_file(self, path, **options):
+        """Stream the statements in ``path`` into the database and return the load report."""
+        from app.integration.sql_loader import SqlLoader
+
+        # The loader runs on its own connection; release the session's locks first.
+        db.session.commit()
+        return SqlLoader(db.engine, **options).load_path(path)
 
     def setup_schema(self, *, reset: bool = True):
         """Ensure correct inputs"""
+        from app.integration.catalog_cache import invalidate_catalog_caches
+        from app.integration.repositories.earnings_rollup_repository import EarningsRollupRepository
+
         try:
             config_root = Path(self.app.root_path).resolve()
             sql_dir = config_root.parent / "integration" / "sql"
@@ -34,10 +114,15 @@ class DatabaseManager:
             pizza_seed_path = sql_dir / "seed_pizzas.sql"
             orders_seed_path = sql_dir / "seed_orders.sql"
             self._drop_reporting_views()
+            self._ensure_menu_price_table()
             if reset:
                 self._rebuild_order_tables()
             self._sync_discount_table()
-            if view_path.exists():
+            self._sync_order_jobs_table()
+            self._drop_retired_indexes()
+            self._ensure_indexes()
+            # The staff views use MySQL date functions; the app itself no longer reads them.
+            if view_path.exists() and not self._using_sqlite:
                 self.execute_sql_file(view_path)
             should_seed = reset or self._needs_initial_seed()
             if should_seed and seed_path.exists():
@@ -46,7 +131,13 @@ class DatabaseManager:
                 self.execute_sql_file(pizza_seed_path)
             if should_seed and orders_seed_path.exists():
                 self.execute_sql_file(orders_seed_path)
+            self._normalize_discount_codes()
+            self.refresh_menu_prices()
+            if should_seed or EarningsRollupRepository().is_empty():
+                self.rebuild_earnings_rollup()
             self._reset_driver_availability()
+            # Seed files bypass the ORM, so cached menu snapshots cannot notice them.
+            invalidate_catalog_caches()
         except OperationalError as e:
             self.app.logger.error("Database setup failed: %s", e)
             raise
@@ -55,30 +146,62 @@ class DatabaseManager:
             self._ensure_discount_code_schema()
             self._ensure_customer_pk_autoincrement()
 
-    def _prepare_statement(self, statement: str) -> str:
-        """Normalize SQL when running against SQLite."""
-        if not self._using_sqlite:
-            return statement
-        return (
-            statement.replace("INSERT IGNORE", "INSERT OR IGNORE")
-            .replace("NOW()", "CURRENT_TIMESTAMP")
-        )
+    def refresh_menu_prices(self) -> None:
+        """Recompute every row of the materialized pizza_menu_prices table."""
+        from app.integration.repositories.menu_price_repository import MenuPriceRepository
 
-    def _drop_menu_price_table(self) -> None:
-        """Remove compatibility artifacts for the legacy menu price view."""
         try:
-            db.session.execute(text("DROP VIEW IF EXISTS pizza_menu_prices"))
+            MenuPriceRepository().refresh()
             db.session.commit()
         except OperationalError:
             db.session.rollback()
+            raise
+
+    def rebuild_earnings_rollup(self, *, year: int | None = None, month: int | None = None) -> int:
+        """Recompute the monthly earnings rollup from the orders table."""
+        from app.integration.repositories.earnings_rollup_repository import EarningsRollupRepository
+
         try:
-            db.session.execute(text("DROP TABLE IF EXISTS pizza_menu_prices"))
+            written = EarningsRollupRepository().rebuild(year=year, month=month)
             db.session.commit()
         except OperationalError:
             db.session.rollback()
+            raise
+        return written
+
+    def _ensure_indexes(self) -> None:
+        """Create indexes declared on the models that existing tables are missing."""
+        inspector = inspect(db.engine)
+        for table in db.metadata.sorted_tables:
+            if not table.indexes or not inspector.has_table(table.name):
+                continue
+            existing = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(bind=db.engine)
+
+    def _drop_retired_indexes(self) -> None:
+        """Drop indexes listed in ``RETIRED_INDEXES`` from existing tables."""
+        inspector = inspect(db.engine)
+        for table_name, index_name in RETIRED_INDEXES:
+            if not inspector.has_table(table_name):
+                continue
+            if index_name not in {index["name"] for index in inspector.get_indexes(table_name)}:
+                continue
+            if self._using_sqlite:
+                db.session.execute(text(f"DROP INDEX {index_name}"))
+            else:
+                db.session.execute(text(f"DROP INDEX {index_name} ON {table_name}"))
+            db.session.commit()
+
+    def _ensure_menu_price_table(self) -> None:
+        """Create the pizza_menu_prices table once the legacy view is gone."""
+        from app.integration.models.pizza import PizzaMenuPrice
+
+        PizzaMenuPrice.__table__.create(bind=db.engine, checkfirst=True)
 
     def _drop_reporting_views(self) -> None:
-        """Drop reporting views so they can be recreated with up-to-date SQL."""
+        """Drop reporting views (and the legacy pizza_menu_prices view) before recreating them."""
         inspector = inspect(db.engine)
         existing_views = set(inspector.get_view_names()) if hasattr(inspector, "get_view_names") else set()
 
@@ -97,8 +220,6 @@ class DatabaseManager:
                     db.session.commit()
                 except OperationalError:
                     db.session.rollback()
-        # Drop any lingering compatibility table created for pizza_menu_prices
-        self._drop_menu_price_table()
 
     def _ensure_order_discount_nullable(self) -> None:
         """Allow orders with no discount codes."""
@@ -301,6 +422,16 @@ class DatabaseManager:
         OrderItem.__table__.create(bind=engine, checkfirst=True)
         db.session.commit()
 
+    def _normalize_discount_codes(self) -> None:
+        """Store discount codes trimmed and upper case so lookups can match them exactly."""
+        try:
+            db.session.execute(text("UPDATE discount_code SET code = UPPER(TRIM(code))"))
+            db.session.commit()
+        except IntegrityError:
+            # Two codes differing only in case or spacing; they must be merged by hand.
+            db.session.rollback()
+            self.app.logger.error("Discount codes collide once normalized; left unchanged.")
+
     def _sync_discount_table(self) -> None:
         inspector = inspect(db.engine)
         if not inspector.has_table("discount_code"):
@@ -309,3 +440,14 @@ class DatabaseManager:
         if "redeemed_at" not in columns:
             db.session.execute(text("ALTER TABLE discount_code ADD COLUMN redeemed_at DATETIME NULL"))
             db.session.commit()
+
+    def _sync_order_jobs_table(self) -> None:
+        inspector = inspect(db.engine)
+        if not inspector.has_table("order_jobs"):
+            return
+        columns = {col["name"].lower() for col in inspector.get_columns("order_jobs")}
+        if "idempotency_key" not in columns:
+            db.session.execute(text("ALTER TABLE order_jobs ADD COLUMN idempotency_key VARCHAR(255) NULL"))
+        if "request_hash" not in columns:
+            db.session.execute(text("ALTER TABLE order_jobs ADD COLUMN request_hash VARCHAR(64) NULL"))
+        db.session.commit()
@@ -1,11 +1,15 @@
 """Shared SQLAlchemy models and seeding utilities."""
 
+import importlib
 from datetime import date
 
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import func
+from sqlalchemy import event, func
+from sqlalchemy.orm import Mapper
 
-db = SQLAlchemy()
+from app.integration.read_routing import RoutingSession
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 
 def _ensure_postcode(code: str, preferred_id: int) -> int:
@@ -63,14 +67,49 @@ def seed_data():
     db.session.commit()
 
 
-from .customer import Customer
-from .delivery import DeliveryPerson, DeliveryPersonPostcode
-from .discount import DiscountCode
-from .ingredient import Ingredient
-from .menu_item import MenuItem
-from .order import Order, OrderItem
-from .pizza import Pizza, PizzaIngredient, PizzaMenuPrice
-from .postcode import Postcode
+# Model modules are imported on first use (PEP 562) so importing ``db`` stays cheap.
+_MODEL_MODULES = {
+    "Customer": ".customer",
+    "DeliveryPerson": ".delivery",
+    "DeliveryPersonPostcode": ".delivery",
+    "DiscountCode": ".discount",
+    "IdempotencyKey": ".idempotency",
+    "Ingredient": ".ingredient",
+    "MenuItem": ".menu_item",
+    "MonthlyEarningsRollup": ".reporting",
+    "Order": ".order",
+    "OrderItem": ".order",
+    "OrderJob": ".order_job",
+    "Pizza": ".pizza",
+    "PizzaIngredient": ".pizza",
+    "PizzaMenuPrice": ".pizza",
+    "Postcode": ".postcode",
+    "ReplicaHeartbeat": ".replica_heartbeat",
+    "SchemaVersion": ".schema_version",
+}
+
+
+def __getattr__(name: str):
+    """Import a model class the first time it is requested from this package."""
+    module = _MODEL_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def import_all_models() -> None:
+    """Import every model module so relationship targets can be resolved."""
+    for module in sorted(set(_MODEL_MODULES.values())):
+        importlib.import_module(module, __name__)
+
+
+@event.listens_for(Mapper, "before_configured")
+def _import_models_before_configure() -> None:
+    """Make sure every mapper exists before SQLAlchemy resolves relationships."""
+    import_all_models()
+
 
 __all__ = [
     "db",
@@ -78,13 +117,19 @@ __all__ = [
     "DeliveryPerson",
     "DeliveryPersonPostcode",
     "DiscountCode",
+    "IdempotencyKey",
     "Ingredient",
     "MenuItem",
+    "MonthlyEarningsRollup",
     "Order",
     "OrderItem",
+    "OrderJob",
     "Pizza",
     "PizzaIngredient",
     "PizzaMenuPrice",
     "Postcode",
+    "ReplicaHeartbeat",
+    "SchemaVersion",
+    "import_all_models",
     "seed_data",
 ]
@@ -28,7 +28,8 @@ class Customer(db.Model):
     pizzas_ordered = db.Column("PizzasOrdered", db.Integer, default=0, nullable=False)
     street_name = db.Column("Street_Name", db.String(255))
 
-    orders = relationship("Order", back_populates="customer", lazy="selectin")
+    # Order history is unbounded; repositories load it explicitly when needed.
+    orders = relationship("Order", back_populates="customer", lazy="raise_on_sql")
 
     def __repr__(self):
         """Return a debug representation for the customer."""
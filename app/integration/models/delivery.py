@@ -26,13 +26,14 @@ class DeliveryPerson(db.Model):
     zones: Mapped[list["DeliveryPersonPostcode"]] = relationship(
         "DeliveryPersonPostcode",
         back_populates="driver",
-        lazy="selectin",
+        lazy="select",
         cascade="all, delete-orphan",
     )
     orders: Mapped[list["Order"]] = relationship(
         "Order",
         back_populates="delivery_person",
-        lazy="selectin",
+        # Order history is unbounded; repositories load it explicitly when needed.
+        lazy="raise_on_sql",
     )
 
     def mark_unavailable_until(self, moment: datetime | None) -> None:
@@ -68,9 +69,9 @@ class DeliveryPersonPostcode(db.Model):
     driver: Mapped[DeliveryPerson] = relationship(
         "DeliveryPerson",
         back_populates="zones",
-        lazy="joined",
+        lazy="select",
     )
-    postcode: Mapped["Postcode"] = relationship("Postcode", lazy="joined")
+    postcode: Mapped["Postcode"] = relationship("Postcode", lazy="select")
 
     def __repr__(self) -> str:  # pragma: no cover - debug helper
         return f"DeliveryPersonPostcode(driver_id={self.delivery_driver_id}, postcode_id={self.postcode_id})"
@@ -4,11 +4,16 @@ from __future__ import annotations
 from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, validates
 
 from . import db
 
 
+def normalize_discount_code(code: str) -> str:
+    """Return the stored form of a discount code: trimmed and upper case."""
+    return code.strip().upper()
+
+
 class DiscountCode(db.Model):
     """Represents a single-use discount code."""
 
@@ -30,6 +35,11 @@ class DiscountCode(db.Model):
     valid_to: Mapped[date | None] = mapped_column(db.Date, nullable=True)
     redeemed_at: Mapped[datetime | None] = mapped_column(db.DateTime, nullable=True)
 
+    @validates("code")
+    def _normalize_code(self, key: str, code: str) -> str:
+        """Store codes normalized so lookups can use the unique index directly."""
+        return normalize_discount_code(code) if code is not None else code
+
     def mark_redeemed(self) -> None:
         """Flag discount code as used and store the redemption timestamp."""
         self.redeemed_at = datetime.utcnow()
@@ -54,4 +64,4 @@ class DiscountCode(db.Model):
         return f"DiscountCode(code={self.code!r}, value={self.discount_value})"
 
 
-__all__ = ["DiscountCode"]
+__all__ = ["DiscountCode", "normalize_discount_code"]
@@ -0,0 +1,48 @@
+"""SQLAlchemy model remembering the outcome of requests sent with an Idempotency-Key."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from . import db
+
+
+class IdempotencyKey(db.Model):
+    """One client-chosen key: the request it was first used for and the stored response."""
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        db.UniqueConstraint("customer_id", "idempotency_key", name="uq_idempotency_keys_customer_key"),
+        db.CheckConstraint(
+            "status IN ('in_flight','completed')",
+            name="ck_idempotency_key_status_valid",
+        ),
+    )
+
+    idempotency_key_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    # Keys are scoped per customer; no foreign key, so an unknown customer is
+    # rejected by the order itself rather than by the key insert.
+    customer_id: Mapped[int] = mapped_column(db.Integer, nullable=False)
+    idempotency_key: Mapped[str] = mapped_column(db.String(255), nullable=False)
+    request_hash: Mapped[str] = mapped_column(db.String(64), nullable=False)
+    status: Mapped[str] = mapped_column(db.String(20), nullable=False, default="in_flight")
+    lock_token: Mapped[Optional[str]] = mapped_column(db.String(32))
+    locked_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime)
+    order_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("orders.Order_ID", ondelete="SET NULL"),
+        nullable=True,
+    )
+    response_status: Mapped[Optional[int]] = mapped_column(db.Integer)
+    response_body: Mapped[Optional[str]] = mapped_column(db.Text)
+    created_at: Mapped[datetime] = mapped_column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at: Mapped[datetime] = mapped_column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        """Return the key state for debugging."""
+        return f"IdempotencyKey({self.idempotency_key!r}, status={self.status!r}, order_id={self.order_id})"
+
+
+__all__ = ["IdempotencyKey"]
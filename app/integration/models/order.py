@@ -20,6 +20,9 @@ class Order(db.Model):
             "Order_Status IN ('new','preparing','dispatched','delivered','failed')",
             name="ck_order_status_valid",
         ),
+        # Reporting filters on date ranges and outstanding statuses.
+        db.Index("ix_orders_placed_at", "Placed_At"),
+        db.Index("ix_orders_status_placed_at", "Order_Status", "Placed_At"),
     )
 
     order_id: Mapped[int] = mapped_column(
@@ -83,38 +86,23 @@ class Order(db.Model):
     customer: Mapped["Customer"] = relationship(
         "Customer",
         back_populates="orders",
-        lazy="joined",
+        lazy="select",
     )
     items: Mapped[list["OrderItem"]] = relationship(
         "OrderItem",
         back_populates="order",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="select",
     )
     delivery_person: Mapped[Optional["DeliveryPerson"]] = relationship(
         "DeliveryPerson",
         back_populates="orders",
-        lazy="joined",
+        lazy="select",
     )
     discount_code: Mapped[Optional["DiscountCode"]] = relationship(
         "DiscountCode",
-        lazy="joined",
-    )
-
-    def recalculate_totals(self) -> None:
-        """Recompute totals based on associated line items."""
-        items = list(dict.fromkeys(self.items))
-        gross = sum(
-            (item.unit_price * item.quantity for item in items),
-            Decimal("0.00"),
-        )
-        discounts = sum(
-            (item.discount_amount for item in items),
-            Decimal("0.00"),
-        )
-        self.total_before_discounts = gross.quantize(Decimal("0.01"))
-        self.discount_total = discounts.quantize(Decimal("0.01"))
-        self.total_due = (gross - discounts).quantize(Decimal("0.01"))
+        lazy="select",
+    )
 
     def __repr__(self) -> str:  # pragma: no cover - debug helper
         """Return order identifiers for debugging."""
@@ -129,6 +117,16 @@ class OrderItem(db.Model):
         db.CheckConstraint("Quantity > 0", name="ck_order_item_quantity_positive"),
         db.CheckConstraint("Unit_Price >= 0", name="ck_order_item_price_non_negative"),
         db.CheckConstraint("Discount_Amount >= 0", name="ck_order_item_discount_non_negative"),
+        # Covers the per-order pizza aggregates without touching the table rows.
+        db.Index(
+            "ix_order_items_order_type_pizza",
+            "Order_ID",
+            "Item_Type",
+            "Pizza_ID",
+            "Quantity",
+            "Unit_Price",
+            "Discount_Amount",
+        ),
     )
 
     order_item_id: Mapped[int] = mapped_column(
@@ -163,21 +161,14 @@ class OrderItem(db.Model):
     )
 
     order: Mapped[Order] = relationship("Order", back_populates="items")
-    pizza: Mapped[Optional["Pizza"]] = relationship("Pizza", lazy="joined")
-    menu_item: Mapped[Optional["MenuItem"]] = relationship("MenuItem", lazy="joined")
+    pizza: Mapped[Optional["Pizza"]] = relationship("Pizza", lazy="select")
+    menu_item: Mapped[Optional["MenuItem"]] = relationship("MenuItem", lazy="select")
 
     @property
     def extended_price(self) -> Decimal:
         """Return the line total after quantity and discounts."""
         return (self.unit_price * self.quantity) - self.discount_amount
 
-    def apply_discount(self, amount: Decimal) -> None:
-        """Apply up to ``amount`` off the line without exceeding its value."""
-        if amount <= 0:
-            return
-        max_discount = self.unit_price * self.quantity
-        self.discount_amount = min(max_discount, self.discount_amount + amount)
-
     def __repr__(self) -> str:  # pragma: no cover - debug helper
         """Return a view of the order item for debugging."""
         return f"OrderItem(type={self.item_type!r}, qty={self.quantity}, unit={self.unit_price})"
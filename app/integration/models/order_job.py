@@ -0,0 +1,57 @@
+"""SQLAlchemy model for orders accepted asynchronously and placed by workers."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from . import db
+
+JOB_STATUSES = ("queued", "processing", "done", "failed")
+
+
+class OrderJob(db.Model):
+    """One queued checkout: the validated payload and what became of it."""
+
+    __tablename__ = "order_jobs"
+    __table_args__ = (
+        db.CheckConstraint(
+            "status IN ('queued','processing','done','failed')",
+            name="ck_order_job_status_valid",
+        ),
+        # Workers claim the oldest runnable jobs.
+        db.Index("ix_order_jobs_status_available_at", "status", "available_at", "job_id"),
+        # A retried submission finds its job instead of queueing a second one.
+        db.Index("uq_order_jobs_customer_key", "customer_id", "idempotency_key", unique=True),
+    )
+
+    job_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    customer_id: Mapped[int] = mapped_column(
+        ForeignKey("customers.Customer_ID", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    payload: Mapped[str] = mapped_column(db.Text, nullable=False)
+    idempotency_key: Mapped[Optional[str]] = mapped_column(db.String(255))
+    request_hash: Mapped[Optional[str]] = mapped_column(db.String(64))
+    status: Mapped[str] = mapped_column(db.String(20), nullable=False, default="queued")
+    attempts: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(db.DateTime, nullable=False, default=datetime.utcnow)
+    available_at: Mapped[datetime] = mapped_column(db.DateTime, nullable=False, default=datetime.utcnow)
+    claimed_by: Mapped[Optional[str]] = mapped_column(db.String(64))
+    claimed_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime)
+    order_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("orders.Order_ID", ondelete="SET NULL"),
+        nullable=True,
+    )
+    errors: Mapped[Optional[str]] = mapped_column(db.Text)
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        """Return the job state for debugging."""
+        return f"OrderJob(id={self.job_id}, status={self.status!r}, attempts={self.attempts})"
+
+
+__all__ = ["JOB_STATUSES", "OrderJob"]
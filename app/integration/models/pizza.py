@@ -1,4 +1,4 @@
-"""SQLAlchemy models that describe pizzas and their priced view."""
+"""SQLAlchemy models that describe pizzas and their materialized prices."""
 from __future__ import annotations
 
 from decimal import Decimal
@@ -73,12 +73,12 @@ class PizzaIngredient(db.Model):
 
 
 class PizzaMenuPrice(db.Model):
-    """Read-only view that contains pre-calculated pizza pricing information."""
+    """Materialized pizza prices and dietary flags, kept current by ``MenuPriceRepository``."""
 
     __tablename__ = "pizza_menu_prices"
 
     pizza_id: Mapped[int] = mapped_column(
-        ForeignKey("pizzas.pizza_id"), primary_key=True
+        ForeignKey("pizzas.pizza_id", ondelete="CASCADE"), primary_key=True
     )
     pizza_name: Mapped[str | None] = mapped_column(db.String(100))
     calculated_price: Mapped[Decimal] = mapped_column(db.Numeric(10, 2), nullable=False)
@@ -93,7 +93,7 @@ class PizzaMenuPrice(db.Model):
     )
 
     def __repr__(self) -> str:  # pragma: no cover - debug helper
-        """Return a summary of the menu price view entry."""
+        """Return a summary of the menu price entry."""
         return f"PizzaMenuPrice(pizza_id={self.pizza_id}, price={self.calculated_price})"
 
 
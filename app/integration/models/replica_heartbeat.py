@@ -0,0 +1,26 @@
+"""SQLAlchemy model for the heartbeat row used to measure replica lag."""
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from . import db
+
+HEARTBEAT_ID = 1
+
+
+class ReplicaHeartbeat(db.Model):
+    """Single row the primary keeps touching; its age on a replica is that replica's lag."""
+
+    __tablename__ = "replica_heartbeat"
+
+    heartbeat_id: Mapped[int] = mapped_column(db.Integer, primary_key=True, autoincrement=False)
+    beat_at: Mapped[datetime] = mapped_column(db.DateTime, nullable=False)
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        """Return the last beat for debugging."""
+        return f"ReplicaHeartbeat(beat_at={self.beat_at})"
+
+
+__all__ = ["HEARTBEAT_ID", "ReplicaHeartbeat"]
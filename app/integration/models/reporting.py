@@ -0,0 +1,35 @@
+"""SQLAlchemy models for pre-aggregated reporting data."""
+from __future__ import annotations
+
+from decimal import Decimal
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from . import db
+
+
+class MonthlyEarningsRollup(db.Model):
+    """Monthly order count and revenue per reporting dimension value."""
+
+    __tablename__ = "staff_monthly_earnings_rollup"
+
+    report_year: Mapped[int] = mapped_column(db.Integer, primary_key=True, autoincrement=False)
+    report_month: Mapped[int] = mapped_column(db.Integer, primary_key=True, autoincrement=False)
+    dimension: Mapped[str] = mapped_column(db.String(20), primary_key=True)
+    dimension_value: Mapped[str] = mapped_column(db.String(32), primary_key=True, default="")
+    order_count: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0)
+    revenue: Mapped[Decimal] = mapped_column(
+        db.Numeric(12, 2),
+        nullable=False,
+        default=Decimal("0.00"),
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        """Return the rollup key for debugging."""
+        return (
+            f"MonthlyEarningsRollup({self.report_year}-{self.report_month:02d}, "
+            f"{self.dimension}={self.dimension_value!r})"
+        )
+
+
+__all__ = ["MonthlyEarningsRollup"]
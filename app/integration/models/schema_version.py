@@ -0,0 +1,25 @@
+"""SQLAlchemy model recording which schema revision the database was migrated to."""
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from . import db
+
+
+class SchemaVersion(db.Model):
+    """Single-row table holding the fingerprint of the last applied migration."""
+
+    __tablename__ = "schema_version"
+
+    version_id: Mapped[int] = mapped_column(db.Integer, primary_key=True, autoincrement=False)
+    fingerprint: Mapped[str] = mapped_column(db.String(64), nullable=False)
+    applied_at: Mapped[datetime] = mapped_column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        """Return the stored fingerprint for debugging."""
+        return f"SchemaVersion({self.fingerprint[:12]}, applied_at={self.applied_at})"
+
+
+__all__ = ["SchemaVersion"]
@@ -0,0 +1,63 @@
+"""EXPLAIN helpers that detect full table scans in reporting queries."""
+from __future__ import annotations
+
+from typing import Iterable, List
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.integration.models import db
+
+# Tables that grow with order volume and must never be scanned in full.
+GUARDED_TABLES = ("orders", "order_items", "staff_monthly_earnings_rollup")
+
+
+class Explain(Executable, ClauseElement):
+    """Wrap a statement so it executes as the dialect's EXPLAIN."""
+
+    inherit_cache = False
+
+    def __init__(self, statement) -> None:
+        self.statement = statement
+
+
+def _explained(element, compiler, **kw) -> str:
+    sql = compiler.process(element.statement, **kw)
+    # The plan rows have their own shape; drop the wrapped query's result typing.
+    compiler._result_columns = []
+    return sql
+
+
+@compiles(Explain)
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN " + _explained(element, compiler, **kw)
+
+
+@compiles(Explain, "sqlite")
+def _compile_explain_sqlite(element, compiler, **kw):
+    return "EXPLAIN QUERY PLAN " + _explained(element, compiler, **kw)
+
+
+def full_table_scans(statement, guarded_tables: Iterable[str] = GUARDED_TABLES) -> List[str]:
+    """Return the guarded tables that ``statement``'s plan reads with a full scan."""
+    guarded = {name.lower() for name in guarded_tables}
+    rows = db.session.execute(Explain(statement)).mappings().all()
+    dialect = db.session.get_bind().dialect.name
+
+    scans: List[str] = []
+    for row in rows:
+        if dialect == "sqlite":
+            # e.g. "SCAN orders" versus "SEARCH orders USING INDEX ix_orders_placed_at (...)"
+            words = str(row["detail"]).split()
+            if len(words) >= 2 and words[0] == "SCAN" and "USING" not in words:
+                if words[1].lower() in guarded:
+                    scans.append(words[1].lower())
+        else:
+            # MySQL reports access type ALL for a full table scan.
+            table = str(row.get("table") or "").lower()
+            if table in guarded and str(row.get("type") or "").upper() == "ALL":
+                scans.append(table)
+    return scans
+
+
+__all__ = ["Explain", "GUARDED_TABLES", "full_table_scans"]
@@ -0,0 +1,288 @@
+"""Send read-only repository work to a replica and everything else to the primary."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Mapping, Optional
+
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import event, insert, select, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND = "replica"
+
+# Keys kept in ``Session.info``.
+_READ_ONLY = "routing_read_only"
+_PRIMARY = "routing_primary"
+_WROTE = "routing_wrote"
+_WROTE_AT = "routing_wrote_at"
+
+_POOL_GAUGES = ("size", "checkedout", "checkedin", "overflow")
+
+
+class ReplicaRouter:
+    """Decide whether the replica may answer a read and keep track of its lag.
+
+    Lag is the age of the heartbeat row as seen on the replica. Any process
+    that checks the replica also refreshes the row on the primary, at most
+    once per ``check_interval``, so ``max_lag_seconds`` should comfortably
+    exceed that interval. A ``max_lag_seconds`` of zero only checks that the
+    replica answers.
+    """
+
+    def __init__(self, *, max_lag_seconds: float = 5.0, check_interval: float = 1.0) -> None:
+        """Start with an unchecked replica and empty counters."""
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._engine: Optional[Engine] = None
+        self._checked_at: Optional[float] = None
+        self._healthy = False
+        self._lag: Optional[float] = None
+        self._reads: Dict[str, int] = {"replica": 0, "pinned": 0, "lagging": 0}
+
+    def configure(self, *, max_lag_seconds: float, check_interval: float) -> None:
+        """Apply the application's lag limit and check interval."""
+        with self._lock:
+            self.max_lag_seconds = max_lag_seconds
+            self.check_interval = check_interval
+            self._checked_at = None
+
+    def choose(self, info: Mapping[str, object], engines: Mapping[Optional[str], Engine]) -> Optional[Engine]:
+        """Return the replica when a session in the state ``info`` may read from it."""
+        replica = engines.get(REPLICA_BIND)
+        if replica is None or not info.get(_READ_ONLY):
+            return None
+        if info.get(_PRIMARY) or info.get(_WROTE) or self._wrote_recently(info):
+            self._count("pinned")
+            return None
+        if not self._is_current(replica, engines[None]):
+            self._count("lagging")
+            return None
+        self._count("replica")
+        return replica
+
+    def read_engine(self, engines: Mapping[Optional[str], Engine]) -> Engine:
+        """Engine for standalone read-only connections: the replica while it keeps up."""
+        replica = engines.get(REPLICA_BIND)
+        if replica is not None and self._is_current(replica, engines[None]):
+            self._count("replica")
+            return replica
+        if replica is not None:
+            self._count("lagging")
+        return engines[None]
+
+    def stats(self) -> Dict[str, object]:
+        """Replica health, last measured lag and read-only statements by outcome."""
+        with self._lock:
+            return {
+                "healthy": self._healthy,
+                "lag_seconds": self._lag,
+                "checked_seconds_ago": (
+                    None if self._checked_at is None else round(time.monotonic() - self._checked_at, 3)
+                ),
+                "reads": dict(self._reads),
+            }
+
+    @staticmethod
+    def pool_stats(engines: Mapping[Optional[str], Engine]) -> Dict[str, Dict[str, int]]:
+        """Connection pool gauges per bind; pools without a gauge simply omit it."""
+        stats: Dict[str, Dict[str, int]] = {}
+        for key, engine in engines.items():
+            pool = engine.pool
+            stats["primary" if key is None else key] = {
+                gauge: getattr(pool, gauge)() for gauge in _POOL_GAUGES if callable(getattr(pool, gauge, None))
+            }
+        return stats
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self._reads[outcome] += 1
+
+    def _wrote_recently(self, info: Mapping[str, object]) -> bool:
+        """True while this session's last committed write may not have reached the replica.
+
+        Only covers the session that wrote; other sessions are not pinned.
+        """
+        wrote_at = info.get(_WROTE_AT)
+        return wrote_at is not None and time.monotonic() - wrote_at < max(self.max_lag_seconds, self.check_interval)
+
+    def _is_current(self, replica: Engine, primary: Engine) -> bool:
+        """Re-check the replica once per interval; other threads use the last verdict meanwhile."""
+        with self._lock:
+            if self._engine is not replica:
+                self._engine, self._checked_at, self._healthy = replica, None, False
+                if not event.contains(replica, "handle_error", self._on_replica_error):
+                    event.listen(replica, "handle_error", self._on_replica_error)
+            checked_at = self._checked_at
+        if checked_at is not None and time.monotonic() - checked_at < self.check_interval:
+            return self._healthy
+        # Only the first check makes other threads wait for its answer.
+        if self._probe_lock.acquire(blocking=checked_at is None):
+            try:
+                if self._checked_at == checked_at:
+                    self._probe(replica, primary)
+            finally:
+                self._probe_lock.release()
+        return self._healthy
+
+    def _probe(self, replica: Engine, primary: Engine) -> None:
+        """Refresh the heartbeat on the primary and measure its age on the replica."""
+        lag: Optional[float] = None
+        try:
+            if self.max_lag_seconds > 0:
+                now = datetime.utcnow()
+                self._beat(primary, now)
+                seen = self._last_beat(replica)
+                lag = None if seen is None else max((now - seen).total_seconds(), 0.0)
+                healthy = lag is not None and lag <= self.max_lag_seconds
+            else:
+                with replica.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+                healthy = True
+        except SQLAlchemyError as exc:
+            healthy = False
+            if self._healthy or self._checked_at is None:
+                logger.warning("Replica check failed, reading from the primary: %s", exc)
+        else:
+            if self._healthy != healthy or self._checked_at is None:
+                if healthy:
+                    logger.info("Replica is current (lag %s); routing read-only work to it", lag)
+                else:
+                    logger.warning("Replica lag %s exceeds %.1fs; reading from the primary", lag, self.max_lag_seconds)
+        with self._lock:
+            self._healthy, self._lag, self._checked_at = healthy, lag, time.monotonic()
+
+    def _beat(self, primary: Engine, now: datetime) -> None:
+        """Move the heartbeat forward unless another process did so within the interval."""
+        from app.integration.models.replica_heartbeat import HEARTBEAT_ID, ReplicaHeartbeat
+
+        table = ReplicaHeartbeat.__table__
+        with primary.begin() as connection:
+            moved = connection.execute(
+                update(table)
+                .where(
+                    table.c.heartbeat_id == HEARTBEAT_ID,
+                    table.c.beat_at <= now - timedelta(seconds=self.check_interval),
+                )
+                .values(beat_at=now)
+            ).rowcount
+            if moved or connection.execute(
+                select(table.c.heartbeat_id).where(table.c.heartbeat_id == HEARTBEAT_ID)
+            ).first():
+                return
+        try:
+            with primary.begin() as connection:
+                connection.execute(insert(table).values(heartbeat_id=HEARTBEAT_ID, beat_at=now))
+        except IntegrityError:
+            # Another process created the row first.
+            pass
+
+    @staticmethod
+    def _last_beat(replica: Engine) -> Optional[datetime]:
+        from app.integration.models.replica_heartbeat import HEARTBEAT_ID, ReplicaHeartbeat
+
+        table = ReplicaHeartbeat.__table__
+        with replica.connect() as connection:
+            return connection.execute(
+                select(table.c.beat_at).where(table.c.heartbeat_id == HEARTBEAT_ID)
+            ).scalar()
+
+    def _on_replica_error(self, context) -> None:
+        """A dropped replica connection sends reads to the primary until the next check."""
+        if context.is_disconnect:
+            with self._lock:
+                self._healthy, self._checked_at = False, time.monotonic()
+
+
+replica_router = ReplicaRouter()
+
+
+class RoutingSession(FlaskSession):
+    """Flask-SQLAlchemy session that lets ``read_only`` work run on the replica bind.
+
+    Everything else, including every flush, uses the primary. Once the session
+    has written, its own later reads stay on the primary until the replica can
+    be expected to have caught up. That state lives in ``Session.info`` and so
+    ends with the session, which Flask-SQLAlchemy removes after each request:
+    later requests may read replica data up to ``max_lag_seconds`` old, and
+    work that must see the latest writes has to use ``use_primary``.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        """Pick the replica for read-only statements, otherwise defer to Flask-SQLAlchemy."""
+        if bind is None and not self._flushing and not getattr(clause, "is_dml", False):
+            replica = replica_router.choose(self.info, self._db.engines)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _note_flush(session, flush_context) -> None:
+    session.info[_WROTE] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _note_dml(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_WROTE] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _note_commit(session) -> None:
+    # Also emitted when a savepoint is released; only the outermost commit publishes writes.
+    if not session.in_nested_transaction() and session.info.pop(_WROTE, False):
+        session.info[_WROTE_AT] = time.monotonic()
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _forget_finished(session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_WROTE, None)
+
+
+@contextmanager
+def read_only() -> Iterator[None]:
+    """Mark the enclosed statements (or, as a decorator, a repository method) replica-safe."""
+    from app.integration.models import db
+
+    info = db.session.info
+    info[_READ_ONLY] = info.get(_READ_ONLY, 0) + 1
+    try:
+        yield
+    finally:
+        info[_READ_ONLY] -= 1
+
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    """Keep the enclosed work on the primary, read-only repository calls included."""
+    from app.integration.models import db
+
+    info = db.session.info
+    info[_PRIMARY] = info.get(_PRIMARY, 0) + 1
+    try:
+        yield
+    finally:
+        info[_PRIMARY] -= 1
+
+
+__all__ = [
+    "REPLICA_BIND",
+    "ReplicaRouter",
+    "RoutingSession",
+    "read_only",
+    "replica_router",
+    "use_primary",
+]
@@ -1,32 +1,73 @@
 """Data access helpers for customer-related queries."""
 from __future__ import annotations
 
-from typing import Optional, Sequence
+from typing import Dict, Iterable, List, Optional
 
-from sqlalchemy import func
+from sqlalchemy import Row, func, select, text
+from sqlalchemy.orm import raiseload
 
 from app.integration.models import db
 from app.integration.models.customer import Customer
 
 
+# Login, checkout and listings only need the customer row itself.
+_CUSTOMER_ONLY = (raiseload("*"),)
+
+
 class CustomerRepository:
     """Encapsulate customer entity lookup and creation logic."""
 
-    def get_all(self) -> Sequence[Customer]:
-        """Return all customers ordered by primary key for better output."""
-        return Customer.query.order_by(Customer.customer_id).all()
+    def list_page(self, *, after_id: int, limit: int) -> List[Row]:
+        """Return ``(customer_id, username, name)`` rows following ``after_id`` in id order.
+
+        A keyset seek on the primary key costs the same on page one and page
+        ten thousand, unlike an OFFSET.
+        """
+        return db.session.execute(
+            select(Customer.customer_id, Customer.username, Customer.name)
+            .where(Customer.customer_id > after_id)
+            .order_by(Customer.customer_id)
+            .limit(limit)
+        ).all()
+
+    def estimate_count(self) -> int:
+        """Approximate the number of customers without scanning the table where possible."""
+        if db.session.get_bind().dialect.name == "mysql":
+            # InnoDB keeps a running row estimate; COUNT(*) would walk an index.
+            estimate = db.session.execute(
+                text(
+                    "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+                ),
+                {"table": Customer.__tablename__},
+            ).scalar()
+            if estimate is not None:
+                return int(estimate)
+        return db.session.execute(select(func.count()).select_from(Customer)).scalar_one()
 
     def get_by_username(self, username: str) -> Optional[Customer]:
         """Fetch a customer record by username if provided."""
         if not username:
             return None
-        return Customer.query.filter_by(username=username).first()
+        return Customer.query.options(*_CUSTOMER_ONLY).filter_by(username=username).first()
 
     def get_by_id(self, customer_id: int) -> Optional[Customer]:
         """Return the customer who matches ``customer_id``."""
         if not customer_id:
             return None
-        return Customer.query.filter_by(customer_id=customer_id).first()
+        return Customer.query.options(*_CUSTOMER_ONLY).filter_by(customer_id=customer_id).first()
+
+    def get_by_ids(self, customer_ids: Iterable[int]) -> Dict[int, Customer]:
+        """Return the customers matching ``customer_ids`` keyed by their identifier."""
+        unique_ids = [customer_id for customer_id in dict.fromkeys(customer_ids) if customer_id]
+        if not unique_ids:
+            return {}
+        customers = (
+            Customer.query.options(*_CUSTOMER_ONLY)
+            .filter(Customer.customer_id.in_(unique_ids))
+            .all()
+        )
+        return {customer.customer_id: customer for customer in customers}
 
     def username_exists(self, username: str) -> bool:
         """True when another customer already uses the givrn username."""
@@ -2,10 +2,12 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional, Sequence
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import case, func
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import raiseload
 
+from app.integration.models import db
 from app.integration.models.delivery import DeliveryPerson, DeliveryPersonPostcode
 from app.integration.models.postcode import Postcode
 
@@ -13,48 +15,52 @@ from app.integration.models.postcode import Postcode
 class DeliveryRepository:
     """Query helpers around delivery drivers and their zones."""
 
-    def drivers_for_postcode(self, postcode_id: int) -> List[DeliveryPerson]:
-        """Return drivers associated with the provided postcode."""
-        return (
-            DeliveryPerson.query.join(DeliveryPersonPostcode)
-            .filter(DeliveryPersonPostcode.postcode_id == postcode_id)
-            .order_by(
-                case((DeliveryPerson.unavailable_until.is_(None), 0), else_=1),
-                DeliveryPerson.unavailable_until.asc(),
-            )
-            .all()
+    def dispatch_roster(self) -> Tuple[Dict[int, Optional[datetime]], List[Tuple[int, int]]]:
+        """Return every driver's next-free time and every ``(driver_id, postcode_id)`` link."""
+        free_at = dict(
+            db.session.execute(
+                select(DeliveryPerson.delivery_driver_id, DeliveryPerson.unavailable_until)
+            ).all()
         )
+        links = [
+            (driver_id, postcode_id)
+            for driver_id, postcode_id in db.session.execute(
+                select(DeliveryPersonPostcode.delivery_driver_id, DeliveryPersonPostcode.postcode_id)
+            ).all()
+        ]
+        return free_at, links
+
+    def claim_driver(self, driver_id: int, *, reference_time: datetime, busy_until: datetime) -> bool:
+        """Mark a driver busy until ``busy_until`` if they are still free at ``reference_time``.
 
-    def fallback_drivers(self) -> List[DeliveryPerson]:
-        """Return all drivers ordered by their availability timestamp."""
-        return (
-            DeliveryPerson.query
-            .order_by(
-                case((DeliveryPerson.unavailable_until.is_(None), 0), else_=1),
-                DeliveryPerson.unavailable_until.asc(),
+        Returns False when another transaction claimed the driver first.
+        """
+        result = db.session.execute(
+            update(DeliveryPerson)
+            .where(
+                DeliveryPerson.delivery_driver_id == driver_id,
+                or_(
+                    DeliveryPerson.unavailable_until.is_(None),
+                    DeliveryPerson.unavailable_until <= reference_time,
+                ),
             )
-            .all()
+            .values(unavailable_until=busy_until, is_available=False)
         )
+        return result.rowcount == 1
 
-    def find_available_driver(
-        self,
-        postcode_id: int,
-        reference_time: Optional[datetime] = None,
-    ) -> Optional[DeliveryPerson]:
-        """Choose the first available driver for a postcode at the given time."""
-        reference_time = reference_time or datetime.utcnow()
-        candidates: Sequence[DeliveryPerson] = self.drivers_for_postcode(postcode_id)
-        if not candidates:
-            candidates = self.fallback_drivers()
-        for driver in candidates:
-            if driver.unavailable_until is None or driver.unavailable_until <= reference_time:
-                return driver
-        return None
+    def driver_free_at(self, driver_id: int) -> Tuple[bool, Optional[datetime]]:
+        """Return whether the driver exists and, if so, their stored next-free time."""
+        row = db.session.execute(
+            select(DeliveryPerson.unavailable_until).where(
+                DeliveryPerson.delivery_driver_id == driver_id
+            )
+        ).first()
+        return (row is not None, row[0] if row is not None else None)
 
     def assign_driver_to_postcode(self, driver_id: int, postcode_id: int) -> None:
         """Create an association between a driver and a postcode if missing."""
         existing = (
-            DeliveryPersonPostcode.query.filter_by(
+            DeliveryPersonPostcode.query.options(raiseload("*")).filter_by(
                 delivery_driver_id=driver_id,
                 postcode_id=postcode_id,
             ).first()
@@ -65,8 +71,6 @@ class DeliveryRepository:
             delivery_driver_id=driver_id,
             postcode_id=postcode_id,
         )
-        from app.integration.models import db
-
         db.session.add(link)
 
     def all_postcodes(self) -> List[Postcode]:
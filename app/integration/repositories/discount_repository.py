@@ -1,13 +1,14 @@
 """Discount-code data access helpers."""
 from __future__ import annotations
 
-from datetime import date
-from typing import Optional
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional
 
-from sqlalchemy import func
+from sqlalchemy import or_, update
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.integration.models import db
-from app.integration.models.discount import DiscountCode
+from app.integration.models.discount import DiscountCode, normalize_discount_code
 
 
 class DiscountRepository:
@@ -15,32 +16,54 @@ class DiscountRepository:
 
     def find_active_by_code(self, code: str, *, on_date: date | None = None) -> Optional[DiscountCode]:
         """Return a discount code when it exists and is valid on given date."""
-        if not code:
+        if not code or not code.strip():
             return None
         on_date = on_date or date.today()
-        normalized = code.strip().lower()
-        record = (
-            DiscountCode.query
-            .filter(func.lower(DiscountCode.code) == normalized)
-            .first()
-        )
+        # Codes are stored normalized, so an exact match uses the unique index.
+        record = DiscountCode.query.filter(DiscountCode.code == normalize_discount_code(code)).first()
         if record and record.is_valid_today(on_date):
             return record
         return None
 
-    def mark_redeemed(self, discount: DiscountCode) -> None:
-        """Mark the supplied discount code as redeemed within the session."""
-        discount.mark_redeemed()
-        db.session.add(discount)
+    def find_by_codes(self, codes: Iterable[str]) -> Dict[str, DiscountCode]:
+        """Return discount codes keyed by their normalized code, valid or not."""
+        normalized = {normalize_discount_code(code) for code in codes if code and code.strip()}
+        if not normalized:
+            return {}
+        records = DiscountCode.query.filter(DiscountCode.code.in_(normalized)).all()
+        return {record.code: record for record in records}
+
+    def redeem(self, discount: DiscountCode, *, on_date: date | None = None) -> bool:
+        """Atomically claim a single-use code; False when another order got it first.
+
+        The conditional UPDATE re-checks the code inside the database, so of any
+        number of concurrent checkouts exactly one sees an affected row. The row
+        stays locked until the surrounding transaction ends.
+        """
+        on_date = on_date or date.today()
+        redeemed_at = datetime.utcnow()
+        result = db.session.execute(
+            update(DiscountCode)
+            .where(
+                DiscountCode.discount_code_id == discount.discount_code_id,
+                DiscountCode.is_active.is_(True),
+                DiscountCode.redeemed_at.is_(None),
+                or_(DiscountCode.valid_from.is_(None), DiscountCode.valid_from <= on_date),
+                or_(DiscountCode.valid_to.is_(None), DiscountCode.valid_to >= on_date),
+            )
+            .values(is_active=False, redeemed_at=redeemed_at)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            return False
+        # Mirror the stored state without marking the instance dirty.
+        set_committed_value(discount, "is_active", False)
+        set_committed_value(discount, "redeemed_at", redeemed_at)
+        return True
 
     def ensure_code(self, *, code: str, value: float, active: bool = True) -> DiscountCode:
         """Fetch an existing code or create it with the given attributes."""
-        normalized = code.strip().lower()
-        record = (
-            DiscountCode.query
-            .filter(func.lower(DiscountCode.code) == normalized)
-            .first()
-        )
+        record = DiscountCode.query.filter(DiscountCode.code == normalize_discount_code(code)).first()
         if record:
             return record
         discount = DiscountCode(
@@ -0,0 +1,286 @@
+"""Maintenance of the monthly earnings rollup behind the staff reports."""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, update
+
+from app.integration.models import db
+from app.integration.models.customer import Customer
+from app.integration.models.order import Order, OrderItem
+from app.integration.models.postcode import Postcode
+from app.integration.models.reporting import MonthlyEarningsRollup
+
+DIMENSIONS = ("gender", "age_group", "postcode")
+AGE_GROUPS = ("18-24", "25-34", "35-44", "45-54", "55+", "Unknown")
+
+RollupKey = Tuple[int, int, str, str]
+
+
+def gender_label(gender: Optional[str]) -> str:
+    """Bucket a customer's gender the way the reporting views do."""
+    cleaned = (gender or "").strip()
+    return cleaned or "Unknown"
+
+
+def age_group_label(birthdate: Optional[date], placed_at: datetime) -> str:
+    """Bucket the customer's age at the time the order was placed."""
+    if birthdate is None:
+        return "Unknown"
+    age = placed_at.year - birthdate.year
+    if (placed_at.month, placed_at.day) < (birthdate.month, birthdate.day):
+        age -= 1
+    if age < 25:
+        return "18-24"
+    if age <= 34:
+        return "25-34"
+    if age <= 44:
+        return "35-44"
+    if age <= 54:
+        return "45-54"
+    return "55+"
+
+
+def month_bounds(year: int, month: int) -> Tuple[datetime, datetime]:
+    """Return the half-open ``[start, end)`` timestamp range covering a month."""
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return start, end
+
+
+def dimension_values(
+    *,
+    gender: Optional[str],
+    birthdate: Optional[date],
+    postcode: Optional[str],
+    placed_at: datetime,
+) -> Dict[str, str]:
+    """Return the value an order contributes to for every rollup dimension."""
+    return {
+        "gender": gender_label(gender),
+        "age_group": age_group_label(birthdate, placed_at),
+        # Orders without a postcode are stored under "" and reported as NULL.
+        "postcode": postcode or "",
+    }
+
+
+class EarningsRollupRepository:
+    """Keep ``staff_monthly_earnings_rollup`` in step with the orders table."""
+
+    def record_order(
+        self,
+        *,
+        placed_at: datetime,
+        gender: Optional[str],
+        birthdate: Optional[date],
+        postcode_id: Optional[int],
+        revenue: Decimal,
+    ) -> None:
+        """Add one order's revenue to its month in every dimension."""
+        self.record_orders(
+            [
+                {
+                    "placed_at": placed_at,
+                    "gender": gender,
+                    "birthdate": birthdate,
+                    "postcode_id": postcode_id,
+                    "revenue": revenue,
+                }
+            ]
+        )
+
+    def record_orders(self, orders: Iterable[Mapping[str, object]]) -> None:
+        """Add several orders to the rollup with one postcode lookup and one upsert.
+
+        Each mapping carries the keyword arguments of ``record_order``.
+        """
+        orders = list(orders)
+        if not orders:
+            return
+        postcode_ids = {order["postcode_id"] for order in orders if order["postcode_id"] is not None}
+        postcodes: Dict[int, str] = {}
+        if postcode_ids:
+            postcodes = dict(
+                db.session.execute(
+                    select(Postcode.postcode_id, Postcode.postcode).where(
+                        Postcode.postcode_id.in_(postcode_ids)
+                    )
+                ).all()
+            )
+
+        totals: Dict[RollupKey, List] = defaultdict(lambda: [0, Decimal("0.00")])
+        for order in orders:
+            placed_at = order["placed_at"]
+            values = dimension_values(
+                gender=order["gender"],
+                birthdate=order["birthdate"],
+                postcode=postcodes.get(order["postcode_id"]),
+                placed_at=placed_at,
+            )
+            for dimension, value in values.items():
+                bucket = totals[(placed_at.year, placed_at.month, dimension, value)]
+                bucket[0] += 1
+                bucket[1] += order["revenue"]
+
+        self._increment(
+            {
+                "report_year": report_year,
+                "report_month": report_month,
+                "dimension": dimension,
+                "dimension_value": value,
+                "order_count": count,
+                "revenue": revenue,
+            }
+            for (report_year, report_month, dimension, value), (count, revenue) in totals.items()
+        )
+
+    def rebuild(self, *, year: Optional[int] = None, month: Optional[int] = None) -> int:
+        """Recompute the rollup from order history, or only one month when given.
+
+        Returns the number of rollup rows written. The caller commits.
+        """
+        clear = delete(MonthlyEarningsRollup)
+        start = end = None
+        if year and month:
+            start, end = month_bounds(year, month)
+            clear = clear.where(
+                MonthlyEarningsRollup.report_year == year,
+                MonthlyEarningsRollup.report_month == month,
+            )
+        db.session.execute(clear)
+
+        totals: Dict[RollupKey, List] = defaultdict(lambda: [0, Decimal("0.00")])
+        for row in db.session.execute(self._order_revenue_query(start, end)).yield_per(1000):
+            values = dimension_values(
+                gender=row.gender,
+                birthdate=row.birthdate,
+                postcode=row.postcode,
+                placed_at=row.placed_at,
+            )
+            revenue = self._to_decimal(row.revenue)
+            for dimension, value in values.items():
+                bucket = totals[(row.placed_at.year, row.placed_at.month, dimension, value)]
+                bucket[0] += 1
+                bucket[1] += revenue
+
+        rows = [
+            {
+                "report_year": report_year,
+                "report_month": report_month,
+                "dimension": dimension,
+                "dimension_value": value,
+                "order_count": count,
+                "revenue": revenue.quantize(Decimal("0.01")),
+            }
+            for (report_year, report_month, dimension, value), (count, revenue) in totals.items()
+        ]
+        if rows:
+            db.session.execute(insert(MonthlyEarningsRollup), rows)
+        return len(rows)
+
+    def is_empty(self) -> bool:
+        """True when no rollup rows exist yet."""
+        return db.session.execute(select(MonthlyEarningsRollup.report_year).limit(1)).first() is None
+
+    def _increment(self, rows: Iterable[Mapping[str, object]]) -> None:
+        """Upsert rows, adding their counts and revenue to any existing totals."""
+        rows = list(rows)
+        table = MonthlyEarningsRollup.__table__
+        dialect = db.session.get_bind().dialect.name
+
+        if dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+            stmt = mysql_insert(table).values(rows)
+            stmt = stmt.on_duplicate_key_update(
+                order_count=table.c.order_count + stmt.inserted.order_count,
+                revenue=table.c.revenue + stmt.inserted.revenue,
+            )
+            db.session.execute(stmt)
+            return
+
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+            stmt = sqlite_insert(table).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[column.name for column in table.primary_key.columns],
+                set_={
+                    "order_count": table.c.order_count + stmt.excluded.order_count,
+                    "revenue": table.c.revenue + stmt.excluded.revenue,
+                },
+            )
+            db.session.execute(stmt)
+            return
+
+        for row in rows:
+            result = db.session.execute(
+                update(table)
+                .where(
+                    table.c.report_year == row["report_year"],
+                    table.c.report_month == row["report_month"],
+                    table.c.dimension == row["dimension"],
+                    table.c.dimension_value == row["dimension_value"],
+                )
+                .values(
+                    order_count=table.c.order_count + row["order_count"],
+                    revenue=table.c.revenue + row["revenue"],
+                )
+            )
+            if result.rowcount == 0:
+                db.session.execute(insert(table).values(**row))
+
+    @staticmethod
+    def _order_revenue_query(start: Optional[datetime], end: Optional[datetime]):
+        """Select one row per non-failed order with its customer attributes and revenue."""
+        revenue = (
+            select(
+                OrderItem.order_id.label("order_id"),
+                func.sum(
+                    (OrderItem.unit_price * OrderItem.quantity) - OrderItem.discount_amount
+                ).label("revenue"),
+            )
+            .group_by(OrderItem.order_id)
+            .subquery()
+        )
+        stmt = (
+            select(
+                Order.placed_at,
+                Customer.gender,
+                Customer.birthdate,
+                Postcode.postcode,
+                revenue.c.revenue,
+            )
+            .join(Customer, Customer.customer_id == Order.customer_id)
+            .join(revenue, revenue.c.order_id == Order.order_id)
+            .outerjoin(Postcode, Postcode.postcode_id == Order.delivery_postcode_id)
+            .where(Order.status != "failed")
+        )
+        if start is not None:
+            stmt = stmt.where(Order.placed_at >= start)
+        if end is not None:
+            stmt = stmt.where(Order.placed_at < end)
+        return stmt
+
+    @staticmethod
+    def _to_decimal(value: object) -> Decimal:
+        """Normalize driver-specific numeric results to Decimal cents."""
+        if value is None:
+            return Decimal("0.00")
+        if isinstance(value, Decimal):
+            return value
+        return Decimal(str(value)).quantize(Decimal("0.01"))
+
+
+__all__ = [
+    "AGE_GROUPS",
+    "DIMENSIONS",
+    "EarningsRollupRepository",
+    "age_group_label",
+    "dimension_values",
+    "gender_label",
+    "month_bounds",
+]
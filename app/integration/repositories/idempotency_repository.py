@@ -0,0 +1,166 @@
+"""Persistence helpers for Idempotency-Key records."""
+from __future__ import annotations
+
+import json
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.integration.models import db
+from app.integration.models.idempotency import IdempotencyKey
+
+
+class IdempotencyRepository:
+    """Reserve, settle and evict idempotency keys.
+
+    Every change to a reserved key is a conditional statement on the holder's
+    ``lock_token``, so a request that lost its key to a takeover writes nothing.
+    """
+
+    def reserve(
+        self,
+        *,
+        customer_id: int,
+        key: str,
+        request_hash: str,
+        now: datetime,
+        expires_at: datetime,
+    ) -> Optional[IdempotencyKey]:
+        """Insert and commit an in-flight key; None when the key already exists."""
+        record = IdempotencyKey(
+            customer_id=customer_id,
+            idempotency_key=key,
+            request_hash=request_hash,
+            status="in_flight",
+            lock_token=uuid.uuid4().hex,
+            locked_at=now,
+            created_at=now,
+            expires_at=expires_at,
+        )
+        db.session.add(record)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return None
+        return record
+
+    def find(self, *, customer_id: int, key: str) -> Optional[IdempotencyKey]:
+        """Return a detached snapshot of a key's current state.
+
+        Waiting requests read the same key repeatedly while its row is deleted
+        and recreated, so the snapshot is kept out of the identity map.
+        """
+        record = db.session.scalars(
+            select(IdempotencyKey)
+            .where(IdempotencyKey.customer_id == customer_id, IdempotencyKey.idempotency_key == key)
+            .execution_options(populate_existing=True)
+        ).first()
+        if record is not None:
+            db.session.expunge(record)
+        return record
+
+    def take_over(self, record: IdempotencyKey, *, now: datetime) -> bool:
+        """Claim an in-flight key whose holder stopped before placing the order."""
+        token = uuid.uuid4().hex
+        result = db.session.execute(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.idempotency_key_id == record.idempotency_key_id,
+                IdempotencyKey.status == "in_flight",
+                IdempotencyKey.order_id.is_(None),
+                IdempotencyKey.lock_token == record.lock_token,
+            )
+            .values(lock_token=token, locked_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        if result.rowcount != 1:
+            return False
+        set_committed_value(record, "lock_token", token)
+        set_committed_value(record, "locked_at", now)
+        return True
+
+    def attach_order(self, record: IdempotencyKey, *, order_id: int) -> bool:
+        """Link the placed order in the caller's transaction; False if the key was lost."""
+        return self._update_held(record, order_id=order_id)
+
+    def complete(self, record: IdempotencyKey, *, status_code: int, body: Dict[str, object]) -> bool:
+        """Store the response to replay and commit."""
+        stored = self._update_held(
+            record,
+            status="completed",
+            response_status=status_code,
+            response_body=json.dumps(body),
+            lock_token=None,
+        )
+        db.session.commit()
+        return stored
+
+    def release(self, record: IdempotencyKey) -> None:
+        """Forget a key whose request failed, so a retry runs it again."""
+        db.session.execute(
+            delete(IdempotencyKey)
+            .where(
+                IdempotencyKey.idempotency_key_id == record.idempotency_key_id,
+                IdempotencyKey.lock_token == record.lock_token,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        self._forget(record)
+
+    def discard_expired(self, record: IdempotencyKey, *, now: datetime) -> None:
+        """Drop one key whose retention period is over."""
+        db.session.execute(
+            delete(IdempotencyKey)
+            .where(
+                IdempotencyKey.idempotency_key_id == record.idempotency_key_id,
+                IdempotencyKey.expires_at <= now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        self._forget(record)
+
+    def purge_expired(self, *, now: datetime) -> int:
+        """Delete every expired key and return how many were removed."""
+        result = db.session.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.expires_at <= now)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def _forget(record: IdempotencyKey) -> None:
+        """Drop a deleted key from the session so its identity can be reused."""
+        if record in db.session:
+            db.session.expunge(record)
+
+    @staticmethod
+    def _update_held(record: IdempotencyKey, **values: object) -> bool:
+        """Update a key only while ``record`` still holds it."""
+        result = db.session.execute(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.idempotency_key_id == record.idempotency_key_id,
+                IdempotencyKey.status == "in_flight",
+                IdempotencyKey.lock_token == record.lock_token,
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            return False
+        for key, value in values.items():
+            set_committed_value(record, key, value)
+        return True
+
+
+__all__ = ["IdempotencyRepository"]
@@ -0,0 +1,155 @@
+"""Maintenance of the materialized pizza_menu_prices table."""
+from __future__ import annotations
+
+from typing import Iterable, Optional, Set
+
+from sqlalchemy import case, delete, event, func, insert, inspect, literal_column, or_, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.integration.models import db
+from app.integration.models.ingredient import Ingredient
+from app.integration.models.pizza import Pizza, PizzaIngredient, PizzaMenuPrice
+
+# Ingredient columns that feed into the price or the dietary flags.
+_PRICED_INGREDIENT_FIELDS = ("cost", "is_meat", "is_dairy")
+
+
+class MenuPriceRepository:
+    """Recompute pizza prices and dietary flags into ``pizza_menu_prices``."""
+
+    def refresh(
+        self,
+        pizza_ids: Optional[Iterable[int]] = None,
+        *,
+        ingredient_ids: Optional[Iterable[int]] = None,
+        connection: Optional[Connection] = None,
+    ) -> None:
+        """Rebuild price rows for the given pizzas, or for every pizza when none are given.
+
+        ``ingredient_ids`` widens the refresh to every pizza that uses one of
+        those ingredients.
+        """
+        pizza_ids = set(pizza_ids or ())
+        ingredient_ids = set(ingredient_ids or ())
+        price_table = PizzaMenuPrice.__table__
+
+        clear = delete(price_table)
+        priced = self._priced_pizzas_query()
+        if pizza_ids or ingredient_ids:
+            clear = clear.where(self._scope(price_table.c.pizza_id, pizza_ids, ingredient_ids))
+            priced = priced.where(self._scope(Pizza.pizza_id, pizza_ids, ingredient_ids))
+
+        fill = insert(price_table).from_select(
+            [
+                price_table.c.pizza_id,
+                price_table.c.pizza_name,
+                price_table.c.calculated_price,
+                price_table.c.pizza_isvegan,
+                price_table.c.pizza_isvegetarian,
+            ],
+            priced,
+        )
+
+        executor = connection if connection is not None else db.session
+        executor.execute(clear)
+        executor.execute(fill)
+
+    @staticmethod
+    def _scope(column, pizza_ids: Set[int], ingredient_ids: Set[int]):
+        """Restrict ``column`` to the given pizzas and to pizzas using the given ingredients."""
+        conditions = []
+        if pizza_ids:
+            conditions.append(column.in_(pizza_ids))
+        if ingredient_ids:
+            conditions.append(
+                column.in_(
+                    select(PizzaIngredient.pizza_id)
+                    .where(PizzaIngredient.ingredient_id.in_(ingredient_ids))
+                    .scalar_subquery()
+                )
+            )
+        return or_(*conditions)
+
+    @staticmethod
+    def _priced_pizzas_query():
+        """Return the aggregate that used to back the ``pizza_menu_prices`` view."""
+        vegan = case(
+            (
+                func.min(
+                    case(
+                        ((Ingredient.is_meat.is_(False)) & (Ingredient.is_dairy.is_(False)), 1),
+                        else_=0,
+                    )
+                ) == 1,
+                1,
+            ),
+            else_=0,
+        )
+        vegetarian = case(
+            (func.min(case((Ingredient.is_meat.is_(False), 1), else_=0)) == 1, 1),
+            else_=0,
+        )
+        return (
+            select(
+                Pizza.pizza_id,
+                Pizza.pizza_name,
+                func.round(func.sum(Ingredient.cost) * literal_column("1.4") * literal_column("1.09"), 2),
+                vegan,
+                vegetarian,
+            )
+            .join(PizzaIngredient, PizzaIngredient.pizza_id == Pizza.pizza_id)
+            .join(Ingredient, Ingredient.ingredient_id == PizzaIngredient.ingredient_id)
+            .group_by(Pizza.pizza_id, Pizza.pizza_name)
+        )
+
+
+def _changed_price_inputs(session: Session) -> tuple[Set[int], Set[int]]:
+    """Collect pizzas and ingredients whose flushed changes affect menu prices."""
+    pizza_ids: Set[int] = set()
+    ingredient_ids: Set[int] = set()
+
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, PizzaIngredient):
+            pizza_ids.add(instance.pizza_id)
+            history = inspect(instance).attrs.pizza_id.history
+            pizza_ids.update(value for value in history.deleted or () if value is not None)
+        elif isinstance(instance, Pizza):
+            pizza_ids.add(instance.pizza_id)
+        elif isinstance(instance, Ingredient) and instance not in session.new:
+            state = inspect(instance)
+            if instance in session.deleted or any(
+                state.attrs[field].history.has_changes() for field in _PRICED_INGREDIENT_FIELDS
+            ):
+                ingredient_ids.add(instance.ingredient_id)
+
+    pizza_ids.discard(None)
+    ingredient_ids.discard(None)
+    return pizza_ids, ingredient_ids
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_price_changes(session, flush_context) -> None:
+    """Remember which pizzas need repricing once the flush has been executed."""
+    pizza_ids, ingredient_ids = _changed_price_inputs(session)
+    if pizza_ids or ingredient_ids:
+        pending = session.info.setdefault("menu_price_refresh", (set(), set()))
+        pending[0].update(pizza_ids)
+        pending[1].update(ingredient_ids)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _refresh_changed_prices(session, flush_context) -> None:
+    """Reprice affected pizzas inside the same transaction as the change."""
+    pending = session.info.pop("menu_price_refresh", None)
+    if not pending:
+        return
+    pizza_ids, ingredient_ids = pending
+    MenuPriceRepository().refresh(
+        pizza_ids,
+        ingredient_ids=ingredient_ids,
+        connection=session.connection(),
+    )
+
+
+__all__ = ["MenuPriceRepository"]
@@ -1,102 +1,65 @@
 """Menu queries expressed with the SQLAlchemy ORM."""
 from __future__ import annotations
 
-from decimal import Decimal
 from typing import Dict, List, Mapping
 
 from sqlalchemy import select
-from sqlalchemy.orm import joinedload
 
 from app.integration.models import db
+from app.integration.models.ingredient import Ingredient
 from app.integration.models.menu_item import MenuItem
-from app.integration.models.pizza import Pizza, PizzaIngredient, PizzaMenuPrice
+from app.integration.models.pizza import PizzaIngredient, PizzaMenuPrice
 
 
 class MenuRepository:
     """Provides read-only access to menu data via ORM queries."""
 
-    def fetch_menu_overview(self) -> List[Mapping[str, object]]:
-        """Return a compact list of pizzas with their menu pricing."""
-        stmt = select(PizzaMenuPrice).order_by(PizzaMenuPrice.pizza_name)
-        records = db.session.execute(stmt).scalars().all()
-        return [self._serialize_menu_overview(record) for record in records]
-
-    def fetch_pizza_details(self) -> List[Mapping[str, object]]:
-        """Return pizzas enriched with ingredient lists and pricing details."""
-        stmt = (
-            select(Pizza)
-            .options(
-                joinedload(Pizza.menu_price),
-                joinedload(Pizza.pizza_ingredients).joinedload(PizzaIngredient.ingredient),
+    def fetch_pizza_catalog(self) -> List[Mapping[str, object]]:
+        """Return priced pizzas with exact prices and their ingredient names."""
+        price_rows = db.session.execute(
+            select(
+                PizzaMenuPrice.pizza_id,
+                PizzaMenuPrice.pizza_name,
+                PizzaMenuPrice.calculated_price,
+                PizzaMenuPrice.pizza_isvegan,
+                PizzaMenuPrice.pizza_isvegetarian,
             )
-            .order_by(Pizza.pizza_name)
-        )
-        pizzas = db.session.execute(stmt).scalars().unique().all()
-        return [
-            self._serialize_pizza_detail(pizza)
-            for pizza in pizzas
-            if pizza.menu_price is not None
-        ]
+        ).all()
+        ingredient_rows = db.session.execute(
+            select(PizzaIngredient.pizza_id, Ingredient.name)
+            .join(Ingredient, Ingredient.ingredient_id == PizzaIngredient.ingredient_id)
+        ).all()
 
-    def fetch_active_menu_items(self) -> List[Mapping[str, object]]:
-        """Return all active non-pizza menu items."""
-        stmt = (
-            select(MenuItem)
-            .where(MenuItem.active.is_(True))
-            .order_by(MenuItem.type, MenuItem.name)
-        )
-        items = db.session.execute(stmt).scalars().all()
-        return [self._serialize_menu_item(item) for item in items]
+        ingredients: Dict[int, set] = {}
+        for pizza_id, name in ingredient_rows:
+            ingredients.setdefault(pizza_id, set()).add(name)
 
-    @staticmethod
-    def _serialize_menu_overview(price: PizzaMenuPrice) -> Dict[str, object]:
-        """Convert a pizza menu price row into a mapping."""
-        return {
-            "pizza_id": price.pizza_id,
-            "pizza_name": price.pizza_name,
-            "final_price": MenuRepository._decimal_to_float(price.calculated_price),
-            "is_vegan": MenuRepository._to_bool(price.pizza_isvegan),
-            "is_vegetarian": MenuRepository._to_bool(price.pizza_isvegetarian),
-        }
-
-    @staticmethod
-    def _serialize_pizza_detail(pizza: Pizza) -> Dict[str, object]:
-        """Produce a record combining price and ingredient information."""
-        price = pizza.menu_price
-        ingredient_names = sorted(
+        return [
             {
-                link.ingredient.name
-                for link in pizza.pizza_ingredients
-                if link.ingredient is not None
+                "pizza_id": row.pizza_id,
+                "pizza_name": row.pizza_name,
+                "calculated_price": row.calculated_price,
+                "is_vegan": self._to_bool(row.pizza_isvegan),
+                "is_vegetarian": self._to_bool(row.pizza_isvegetarian),
+                "ingredients": tuple(sorted(ingredients.get(row.pizza_id, ()))),
             }
-        )
-        return {
-            "pizza_id": pizza.pizza_id,
-            "pizza_name": price.pizza_name or pizza.pizza_name,
-            "final_price": MenuRepository._decimal_to_float(price.calculated_price),
-            "is_vegan": MenuRepository._to_bool(price.pizza_isvegan),
-            "is_vegetarian": MenuRepository._to_bool(price.pizza_isvegetarian),
-            "ingredients": ", ".join(ingredient_names),
-        }
-
-    @staticmethod
-    def _serialize_menu_item(item: MenuItem) -> Dict[str, object]:
-        """Normalize non-pizza items."""
-        return {
-            "item_id": item.item_id,
-            "name": item.name,
-            "type": item.type,
-            "final_price": MenuRepository._decimal_to_float(item.base_price),
-            "is_vegan": MenuRepository._to_bool(item.is_vegan),
-            "is_vegetarian": MenuRepository._to_bool(item.is_vegetarian),
-        }
+            for row in price_rows
+        ]
 
-    @staticmethod
-    def _decimal_to_float(value: Decimal | None) -> float | None:
-        """Convert Decimal values to floats while preserving ``None``."""
-        if value is None:
-            return None
-        return float(value)
+    def fetch_menu_item_catalog(self) -> List[Mapping[str, object]]:
+        """Return every menu item, including inactive ones, with exact prices."""
+        rows = db.session.execute(
+            select(
+                MenuItem.item_id,
+                MenuItem.name,
+                MenuItem.type,
+                MenuItem.base_price,
+                MenuItem.is_vegan,
+                MenuItem.is_vegetarian,
+                MenuItem.active,
+            )
+        ).mappings().all()
+        return [dict(row) for row in rows]
 
     @staticmethod
     def _to_bool(value: object) -> bool:
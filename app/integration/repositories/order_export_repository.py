@@ -0,0 +1,118 @@
+"""Bulk reads of order history for exports."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterator, List, Mapping, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.integration.models import db
+from app.integration.models.order import Order, OrderItem
+from app.integration.read_routing import replica_router
+
+ORDER_EXPORT_COLUMNS = (
+    "order_id",
+    "customer_id",
+    "status",
+    "placed_at",
+    "delivery_postcode_id",
+    "delivery_driver_id",
+    "discount_code_id",
+    "total_before_discounts",
+    "discount_total",
+    "total_due",
+    "loyalty_discount_applied",
+    "birthday_pizza_applied",
+    "birthday_drink_applied",
+    "notes",
+)
+
+ITEM_EXPORT_COLUMNS = (
+    "order_item_id",
+    "item_type",
+    "pizza_id",
+    "menu_item_id",
+    "description",
+    "quantity",
+    "unit_price",
+    "discount_amount",
+)
+
+
+class OrderExportRepository:
+    """Walk orders and their lines in primary-key pages with constant memory."""
+
+    def iter_orders(
+        self,
+        *,
+        placed_from: Optional[datetime] = None,
+        placed_before: Optional[datetime] = None,
+        page_size: int = 1000,
+    ) -> Iterator[Tuple[Mapping[str, object], List[Mapping[str, object]]]]:
+        """Yield ``(order, items)`` pairs in ``Order_ID`` order.
+
+        Each page is a keyset query (``Order_ID > last seen``) on its own short
+        connection, so no transaction stays open for the whole export and no
+        ORM objects are built. The page's lines are streamed from a server-side
+        cursor and merged with their orders on the fly. Pages come from the
+        replica while it keeps up with the primary.
+        """
+        after = 0
+        while True:
+            with replica_router.read_engine(db.engines).connect() as connection:
+                orders = connection.execute(
+                    self.order_page_query(
+                        after=after,
+                        placed_from=placed_from,
+                        placed_before=placed_before,
+                        limit=page_size,
+                    )
+                ).mappings().all()
+                if not orders:
+                    return
+                items = connection.execution_options(stream_results=True, yield_per=page_size).execute(
+                    self.order_items_query([order["order_id"] for order in orders])
+                ).mappings()
+                pending = next(items, None)
+                for order in orders:
+                    lines = []
+                    while pending is not None and pending["order_id"] == order["order_id"]:
+                        lines.append(pending)
+                        pending = next(items, None)
+                    yield order, lines
+            after = orders[-1]["order_id"]
+
+    def order_page_query(
+        self,
+        *,
+        after: int,
+        placed_from: Optional[datetime],
+        placed_before: Optional[datetime],
+        limit: int,
+    ):
+        """One keyset page of orders following ``after``."""
+        stmt = (
+            select(*(getattr(Order, column).label(column) for column in ORDER_EXPORT_COLUMNS))
+            .where(Order.order_id > after)
+            .order_by(Order.order_id)
+            .limit(limit)
+        )
+        if placed_from is not None:
+            stmt = stmt.where(Order.placed_at >= placed_from)
+        if placed_before is not None:
+            stmt = stmt.where(Order.placed_at < placed_before)
+        return stmt
+
+    def order_items_query(self, order_ids: List[int]):
+        """Lines of the given orders, grouped by order in ``Order_ID`` order."""
+        return (
+            select(
+                OrderItem.order_id.label("order_id"),
+                *(getattr(OrderItem, column).label(column) for column in ITEM_EXPORT_COLUMNS),
+            )
+            .where(OrderItem.order_id.in_(order_ids))
+            .order_by(OrderItem.order_id, OrderItem.order_item_id)
+        )
+
+
+__all__ = ["ITEM_EXPORT_COLUMNS", "ORDER_EXPORT_COLUMNS", "OrderExportRepository"]
@@ -0,0 +1,154 @@
+"""Persistence helpers for the asynchronous order queue."""
+from __future__ import annotations
+
+import json
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.integration.models import db
+from app.integration.models.order_job import OrderJob
+
+
+class OrderJobRepository:
+    """Enqueue, claim and settle queued order jobs."""
+
+    def enqueue(
+        self,
+        *,
+        customer_id: int,
+        payload: Dict[str, object],
+        now: datetime,
+        idempotency_key: Optional[str] = None,
+        request_hash: Optional[str] = None,
+    ) -> OrderJob:
+        """Add a queued job to the session; the caller commits."""
+        job = OrderJob(
+            customer_id=customer_id,
+            payload=json.dumps(payload, sort_keys=True),
+            idempotency_key=idempotency_key,
+            request_hash=request_hash,
+            status="queued",
+            attempts=0,
+            created_at=now,
+            available_at=now,
+        )
+        db.session.add(job)
+        return job
+
+    def get(self, job_id: int) -> Optional[OrderJob]:
+        """Return one job by identifier."""
+        return db.session.get(OrderJob, job_id)
+
+    def find_by_key(self, *, customer_id: int, key: str) -> Optional[OrderJob]:
+        """Return the job a customer submitted with ``key``, if any."""
+        return db.session.scalars(
+            select(OrderJob).where(OrderJob.customer_id == customer_id, OrderJob.idempotency_key == key)
+        ).first()
+
+    def claim_batch(
+        self,
+        worker_id: str,
+        *,
+        limit: int,
+        now: datetime,
+        lease_seconds: float,
+    ) -> List[OrderJob]:
+        """Claim up to ``limit`` runnable jobs for ``worker_id`` and commit the claim.
+
+        Runnable means queued and due, or still processing under a lease that has
+        expired because its worker died. Candidates are locked with SKIP LOCKED
+        where supported, and the claiming UPDATE repeats the runnable condition,
+        so concurrent workers never claim the same job.
+        """
+        # A fresh token per claim tells this claim's rows apart from earlier ones.
+        claim = f"{worker_id[:48]}/{uuid.uuid4().hex[:12]}"
+        runnable = or_(
+            and_(OrderJob.status == "queued", OrderJob.available_at <= now),
+            and_(
+                OrderJob.status == "processing",
+                OrderJob.claimed_at < now - timedelta(seconds=lease_seconds),
+            ),
+        )
+        candidates = db.session.scalars(
+            select(OrderJob.job_id)
+            .where(runnable)
+            .order_by(OrderJob.job_id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not candidates:
+            db.session.rollback()
+            return []
+        db.session.execute(
+            update(OrderJob)
+            .where(OrderJob.job_id.in_(candidates), runnable)
+            .values(
+                status="processing",
+                claimed_by=claim,
+                claimed_at=now,
+                attempts=OrderJob.attempts + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return list(
+            db.session.scalars(
+                select(OrderJob)
+                .where(
+                    OrderJob.job_id.in_(candidates),
+                    OrderJob.status == "processing",
+                    OrderJob.claimed_by == claim,
+                )
+                .order_by(OrderJob.job_id)
+                .execution_options(populate_existing=True)
+            )
+        )
+
+    def mark_done(self, job: OrderJob, *, order_id: int, now: datetime) -> bool:
+        """Record the placed order in the caller's transaction; False if the claim was lost."""
+        return self._settle(job, status="done", order_id=order_id, errors=None, finished_at=now)
+
+    def mark_failed(self, job: OrderJob, *, errors: Dict[str, str], now: datetime) -> bool:
+        """Give up on a job and keep the reasons for the status endpoint."""
+        return self._settle(job, status="failed", errors=json.dumps(errors, sort_keys=True), finished_at=now)
+
+    def retry_later(self, job: OrderJob, *, errors: Dict[str, str], available_at: datetime) -> bool:
+        """Put a job back in the queue until ``available_at``."""
+        return self._settle(
+            job,
+            status="queued",
+            errors=json.dumps(errors, sort_keys=True),
+            available_at=available_at,
+            claimed_by=None,
+            claimed_at=None,
+        )
+
+    @staticmethod
+    def _settle(job: OrderJob, **values: object) -> bool:
+        """Update a job only while this worker's claim on it is current.
+
+        A worker that outlived its lease finds its claim replaced and writes
+        nothing, so a job taken over by another worker is never settled twice.
+        """
+        result = db.session.execute(
+            update(OrderJob)
+            .where(
+                OrderJob.job_id == job.job_id,
+                OrderJob.status == "processing",
+                OrderJob.claimed_by == job.claimed_by,
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            return False
+        for key, value in values.items():
+            set_committed_value(job, key, value)
+        return True
+
+
+__all__ = ["OrderJobRepository"]
@@ -2,7 +2,11 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import Iterable, Optional
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 
 from app.integration.models import db
 from app.integration.models.order import Order, OrderItem
@@ -10,36 +14,31 @@ from app.integration.models.pizza import Pizza, PizzaMenuPrice
 from app.integration.models.menu_item import MenuItem
 
 
+# Everything an order summary shows: its lines, driver and discount code.
+_ORDER_SUMMARY = (
+    selectinload(Order.items),
+    joinedload(Order.delivery_person),
+    joinedload(Order.discount_code),
+    raiseload("*"),
+)
+
+
 class OrderRepository:
     """Repository abstraction for order entities."""
 
-    def create_blank_order(
-        self,
-        *,
-        customer_id: int,
-        delivery_postcode_id: Optional[int],
-        notes: Optional[str] = None,
-    ) -> Order:
-        """Instantiate a new order shell and add it to the session."""
-        order = Order(
-            customer_id=customer_id,
-            delivery_postcode_id=delivery_postcode_id,
-            notes=notes,
-        )
-        db.session.add(order)
-        return order
+    # Order lines per INSERT statement; keeps bulk checkouts under driver parameter limits.
+    ITEM_INSERT_BATCH = 500
 
     def add_pizza_item(
         self,
         order: Order,
         *,
-        pizza: Pizza,
+        pizza: Pizza | Row,
         unit_price: Decimal,
         quantity: int = 1,
     ) -> OrderItem:
         """Append a pizza line item to the order."""
         item = OrderItem(
-            order=order,
             item_type="pizza",
             pizza_id=pizza.pizza_id,
             description=pizza.pizza_name,
@@ -60,7 +59,6 @@ class OrderRepository:
     ) -> OrderItem:
         """Append a non-pizza menu item line to the order."""
         item = OrderItem(
-            order=order,
             item_type=menu_item.type,
             menu_item_id=menu_item.item_id,
             description=menu_item.name,
@@ -71,22 +69,86 @@ class OrderRepository:
         order.items.append(item)
         return item
 
-    def get_pizza_with_price(self, pizza_id: int) -> Optional[tuple[Pizza, PizzaMenuPrice]]:
-        """Fetch a pizza together with its menu price row."""
-        pizza = Pizza.query.filter_by(pizza_id=pizza_id).first()
-        if not pizza or not pizza.menu_price:
-            return None
-        return pizza, pizza.menu_price
+    def get_pizzas_with_prices(self, pizza_ids: Iterable[int]) -> Dict[int, Row]:
+        """Return pricing rows keyed by ``pizza_id``, skipping unpriced pizzas."""
+        unique_ids = list(dict.fromkeys(pizza_ids))
+        if not unique_ids:
+            return {}
+        stmt = (
+            select(Pizza.pizza_id, Pizza.pizza_name, PizzaMenuPrice.calculated_price)
+            .join(PizzaMenuPrice, PizzaMenuPrice.pizza_id == Pizza.pizza_id)
+            .where(Pizza.pizza_id.in_(unique_ids))
+        )
+        return {row.pizza_id: row for row in db.session.execute(stmt)}
 
     def get_menu_items(self, item_ids: Iterable[int]) -> list[MenuItem]:
         """Retrieve menu items matching the supplied identifiers."""
         if not item_ids:
             return []
-        return MenuItem.query.filter(MenuItem.item_id.in_(list(item_ids))).all()
+        return MenuItem.query.options(raiseload("*")).filter(MenuItem.item_id.in_(list(item_ids))).all()
+
+    def insert_orders(self, drafts: Sequence[Order]) -> List[Order]:
+        """Insert priced draft orders with one flush for the headers and one multi-row INSERT for their items.
 
-    def persist(self) -> None:
-        """Flush pending changes so generated identifiers become available."""
+        The drafts are never added to the session; stored copies of the headers are returned
+        in the same order.
+        """
+        headers = [
+            Order(
+                customer_id=draft.customer_id,
+                delivery_postcode_id=draft.delivery_postcode_id,
+                delivery_driver_id=draft.delivery_driver_id,
+                discount_code=draft.discount_code,
+                status=draft.status,
+                placed_at=draft.placed_at,
+                total_before_discounts=draft.total_before_discounts,
+                discount_total=draft.discount_total,
+                total_due=draft.total_due,
+                loyalty_discount_applied=draft.loyalty_discount_applied,
+                birthday_pizza_applied=draft.birthday_pizza_applied,
+                birthday_drink_applied=draft.birthday_drink_applied,
+                notes=draft.notes,
+            )
+            for draft in drafts
+        ]
+        db.session.add_all(headers)
         db.session.flush()
 
+        rows = [
+            {
+                "order_id": header.order_id,
+                "item_type": item.item_type,
+                "pizza_id": item.pizza_id,
+                "menu_item_id": item.menu_item_id,
+                "description": item.description,
+                "quantity": item.quantity,
+                "unit_price": item.unit_price,
+                "discount_amount": item.discount_amount,
+            }
+            for header, draft in zip(headers, drafts)
+            for item in draft.items
+        ]
+        # Multi-row VALUES: one statement per batch however the lines differ in shape.
+        for start in range(0, len(rows), self.ITEM_INSERT_BATCH):
+            db.session.execute(insert(OrderItem).values(rows[start:start + self.ITEM_INSERT_BATCH]))
+        return headers
+
+    def get_order(self, order_id: int) -> Optional[Order]:
+        """Load one order with its items and delivery details."""
+        return self.get_orders([order_id]).get(order_id)
+
+    def get_orders(self, order_ids: Iterable[int]) -> Dict[int, Order]:
+        """Load orders with their items and delivery details, keyed by ``order_id``."""
+        unique_ids = list(dict.fromkeys(order_ids))
+        if not unique_ids:
+            return {}
+        orders = (
+            Order.query.options(*_ORDER_SUMMARY)
+            .filter(Order.order_id.in_(unique_ids))
+            .populate_existing()
+            .all()
+        )
+        return {order.order_id: order for order in orders}
+
 
 __all__ = ["OrderRepository"]
@@ -23,7 +23,7 @@ class PostcodeRepository:
     def _next_id(self) -> int:
         """Compute the next postcode identifier in sequence."""
         max_id = db.session.query(func.max(Postcode.postcode_id)).scalar() or 0
-       return int(max_id) + 1
+        return int(max_id) + 1
 
     def create(self, postcode_code: str) -> int:
         """Insert a new postcode row and return its identifier."""
@@ -1,104 +1,196 @@
-"""Read-only reporting queries backed by database views."""
+"""Read-only reporting queries over indexed ranges and rollup tables."""
 from __future__ import annotations
 
-from datetime import date
-from typing import List, Mapping
+import calendar
+from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, Mapping, Optional
 
-from sqlalchemy import text
+from sqlalchemy import func, select
 
+from app.integration.columnar_reports import ColumnarOrderStore, columnar_reports
 from app.integration.models import db
+from app.integration.models.customer import Customer
+from app.integration.models.delivery import DeliveryPerson
+from app.integration.models.order import Order, OrderItem
+from app.integration.models.pizza import Pizza
+from app.integration.models.postcode import Postcode
+from app.integration.models.reporting import MonthlyEarningsRollup
+from app.integration.read_routing import read_only
+from app.integration.repositories.earnings_rollup_repository import AGE_GROUPS, DIMENSIONS
 
 
 class ReportingRepository:
-    """Executes reporting queries against pre-built SQL views."""
+    """Executes index-friendly reporting queries and rollup lookups."""
 
+    UNDELIVERED_STATUSES = ("new", "preparing", "dispatched")
+
+    def __init__(self, columnar: Optional[ColumnarOrderStore] = None) -> None:
+        """Use the in-memory column store for earnings and top pizzas when it is enabled."""
+        self._columnar = columnar or columnar_reports
+
+    @read_only()
     def fetch_undelivered_orders(self) -> List[Mapping[str, object]]:
         """Return outstanding orders."""
-        stmt = text(
-            """
-            SELECT *
-            FROM staff_undelivered_orders
-            ORDER BY placed_at ASC
-            """
-        )
-        rows = db.session.execute(stmt).mappings().all()
-        return [dict(row) for row in rows]
+        now = datetime.utcnow()
+        rows = db.session.execute(self.undelivered_orders_query()).mappings().all()
+        results = []
+        for row in rows:
+            data = dict(row)
+            data["minutes_since_placed"] = int((now - row["placed_at"]).total_seconds() // 60)
+            data["order_value"] = self._round_money(row["order_value"])
+            results.append(data)
+        return results
 
+    @read_only()
     def fetch_top_pizzas_last_month(self, limit: int = 3) -> List[Mapping[str, object]]:
         """Return a list of top-selling pizzas for the previous month."""
-        stmt = text(
-            """
-            SELECT pizza_id,
-                   pizza_name,
-                   total_quantity,
-                   ROUND(pizza_revenue, 2) AS pizza_revenue
-            FROM staff_top_pizzas_last_month
-            ORDER BY total_quantity DESC, pizza_id
-            LIMIT :limit
-            """
-        )
-        rows = db.session.execute(stmt, {"limit": limit}).mappings().all()
+        start, end = self._last_month_range()
+        if self._columnar.enabled:
+            rows = self._columnar.top_pizzas(start, end, limit)
+        else:
+            rows = db.session.execute(self.top_pizzas_query(start, end, limit)).mappings().all()
         results = []
         for idx, row in enumerate(rows, start=1):
             data = dict(row)
+            data["pizza_revenue"] = self._round_money(row["pizza_revenue"])
             data["popularity_rank"] = idx
             results.append(data)
         return results
 
     def earnings_by_gender(self, year: int | None, month: int | None) -> List[Mapping[str, object]]:
         """Summarize revenue grouped by customer gender."""
-        year, month = self._resolve_period(year, month)
-        stmt = text(
-            """
-            SELECT report_year,
-                   report_month,
-                   gender,
-                   order_count,
-                   revenue
-            FROM staff_monthly_earnings_by_gender
-            WHERE report_year = :year AND report_month = :month
-            ORDER BY gender
-            """
-        )
-        rows = db.session.execute(stmt, {"year": year, "month": month}).mappings().all()
-        return [dict(row) for row in rows]
+        rows = self._earnings_rollup("gender", year, month)
+        return sorted(rows, key=lambda row: row["gender"])
 
     def earnings_by_age_group(self, year: int | None, month: int | None) -> List[Mapping[str, object]]:
         """Summarize monthly revenue by age bracket."""
-        year, month = self._resolve_period(year, month)
-        stmt = text(
-            """
-            SELECT report_year,
-                   report_month,
-                   age_group,
-                   order_count,
-                   revenue
-            FROM staff_monthly_earnings_by_age_group
-            WHERE report_year = :year AND report_month = :month
-            ORDER BY FIELD(age_group, '18-24', '25-34', '35-44', '45-54', '55+', 'Unknown')
-            """
-        )
-        rows = db.session.execute(stmt, {"year": year, "month": month}).mappings().all()
-        return [dict(row) for row in rows]
+        rows = self._earnings_rollup("age_group", year, month)
+        return sorted(rows, key=lambda row: AGE_GROUPS.index(row["age_group"]))
 
     def earnings_by_postcode(self, year: int | None, month: int | None) -> List[Mapping[str, object]]:
         """Summarize monthly revenue by postcode."""
+        rows = self._earnings_rollup("postcode", year, month)
+        for row in rows:
+            row["postcode"] = row["postcode"] or None
+        return sorted(rows, key=lambda row: (row["postcode"] is not None, row["postcode"] or ""))
+
+    @read_only()
+    def _earnings_rollup(self, dimension: str, year: int | None, month: int | None) -> List[Dict[str, object]]:
+        """Read one month of a rollup dimension, labelling the value column after it."""
         year, month = self._resolve_period(year, month)
-        stmt = text(
-            """
-            SELECT report_year,
-                   report_month,
-                   postcode,
-                   order_count,
-                   revenue
-            FROM staff_monthly_earnings_by_postcode
-            WHERE report_year = :year AND report_month = :month
-            ORDER BY postcode
-            """
-        )
-        rows = db.session.execute(stmt, {"year": year, "month": month}).mappings().all()
+        if self._columnar.enabled:
+            return self._columnar.earnings(dimension, year, month)
+        stmt = self.earnings_rollup_query(dimension, year, month)
+        rows = db.session.execute(stmt).mappings().all()
         return [dict(row) for row in rows]
 
+    def undelivered_orders_query(self):
+        """Outstanding orders with their customer, driver and order value."""
+        line_total = (OrderItem.unit_price * OrderItem.quantity) - OrderItem.discount_amount
+        return (
+            select(
+                Order.order_id.label("order_id"),
+                Order.status.label("order_status"),
+                Order.placed_at.label("placed_at"),
+                Customer.customer_id.label("customer_id"),
+                Customer.name.label("customer_name"),
+                Customer.email_address.label("customer_email"),
+                Postcode.postcode.label("delivery_postcode"),
+                DeliveryPerson.delivery_driver_id.label("driver_id"),
+                DeliveryPerson.name.label("driver_name"),
+                func.count(OrderItem.order_item_id).label("item_count"),
+                func.sum(line_total).label("order_value"),
+            )
+            .join(Customer, Customer.customer_id == Order.customer_id)
+            .outerjoin(Postcode, Postcode.postcode_id == Order.delivery_postcode_id)
+            .outerjoin(DeliveryPerson, DeliveryPerson.delivery_driver_id == Order.delivery_driver_id)
+            .join(OrderItem, OrderItem.order_id == Order.order_id)
+            # A positive status list can use the status index, unlike NOT IN.
+            .where(Order.status.in_(self.UNDELIVERED_STATUSES))
+            .group_by(
+                Order.order_id,
+                Order.status,
+                Order.placed_at,
+                Customer.customer_id,
+                Customer.name,
+                Customer.email_address,
+                Postcode.postcode,
+                DeliveryPerson.delivery_driver_id,
+                DeliveryPerson.name,
+            )
+            .order_by(Order.placed_at.asc())
+        )
+
+    def top_pizzas_query(self, start: datetime, end: datetime, limit: int):
+        """Best-selling pizzas for orders placed within ``[start, end)``."""
+        total_quantity = func.sum(OrderItem.quantity).label("total_quantity")
+        return (
+            select(
+                OrderItem.pizza_id.label("pizza_id"),
+                Pizza.pizza_name.label("pizza_name"),
+                total_quantity,
+                func.sum(
+                    (OrderItem.unit_price * OrderItem.quantity) - OrderItem.discount_amount
+                ).label("pizza_revenue"),
+            )
+            .select_from(Order)
+            .join(OrderItem, OrderItem.order_id == Order.order_id)
+            .join(Pizza, Pizza.pizza_id == OrderItem.pizza_id)
+            .where(
+                Order.placed_at >= start,
+                Order.placed_at < end,
+                Order.status != "failed",
+                OrderItem.item_type == "pizza",
+            )
+            .group_by(OrderItem.pizza_id, Pizza.pizza_name)
+            .order_by(total_quantity.desc(), OrderItem.pizza_id)
+            .limit(limit)
+        )
+
+    def earnings_rollup_query(self, dimension: str, year: int, month: int):
+        """One month of one earnings rollup dimension."""
+        return select(
+            MonthlyEarningsRollup.report_year,
+            MonthlyEarningsRollup.report_month,
+            MonthlyEarningsRollup.dimension_value.label(dimension),
+            MonthlyEarningsRollup.order_count,
+            MonthlyEarningsRollup.revenue,
+        ).where(
+            MonthlyEarningsRollup.report_year == year,
+            MonthlyEarningsRollup.report_month == month,
+            MonthlyEarningsRollup.dimension == dimension,
+        )
+
+    def plan_check_queries(self) -> Dict[str, object]:
+        """Return every reporting query with representative arguments for EXPLAIN checks."""
+        today = date.today()
+        start, end = self._last_month_range()
+        queries: Dict[str, object] = {
+            "undelivered_orders": self.undelivered_orders_query(),
+            "top_pizzas_last_month": self.top_pizzas_query(start, end, 3),
+        }
+        for dimension in DIMENSIONS:
+            queries[f"earnings_by_{dimension}"] = self.earnings_rollup_query(
+                dimension, today.year, today.month
+            )
+        return queries
+
+    @staticmethod
+    def _last_month_range() -> tuple[datetime, datetime]:
+        """Return ``[now - 1 month, now)`` with the month clamped like MySQL's DATE_SUB."""
+        end = datetime.utcnow()
+        year, month = (end.year, end.month - 1) if end.month > 1 else (end.year - 1, 12)
+        day = min(end.day, calendar.monthrange(year, month)[1])
+        return end.replace(year=year, month=month, day=day), end
+
+    @staticmethod
+    def _round_money(value: object) -> Decimal | None:
+        """Round aggregated money to cents regardless of the driver's numeric type."""
+        if value is None:
+            return None
+        return Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
     @staticmethod
     def _resolve_period(year: int | None, month: int | None) -> tuple[int, int]:
         """Fallback to the current month when no explicit period is supplied."""
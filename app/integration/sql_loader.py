@@ -0,0 +1,328 @@
+"""Streaming loader for SQL seed files and dumps."""
+from __future__ import annotations
+
+import logging
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_COMMIT_ROWS = 10000
+
+# Characters that change tokenizer state outside literals and comments.
+_SPECIAL = re.compile(r"'|\"|`|--(?=\s|$)|#|/\*")
+_DELIMITER_DIRECTIVE = re.compile(r"\s*DELIMITER\s+(\S+)\s*$", re.IGNORECASE)
+_QUOTE_END = {
+    "'": re.compile(r"\\.|''|'", re.DOTALL),
+    '"': re.compile(r'\\.|""|"', re.DOTALL),
+    "`": re.compile(r"``|`"),
+}
+
+_INSERT_VALUES = re.compile(
+    r"\s*INSERT\s+(?P<ignore>IGNORE\s+)?INTO\s+(?P<table>[`\"\w.]+)\s*"
+    r"(?P<columns>\([^()]*\))?\s*VALUES\s*",
+    re.IGNORECASE,
+)
+_VALUE_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<string>'(?:[^'\\]|\\.|'')*')
+      | (?P<number>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+      | (?P<keyword>NULL|TRUE|FALSE)\b
+    )\s*""",
+    re.IGNORECASE | re.VERBOSE | re.DOTALL,
+)
+_WHITESPACE = re.compile(r"\s*")
+_STRING_LITERAL = re.compile(r"('(?:[^'\\]|\\.|'')*')", re.DOTALL)
+_ESCAPES = {"0": "\0", "b": "\b", "n": "\n", "r": "\r", "t": "\t", "Z": "\x1a"}
+_KEYWORDS = {"NULL": None, "TRUE": 1, "FALSE": 0}
+
+# MySQL spellings rewritten for SQLite, outside string literals only.
+_SQLITE_REWRITES = (
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.IGNORECASE), "INSERT OR IGNORE"),
+    (re.compile(r"\bNOW\(\)", re.IGNORECASE), "CURRENT_TIMESTAMP"),
+)
+
+Row = Tuple[object, ...]
+
+
+@dataclass
+class LoadReport:
+    """Counters describing one load."""
+
+    statements: int = 0
+    rows: int = 0
+    batches: int = 0
+    commits: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Inserted rows per second of wall time."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.statements} statements, {self.rows} rows in {self.batches} batches, "
+            f"{self.commits} commits, {self.seconds:.2f}s ({self.rows_per_second:,.0f} rows/s)"
+        )
+
+
+def iter_statements(stream: Iterable[str]) -> Iterator[str]:
+    """Yield the statements of a SQL script read line by line.
+
+    Semicolons inside quoted strings, quoted identifiers and comments do not end
+    a statement. ``--``, ``#`` and plain ``/* */`` comments are dropped, while
+    MySQL ``/*! ... */`` version comments are kept because they are executable.
+    The mysql client ``DELIMITER`` directive is honoured.
+    """
+    delimiter = ";"
+    parts: List[str] = []
+    quote: Optional[str] = None
+    in_comment = False
+    keep_comment = False
+
+    for line in stream:
+        position = 0
+        directive = _DELIMITER_DIRECTIVE.match(line)
+        if directive and quote is None and not in_comment and not "".join(parts).strip():
+            delimiter = directive.group(1)
+            parts = []
+            continue
+
+        while position < len(line):
+            if quote is not None:
+                match = _QUOTE_END[quote].search(line, position)
+                if match is None:
+                    parts.append(line[position:])
+                    break
+                parts.append(line[position:match.end()])
+                position = match.end()
+                if match.group() == quote:
+                    quote = None
+                continue
+
+            if in_comment:
+                end = line.find("*/", position)
+                if end == -1:
+                    if keep_comment:
+                        parts.append(line[position:])
+                    break
+                if keep_comment:
+                    parts.append(line[position:end + 2])
+                position = end + 2
+                in_comment = False
+                continue
+
+            special = _SPECIAL.search(line, position)
+            cut = line.find(delimiter, position)
+            if cut != -1 and (special is None or cut < special.start()):
+                parts.append(line[position:cut])
+                statement = "".join(parts).strip()
+                if statement:
+                    yield statement
+                parts = []
+                position = cut + len(delimiter)
+                continue
+            if special is None:
+                parts.append(line[position:])
+                break
+
+            parts.append(line[position:special.start()])
+            token = special.group()
+            if token in ("--", "#"):
+                parts.append("\n")
+                break
+            if token == "/*":
+                keep_comment = line.startswith("/*!", special.start())
+                if keep_comment:
+                    parts.append(token)
+                in_comment = True
+                position = special.end()
+                continue
+            quote = token
+            parts.append(token)
+            position = special.end()
+
+    statement = "".join(parts).strip()
+    if statement:
+        yield statement
+
+
+def parse_insert(statement: str) -> Optional[Tuple[str, List[Row]]]:
+    """Split a literal multi-row ``INSERT ... VALUES`` into its header and rows.
+
+    Returns ``None`` for anything else, including inserts whose values are
+    expressions or that carry an ``ON DUPLICATE KEY UPDATE`` clause.
+    """
+    header = _INSERT_VALUES.match(statement)
+    if header is None:
+        return None
+    rows: List[Row] = []
+    position = header.end()
+    length = len(statement)
+    while True:
+        position = _skip_space(statement, position)
+        if position >= length or statement[position] != "(":
+            return None
+        position += 1
+        row: List[object] = []
+        while True:
+            token = _VALUE_TOKEN.match(statement, position)
+            if token is None:
+                return None
+            row.append(_literal_value(token))
+            position = token.end()
+            if position < length and statement[position] == ",":
+                position += 1
+                continue
+            if position < length and statement[position] == ")":
+                position += 1
+                break
+            return None
+        if rows and len(row) != len(rows[0]):
+            return None
+        rows.append(tuple(row))
+        position = _skip_space(statement, position)
+        if position >= length:
+            break
+        if statement[position] != ",":
+            return None
+        position += 1
+
+    columns = header.group("columns") or ""
+    verb = "INSERT IGNORE INTO" if header.group("ignore") else "INSERT INTO"
+    return f"{verb} {header.group('table')} {columns}".rstrip(), rows
+
+
+class SqlLoader:
+    """Execute SQL files through one connection, batching literal inserts into ``executemany``.
+
+    Consecutive inserts into the same table and columns share a batch, so a dump
+    written as many single-row inserts loads as efficiently as one written with
+    extended inserts. Work is committed every ``commit_rows`` inserted rows.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        commit_rows: int = DEFAULT_COMMIT_ROWS,
+    ) -> None:
+        """Prepare a loader for ``engine``; nothing is opened until a file is loaded."""
+        if batch_size < 1 or commit_rows < 1:
+            raise ValueError("batch_size and commit_rows must be positive.")
+        self.engine = engine
+        self.batch_size = batch_size
+        self.commit_rows = commit_rows
+        self._sqlite = engine.dialect.name == "sqlite"
+        self._placeholder = "?" if engine.dialect.paramstyle in ("qmark", "numeric") else "%s"
+
+    def load_path(self, path: str | Path) -> LoadReport:
+        """Stream ``path`` into the database and return the load counters."""
+        with open(path, "r", encoding="utf-8") as stream:
+            report = self.load(stream)
+        logger.info("Loaded %s: %s", path, report)
+        return report
+
+    def load(self, stream: Iterable[str] | IO[str]) -> LoadReport:
+        """Execute every statement in ``stream``, committing in chunks."""
+        report = LoadReport()
+        started = time.perf_counter()
+        with self.engine.connect() as connection:
+            # Statements without parameters go to the driver untouched, so literal % signs survive.
+            connection = connection.execution_options(no_parameters=True)
+            pending_header: Optional[str] = None
+            pending: List[Row] = []
+            uncommitted = 0
+
+            def flush() -> None:
+                nonlocal pending_header, pending, uncommitted
+                if pending:
+                    self._execute_batch(connection, pending_header, pending)
+                    report.rows += len(pending)
+                    report.batches += 1
+                    uncommitted += len(pending)
+                pending_header, pending = None, []
+                if uncommitted >= self.commit_rows:
+                    connection.commit()
+                    report.commits += 1
+                    uncommitted = 0
+
+            for statement in iter_statements(stream):
+                report.statements += 1
+                parsed = parse_insert(statement)
+                if parsed is None:
+                    flush()
+                    connection.exec_driver_sql(self._rewrite(statement))
+                    continue
+                header, rows = parsed
+                if header != pending_header:
+                    flush()
+                    pending_header = header
+                for row in rows:
+                    pending.append(row)
+                    if len(pending) >= self.batch_size:
+                        flush()
+                        pending_header = header
+            flush()
+            connection.commit()
+            report.commits += 1
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def _execute_batch(self, connection: Connection, header: str, rows: Sequence[Row]) -> None:
+        """Insert ``rows`` with one ``executemany`` call."""
+        marks = ", ".join([self._placeholder] * len(rows[0]))
+        connection.exec_driver_sql(self._rewrite(f"{header} VALUES ({marks})"), list(rows))
+
+    def _rewrite(self, statement: str) -> str:
+        """Translate MySQL-only spellings when loading into SQLite."""
+        if not self._sqlite:
+            return statement
+        pieces = _STRING_LITERAL.split(statement)
+        for index in range(0, len(pieces), 2):
+            for pattern, replacement in _SQLITE_REWRITES:
+                pieces[index] = pattern.sub(replacement, pieces[index])
+        return "".join(pieces)
+
+
+def _skip_space(text: str, position: int) -> int:
+    return _WHITESPACE.match(text, position).end()
+
+
+def _literal_value(token: re.Match) -> object:
+    """Convert one SQL literal into the Python value the driver should bind."""
+    kind = token.lastgroup
+    value = token.group(kind)
+    if kind == "string":
+        return _unquote(value)
+    if kind == "keyword":
+        return _KEYWORDS[value.upper()]
+    if value.lstrip("+-").isdigit():
+        return int(value)
+    # Decimals stay textual so the column type decides precision (and SQLite needs no adapter).
+    return value
+
+
+def _unquote(literal: str) -> str:
+    body = literal[1:-1].replace("''", "'")
+    if "\\" not in body:
+        return body
+    return re.sub(r"\\(.)", lambda match: _ESCAPES.get(match.group(1), match.group(1)), body, flags=re.DOTALL)
+
+
+__all__ = [
+    "DEFAULT_BATCH_SIZE",
+    "DEFAULT_COMMIT_ROWS",
+    "LoadReport",
+    "SqlLoader",
+    "iter_statements",
+    "parse_insert",
+]
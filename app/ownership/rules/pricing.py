@@ -0,0 +1,155 @@
+"""Integer-cent order pricing: birthday rewards, loyalty and discount-code allocation."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable, List, Optional, Tuple
+
+# (item_type, unit price in cents, quantity) for one order line.
+CartLine = Tuple[str, int, int]
+
+
+_CENT = Decimal("0.01")
+
+
+def to_cents(amount: Decimal | int | None) -> int:
+    """Whole cents of a money amount; prices are stored with two decimals, so nothing is rounded."""
+    if amount is None:
+        return 0
+    cents = Decimal(amount).scaleb(2)
+    whole = int(cents)
+    if whole != cents:
+        raise ValueError(f"{amount} is not a whole number of cents")
+    return whole
+
+
+def from_cents(cents: int) -> Decimal:
+    """Money amount with two decimals for ``cents``."""
+    return Decimal(cents) * _CENT
+
+
+@dataclass
+class PricedCart:
+    """Per-line discounts and order totals, all in cents, plus which rules took effect."""
+
+    discounts: List[int]
+    gross: int
+    discount_total: int
+    birthday_pizza: bool
+    birthday_drink: bool
+    loyalty: bool
+    code_applied: bool
+
+    @property
+    def total_due(self) -> int:
+        """Amount payable after every discount."""
+        return self.gross - self.discount_total
+
+
+def price_cart(
+    lines: Iterable[CartLine],
+    *,
+    birthday: bool = False,
+    loyalty_rate: Optional[Decimal] = None,
+    code_rate: Optional[Decimal] = None,
+) -> PricedCart:
+    """Price undiscounted lines the way checkout always has, in a fixed number of passes.
+
+    On a birthday the cheapest pizza and the cheapest drink line each lose one
+    unit's price. ``loyalty_rate`` and then ``code_rate`` take a percentage of
+    what is still payable, rounded half-up to the cent, and spread it over the
+    lines with the most left to discount first (ties in line order). A rate of
+    ``None`` skips that rule.
+    """
+    lines = list(lines)
+    size = len(lines)
+    discounts = [0] * size
+    # What each line can still be discounted by.
+    headroom = [unit * quantity for _, unit, quantity in lines]
+    gross = sum(headroom)
+    discount_total = 0
+
+    birthday_pizza = birthday_drink = False
+    if birthday:
+        pizza = drink = -1
+        for i, (kind, unit, _) in enumerate(lines):
+            if kind == "pizza" and (pizza < 0 or unit < lines[pizza][1]):
+                pizza = i
+            elif kind == "drink" and (drink < 0 or unit < lines[drink][1]):
+                drink = i
+        for target in (pizza, drink):
+            if target >= 0 and lines[target][1] > 0:
+                unit = lines[target][1]
+                discounts[target] = unit
+                headroom[target] -= unit
+                discount_total += unit
+        birthday_pizza, birthday_drink = pizza >= 0, drink >= 0
+
+    # Lines that can still take a discount, most headroom first (a stable sort keeps
+    # ties in line order); allocations keep this order up to date without re-sorting.
+    queue = [i for i in sorted(range(size), key=headroom.__getitem__, reverse=True) if headroom[i] > 0]
+
+    code_applied = False
+    for is_code, rate in ((False, loyalty_rate), (True, code_rate)):
+        if rate is None:
+            continue
+        amount = _percent_of(gross - discount_total, rate)
+        if amount <= 0:
+            continue
+        code_applied = code_applied or is_code
+        queue, placed = _allocate(amount, queue, headroom, discounts)
+        discount_total += placed
+
+    return PricedCart(
+        discounts=discounts,
+        gross=gross,
+        discount_total=discount_total,
+        birthday_pizza=birthday_pizza,
+        birthday_drink=birthday_drink,
+        loyalty=loyalty_rate is not None,
+        code_applied=code_applied,
+    )
+
+
+def _percent_of(base: int, rate: Decimal) -> int:
+    """``base * rate`` rounded half-up to whole cents, exactly as ``Decimal.quantize`` does."""
+    if base <= 0:
+        return 0
+    numerator, denominator = Decimal(rate).as_integer_ratio()
+    quotient, remainder = divmod(base * abs(numerator), denominator)
+    if 2 * remainder >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
+
+
+def _allocate(amount: int, queue: List[int], headroom: List[int], discounts: List[int]) -> Tuple[List[int], int]:
+    """Fill lines in ``queue`` order until ``amount`` is used; return the open queue and cents placed.
+
+    Lines before the last one touched are exhausted and drop out. The last one
+    may keep some headroom and is slotted back among the untouched lines, which
+    are still in order, so no re-sort is needed. Less than ``amount`` is placed
+    only when every line runs out.
+    """
+    remaining = amount
+    for position, line in enumerate(queue):
+        taken = min(headroom[line], remaining)
+        discounts[line] += taken
+        headroom[line] -= taken
+        remaining -= taken
+        if remaining <= 0:
+            break
+    else:
+        return [], amount - remaining
+    rest = queue[position + 1:]
+    left = headroom[line]
+    if left > 0:
+        slot = 0
+        while slot < len(rest) and (
+            headroom[rest[slot]] > left or (headroom[rest[slot]] == left and rest[slot] < line)
+        ):
+            slot += 1
+        rest.insert(slot, line)
+    return rest, amount
+
+
+__all__ = ["CartLine", "PricedCart", "from_cents", "price_cart", "to_cents"]
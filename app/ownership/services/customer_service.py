@@ -15,18 +15,34 @@ from app.integration.models.customer import Customer
 class CustomerService:
     """Handle customer-related business logic and validation."""
 
+    DEFAULT_PAGE_SIZE = 100
+    MAX_PAGE_SIZE = 1000
+
     def __init__(self, repository: Optional[CustomerRepository] = None) -> None:
         """Initialize repositories used for customer operations."""
         self._repository = repository or CustomerRepository()
         self._postcode_repository = PostcodeRepository()
 
-    def list_customers(self) -> List[Dict[str, object]]:
-        """Return a list of customer data for display."""
-        customers = self._repository.get_all()
-        return [
-            {"id": customer.customer_id, "username": customer.username, "name": customer.name}
-            for customer in customers
+    def list_customers(
+        self,
+        *,
+        after_id: int = 0,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Tuple[List[Dict[str, object]], Optional[int]]:
+        """Return one page of customers and the ``after_id`` of the next page, if any."""
+        limit = max(1, min(limit, self.MAX_PAGE_SIZE))
+        # One extra row tells whether another page follows without counting.
+        rows = self._repository.list_page(after_id=after_id, limit=limit + 1)
+        next_after_id = rows[limit - 1].customer_id if len(rows) > limit else None
+        customers = [
+            {"id": row.customer_id, "username": row.username, "name": row.name}
+            for row in rows[:limit]
         ]
+        return customers, next_after_id
+
+    def estimate_customer_count(self) -> int:
+        """Return an approximate number of registered customers."""
+        return self._repository.estimate_count()
 
     def authenticate(self, username: str, password: str) -> Optional[Customer]:
         """Return the matching customer when credentials are valid."""
@@ -0,0 +1,251 @@
+"""In-memory driver availability scheduler backed by the delivery tables."""
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.integration.models.delivery import DeliveryPerson, DeliveryPersonPostcode
+from app.integration.repositories.delivery_repository import DeliveryRepository
+
+# (busy?, next free time, driver id, stamp): NULL sorts first, then earliest, then lowest id.
+HeapEntry = Tuple[bool, datetime, int, int]
+
+_dispatchers: "weakref.WeakSet[DriverDispatcher]" = weakref.WeakSet()
+
+
+@dataclass(frozen=True)
+class DriverReservation:
+    """A driver claimed for one order, with enough state to undo the claim."""
+
+    driver_id: int
+    previous_free_at: Optional[datetime]
+    busy_until: datetime
+    stamp: int
+
+
+class DriverDispatcher:
+    """Pick the earliest-free driver per postcode from min-heaps kept in memory.
+
+    Heaps use lazy deletion: every change to a driver pushes a fresh entry and
+    bumps the driver's stamp, and entries with an outdated stamp are discarded
+    when they reach the top.
+    """
+
+    MAX_CLAIM_ATTEMPTS = 5
+
+    def __init__(
+        self,
+        repository: Optional[DeliveryRepository] = None,
+        *,
+        max_age_seconds: float = 300.0,
+    ) -> None:
+        """Create an empty dispatcher that hydrates through ``repository`` on first use."""
+        self._repository = repository or DeliveryRepository()
+        self._max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        self._free_at: Dict[int, Optional[datetime]] = {}
+        self._stamps: Dict[int, int] = {}
+        self._zones: Dict[int, List[int]] = {}
+        self._postcode_heaps: Dict[int, List[HeapEntry]] = {}
+        self._any_heap: List[HeapEntry] = []
+        self.conflicts = 0
+        _dispatchers.add(self)
+
+    def hydrate(self) -> None:
+        """Reload every driver and postcode link from the database."""
+        free_at, links = self._repository.dispatch_roster()
+        zones: Dict[int, List[int]] = {}
+        for driver_id, postcode_id in links:
+            zones.setdefault(driver_id, []).append(postcode_id)
+
+        with self._lock:
+            self._free_at = dict(free_at)
+            self._stamps = {driver_id: 0 for driver_id in free_at}
+            self._zones = zones
+            self._any_heap = [self._entry(driver_id) for driver_id in free_at]
+            self._postcode_heaps = {}
+            for driver_id, postcode_ids in zones.items():
+                if driver_id not in free_at:
+                    continue
+                for postcode_id in postcode_ids:
+                    self._postcode_heaps.setdefault(postcode_id, []).append(self._entry(driver_id))
+            heapq.heapify(self._any_heap)
+            for heap in self._postcode_heaps.values():
+                heapq.heapify(heap)
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Forget the in-memory schedule so the next reservation rehydrates it."""
+        with self._lock:
+            self._loaded_at = None
+
+    def reserve(
+        self,
+        postcode_id: Optional[int],
+        *,
+        reference_time: datetime,
+        busy_until: datetime,
+    ) -> Optional[DriverReservation]:
+        """Claim the first driver free at ``reference_time`` for a postcode.
+
+        Drivers linked to the postcode are preferred; any driver is eligible only
+        when nobody serves the postcode. The claim is written through the current
+        session, so it commits or rolls back with the order.
+        """
+        self._ensure_fresh()
+        for _ in range(self.MAX_CLAIM_ATTEMPTS):
+            with self._lock:
+                reservation = self._take(postcode_id, reference_time, busy_until)
+            if reservation is None:
+                return None
+            if self._repository.claim_driver(
+                reservation.driver_id,
+                reference_time=reference_time,
+                busy_until=busy_until,
+            ):
+                return reservation
+            # Another process assigned this driver; learn their real schedule and retry.
+            self.conflicts += 1
+            exists, free_at = self._repository.driver_free_at(reservation.driver_id)
+            with self._lock:
+                if exists:
+                    self._set_free_at(reservation.driver_id, free_at)
+                else:
+                    self._forget(reservation.driver_id)
+        return None
+
+    def cancel(self, reservation: Optional[DriverReservation]) -> None:
+        """Undo an in-memory claim whose order transaction was rolled back."""
+        if reservation is None:
+            return
+        with self._lock:
+            if self._stamps.get(reservation.driver_id) == reservation.stamp:
+                self._set_free_at(reservation.driver_id, reservation.previous_free_at)
+
+    def stats(self) -> Dict[str, int]:
+        """Return driver, postcode and conflict counters."""
+        return {
+            "drivers": len(self._free_at),
+            "postcodes": len(self._postcode_heaps),
+            "conflicts": self.conflicts,
+        }
+
+    def _ensure_fresh(self) -> None:
+        """Hydrate on first use and whenever the schedule is older than ``max_age_seconds``."""
+        loaded_at = self._loaded_at
+        if loaded_at is not None and time.monotonic() - loaded_at < self._max_age_seconds:
+            return
+        self.hydrate()
+
+    def _take(
+        self,
+        postcode_id: Optional[int],
+        reference_time: datetime,
+        busy_until: datetime,
+    ) -> Optional[DriverReservation]:
+        """Mark the earliest-free eligible driver busy in memory and return the claim."""
+        heap = self._postcode_heaps.get(postcode_id) if postcode_id is not None else None
+        if not self._peek(heap or []):
+            heap = self._any_heap
+        top = self._peek(heap)
+        if top is None:
+            return None
+        driver_id = top[2]
+        previous = self._free_at[driver_id]
+        if previous is not None and previous > reference_time:
+            return None
+        stamp = self._set_free_at(driver_id, busy_until)
+        return DriverReservation(
+            driver_id=driver_id,
+            previous_free_at=previous,
+            busy_until=busy_until,
+            stamp=stamp,
+        )
+
+    def _peek(self, heap: List[HeapEntry]) -> Optional[HeapEntry]:
+        """Drop stale entries from the top of ``heap`` and return the live minimum."""
+        while heap:
+            entry = heap[0]
+            if self._stamps.get(entry[2]) == entry[3]:
+                return entry
+            heapq.heappop(heap)
+        return None
+
+    def _set_free_at(self, driver_id: int, free_at: Optional[datetime]) -> int:
+        """Record a driver's next-free time and push fresh entries onto their heaps."""
+        self._free_at[driver_id] = free_at
+        stamp = self._stamps.get(driver_id, 0) + 1
+        self._stamps[driver_id] = stamp
+        entry = self._entry(driver_id)
+        heapq.heappush(self._any_heap, entry)
+        for postcode_id in self._zones.get(driver_id, ()):
+            heapq.heappush(self._postcode_heaps.setdefault(postcode_id, []), entry)
+        return stamp
+
+    def _forget(self, driver_id: int) -> None:
+        """Remove a driver that no longer exists; their heap entries become stale."""
+        self._free_at.pop(driver_id, None)
+        self._stamps.pop(driver_id, None)
+        self._zones.pop(driver_id, None)
+
+    def _entry(self, driver_id: int) -> HeapEntry:
+        free_at = self._free_at[driver_id]
+        return (free_at is not None, free_at or datetime.min, driver_id, self._stamps[driver_id])
+
+
+def invalidate_driver_dispatchers() -> None:
+    """Invalidate every dispatcher living in this process."""
+    for dispatcher in list(_dispatchers):
+        dispatcher.invalidate()
+
+
+DRIVER_MODELS = (DeliveryPerson, DeliveryPersonPostcode)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_driver_changes(session, flush_context) -> None:
+    """Remember whether the flush changed drivers or their postcodes through the ORM."""
+    if session.info.get("drivers_changed"):
+        return
+    if any(isinstance(instance, DRIVER_MODELS) for instance in (*session.new, *session.deleted)):
+        session.info["drivers_changed"] = True
+        return
+    for instance in session.dirty:
+        # Adding an order to a driver's loaded collection does not change the schedule.
+        if isinstance(instance, DRIVER_MODELS) and session.is_modified(
+            instance, include_collections=False
+        ):
+            session.info["drivers_changed"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session) -> None:
+    """Rehydrate dispatchers once driver changes are committed."""
+    if session.info.pop("drivers_changed", False):
+        invalidate_driver_dispatchers()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_driver_changes(session) -> None:
+    """Forget pending driver changes that were rolled back."""
+    session.info.pop("drivers_changed", None)
+
+
+driver_dispatcher = DriverDispatcher()
+
+__all__ = [
+    "DriverDispatcher",
+    "DriverReservation",
+    "driver_dispatcher",
+    "invalidate_driver_dispatchers",
+]
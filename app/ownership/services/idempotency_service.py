@@ -0,0 +1,133 @@
+"""Make order submissions safe to retry with an Idempotency-Key."""
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from app.integration.models import db
+from app.integration.models.idempotency import IdempotencyKey
+from app.integration.models.order import Order
+from app.integration.repositories.idempotency_repository import IdempotencyRepository
+from app.integration.repositories.order_repository import OrderRepository
+
+
+@dataclass
+class IdempotentRequest:
+    """Outcome of presenting a key: run the request, replay a response, or reject it."""
+
+    record: Optional[IdempotencyKey] = None
+    status_code: int = 200
+    body: Optional[Dict[str, object]] = None
+    order: Optional[Order] = None
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+class IdempotencyService:
+    """Hand out keys to one request at a time and remember what they produced."""
+
+    MAX_KEY_LENGTH = 255
+    # A holder silent for this long without placing its order is presumed dead.
+    LOCK_SECONDS = 30
+    WAIT_SECONDS = 10.0
+    POLL_SECONDS = 0.05
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 86400,
+        repository: Optional[IdempotencyRepository] = None,
+        order_repository: Optional[OrderRepository] = None,
+    ) -> None:
+        """Store collaborators and the key retention period."""
+        self._ttl = timedelta(seconds=ttl_seconds)
+        self._keys = repository or IdempotencyRepository()
+        self._orders = order_repository or OrderRepository()
+
+    @staticmethod
+    def request_hash(customer_id: int, payload: object) -> str:
+        """Fingerprint a request so a reused key with a different body is caught."""
+        canonical = json.dumps([customer_id, payload], sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def begin(self, *, customer_id: int, key: str, payload: object) -> IdempotentRequest:
+        """Claim ``key`` for this request, or say what to answer instead.
+
+        A concurrent duplicate polls until the first attempt finishes, then
+        replays its response; it gives up with a 409 after ``WAIT_SECONDS``.
+        """
+        if not key.strip() or len(key) > self.MAX_KEY_LENGTH:
+            return IdempotentRequest(
+                status_code=400,
+                errors={"idempotency_key": f"Idempotency-Key must be 1 to {self.MAX_KEY_LENGTH} characters."},
+            )
+        request_hash = self.request_hash(customer_id, payload)
+        deadline = time.monotonic() + self.WAIT_SECONDS
+        while True:
+            now = datetime.utcnow()
+            record = self._keys.reserve(
+                customer_id=customer_id,
+                key=key,
+                request_hash=request_hash,
+                now=now,
+                expires_at=now + self._ttl,
+            )
+            if record is not None:
+                return IdempotentRequest(record=record)
+
+            existing = self._keys.find(customer_id=customer_id, key=key)
+            if existing is None:
+                # Released or evicted between the insert and the read.
+                continue
+            if existing.expires_at <= now:
+                self._keys.discard_expired(existing, now=now)
+                continue
+            if existing.request_hash != request_hash:
+                db.session.rollback()
+                return IdempotentRequest(
+                    status_code=422,
+                    errors={"idempotency_key": "This Idempotency-Key was already used for a different request."},
+                )
+            if existing.status == "completed":
+                body = json.loads(existing.response_body) if existing.response_body else None
+                db.session.rollback()
+                return IdempotentRequest(status_code=existing.response_status, body=body)
+            if existing.order_id is not None:
+                # The order committed but its holder stopped before storing the response.
+                order = self._orders.get_order(existing.order_id)
+                db.session.rollback()
+                return IdempotentRequest(status_code=201, order=order)
+            if existing.locked_at <= now - timedelta(seconds=self.LOCK_SECONDS):
+                if self._keys.take_over(existing, now=now):
+                    return IdempotentRequest(record=existing)
+                continue
+            # End the read transaction so the next poll sees the holder's commit.
+            db.session.rollback()
+            if time.monotonic() >= deadline:
+                return IdempotentRequest(
+                    status_code=409,
+                    errors={"idempotency_key": "A request with this Idempotency-Key is still being processed."},
+                )
+            time.sleep(self.POLL_SECONDS)
+
+    def attach_order(self, record: IdempotencyKey, order: Order) -> bool:
+        """Bind the order to the key inside the order's transaction."""
+        return self._keys.attach_order(record, order_id=order.order_id)
+
+    def complete(self, record: IdempotencyKey, *, status_code: int, body: Dict[str, object]) -> None:
+        """Store the response so later retries replay it."""
+        self._keys.complete(record, status_code=status_code, body=body)
+
+    def release(self, record: IdempotencyKey) -> None:
+        """Give the key back after a request that changed nothing."""
+        self._keys.release(record)
+
+    def purge_expired(self, *, now: Optional[datetime] = None) -> int:
+        """Delete keys past their retention period."""
+        return self._keys.purge_expired(now=now or datetime.utcnow())
+
+
+__all__ = ["IdempotencyService", "IdempotentRequest"]
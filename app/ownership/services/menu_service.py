@@ -3,24 +3,50 @@ from __future__ import annotations
 
 from typing import Dict, List, Optional
 
-from app.integration.repositories.menu_repository import MenuRepository
+from app.integration.catalog_cache import (
+    CatalogCache,
+    CatalogSnapshot,
+    MenuItemSnapshot,
+    PizzaSnapshot,
+    catalog_cache,
+)
 from app.ownership.entities.menu import MenuSections
 
 
 class MenuService:
     """Coordinate retrieval and formatting of menu data."""
 
-    def __init__(self, repository: Optional[MenuRepository] = None) -> None:
-        self._repository = repository or MenuRepository()
+    def __init__(self, catalog: Optional[CatalogCache] = None) -> None:
+        self._catalog = catalog or catalog_cache
 
-    def menu_overview(self) -> List[Dict[str, object]]:
+    @property
+    def cacheable(self) -> bool:
+        """True when successive calls reuse one snapshot until the catalog changes."""
+        return self._catalog.enabled
+
+    def catalog_snapshot(self) -> CatalogSnapshot:
+        """Return the catalog snapshot the menu is currently built from."""
+        return self._catalog.snapshot()
+
+    def menu_overview(self, snapshot: Optional[CatalogSnapshot] = None) -> List[Dict[str, object]]:
         """Return a summarized pizza menu."""
-        return self._repository.fetch_menu_overview()
+        return [self._serialize_pizza(pizza) for pizza in self._sorted_pizzas(snapshot)]
 
-    def build_sections(self) -> MenuSections:
+    def build_sections(self, snapshot: Optional[CatalogSnapshot] = None) -> MenuSections:
         """Return pizzas and grouped extras for the menu template."""
-        pizzas = self._repository.fetch_pizza_details()
-        extras = self._repository.fetch_active_menu_items()
+        snapshot = snapshot or self._catalog.snapshot()
+        pizzas = [
+            {**self._serialize_pizza(pizza), "ingredients": ", ".join(pizza.ingredients)}
+            for pizza in self._sorted_pizzas(snapshot)
+        ]
+        extras = [
+            self._serialize_menu_item(item)
+            for item in sorted(
+                snapshot.menu_items.values(),
+                key=lambda item: (item.type or "", item.name or ""),
+            )
+            if item.active
+        ]
 
         grouped: Dict[str, List[Dict[str, object]]] = {}
         for item in extras:
@@ -29,5 +55,35 @@ class MenuService:
 
         return MenuSections(pizzas=pizzas, extras_by_type=grouped)
 
+    def _sorted_pizzas(self, snapshot: Optional[CatalogSnapshot] = None) -> List[PizzaSnapshot]:
+        """Return priced pizzas in menu order."""
+        return sorted(
+            (snapshot or self._catalog.snapshot()).pizzas.values(),
+            key=lambda pizza: pizza.pizza_name or "",
+        )
+
+    @staticmethod
+    def _serialize_pizza(pizza: PizzaSnapshot) -> Dict[str, object]:
+        """Convert a pizza snapshot into a template/JSON friendly mapping."""
+        return {
+            "pizza_id": pizza.pizza_id,
+            "pizza_name": pizza.pizza_name,
+            "final_price": float(pizza.calculated_price),
+            "is_vegan": pizza.is_vegan,
+            "is_vegetarian": pizza.is_vegetarian,
+        }
+
+    @staticmethod
+    def _serialize_menu_item(item: MenuItemSnapshot) -> Dict[str, object]:
+        """Convert a menu item snapshot into a template/JSON friendly mapping."""
+        return {
+            "item_id": item.item_id,
+            "name": item.name,
+            "type": item.type,
+            "final_price": float(item.base_price) if item.base_price is not None else None,
+            "is_vegan": item.is_vegan,
+            "is_vegetarian": item.is_vegetarian,
+        }
+
 
 __all__ = ["MenuService"]
@@ -0,0 +1,137 @@
+"""Encode order history as NDJSON or CSV streams for analytics."""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Iterable, Iterator, List, Optional
+
+from app.integration.repositories.order_export_repository import (
+    ITEM_EXPORT_COLUMNS,
+    ORDER_EXPORT_COLUMNS,
+    OrderExportRepository,
+)
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+
+class OrderExportService:
+    """Turn the order history into byte chunks ready to be written or streamed."""
+
+    # Encoded output is handed on in chunks of roughly this many bytes.
+    CHUNK_BYTES = 64 * 1024
+
+    def __init__(self, repository: Optional[OrderExportRepository] = None) -> None:
+        """Store the repository used to read orders."""
+        self._repository = repository or OrderExportRepository()
+
+    def export(
+        self,
+        fmt: str,
+        *,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        compress: bool = False,
+        page_size: int = 1000,
+    ) -> Iterator[bytes]:
+        """Yield the orders placed between ``start`` and ``end`` (inclusive) as ``fmt``.
+
+        NDJSON has one order per line with its lines nested under ``items``; CSV
+        has one row per order line with the order columns repeated. With
+        ``compress`` the chunks form a single gzip stream.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format {fmt!r}; use one of {', '.join(EXPORT_FORMATS)}.")
+        records = self._repository.iter_orders(
+            placed_from=datetime.combine(start, time.min) if start else None,
+            placed_before=datetime.combine(end + timedelta(days=1), time.min) if end else None,
+            page_size=page_size,
+        )
+        encoded = self._ndjson(records) if fmt == "ndjson" else self._csv(records)
+        chunks = self._chunked(encoded)
+        return self._gzip(chunks) if compress else chunks
+
+    @staticmethod
+    def _ndjson(records) -> Iterator[str]:
+        """One JSON document per order."""
+        for order, items in records:
+            document = {column: _json_value(order[column]) for column in ORDER_EXPORT_COLUMNS}
+            document["items"] = [
+                {column: _json_value(item[column]) for column in ITEM_EXPORT_COLUMNS} for item in items
+            ]
+            yield json.dumps(document, separators=(",", ":")) + "\n"
+
+    @staticmethod
+    def _csv(records) -> Iterator[str]:
+        """A header, then one row per order line; orders without lines get one bare row."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        item_columns = [
+            column if column.startswith("item_") or column == "order_item_id" else f"item_{column}"
+            for column in ITEM_EXPORT_COLUMNS
+        ]
+        writer.writerow([*ORDER_EXPORT_COLUMNS, *item_columns])
+        # Emitted on its own so an empty range still produces a header.
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        blank_item: List[str] = [""] * len(ITEM_EXPORT_COLUMNS)
+        for order, items in records:
+            order_values = [_csv_value(order[column]) for column in ORDER_EXPORT_COLUMNS]
+            if not items:
+                writer.writerow(order_values + blank_item)
+            for item in items:
+                writer.writerow(order_values + [_csv_value(item[column]) for column in ITEM_EXPORT_COLUMNS])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    def _chunked(self, pieces: Iterable[str]) -> Iterator[bytes]:
+        """Join small encoded pieces into chunks of about ``CHUNK_BYTES``."""
+        pending: List[bytes] = []
+        size = 0
+        for piece in pieces:
+            data = piece.encode("utf-8")
+            pending.append(data)
+            size += len(data)
+            if size >= self.CHUNK_BYTES:
+                yield b"".join(pending)
+                pending, size = [], 0
+        if pending:
+            yield b"".join(pending)
+
+    @staticmethod
+    def _gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Compress chunks into one gzip member as they are produced."""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+def _json_value(value: object) -> object:
+    """Convert Decimals and datetimes into JSON-friendly values."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_value(value: object) -> object:
+    """Render a column value for CSV without losing decimal precision."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+__all__ = ["EXPORT_FORMATS", "OrderExportService"]
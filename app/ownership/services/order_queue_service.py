@@ -0,0 +1,176 @@
+"""Accept-then-process checkout: queue orders now, place them from workers."""
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+
+from app.integration.models import db
+from app.integration.models.order import Order
+from app.integration.models.order_job import OrderJob
+from app.integration.repositories.order_job_repository import OrderJobRepository
+from app.integration.repositories.order_repository import OrderRepository
+from app.ownership.services.idempotency_service import IdempotencyService
+from app.ownership.services.order_service import OrderService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JobSubmission:
+    """Outcome of a submission: a newly queued job, an earlier one replayed, or errors."""
+
+    job: Optional[OrderJob] = None
+    replayed: bool = False
+    status_code: int = 202
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+class OrderQueueService:
+    """Validate and enqueue order submissions, and drain them through ``OrderService``."""
+
+    MAX_ATTEMPTS = 5
+    RETRY_DELAY_SECONDS = 15
+    MAX_RETRY_DELAY_SECONDS = 300
+    LEASE_SECONDS = 120
+    # Outcomes that can clear up by themselves; anything else fails the job at once.
+    RETRYABLE_ERRORS = frozenset({"delivery"})
+
+    def __init__(
+        self,
+        *,
+        job_repository: Optional[OrderJobRepository] = None,
+        order_repository: Optional[OrderRepository] = None,
+        order_service: Optional[OrderService] = None,
+    ) -> None:
+        """Store collaborators."""
+        self._jobs = job_repository or OrderJobRepository()
+        self._orders = order_repository or OrderRepository()
+        self._order_service = order_service or OrderService()
+
+    def submit(
+        self,
+        *,
+        customer_id: int,
+        payload: Dict[str, object],
+        idempotency_key: Optional[str] = None,
+        now: Optional[datetime] = None,
+    ) -> JobSubmission:
+        """Check the submission's shape and queue it; pricing happens in a worker.
+
+        A submission repeating an earlier ``idempotency_key`` gets that job back
+        instead of queueing the order a second time.
+        """
+        max_length = IdempotencyService.MAX_KEY_LENGTH
+        if idempotency_key is not None and (not idempotency_key.strip() or len(idempotency_key) > max_length):
+            return JobSubmission(
+                status_code=400,
+                errors={"idempotency_key": f"Idempotency-Key must be 1 to {max_length} characters."},
+            )
+        request = self._order_service.parse_request({**payload, "customer_id": customer_id})
+        if not request.pizzas:
+            return JobSubmission(
+                status_code=400, errors={"pizzas": "At least one pizza must be included in an order."}
+            )
+
+        fields = asdict(request)
+        fields.pop("customer_id")
+        request_hash = None
+        if idempotency_key is not None:
+            request_hash = IdempotencyService.request_hash(customer_id, fields)
+            existing = self._jobs.find_by_key(customer_id=customer_id, key=idempotency_key)
+            if existing is not None:
+                return self._replay(existing, request_hash)
+
+        job = self._jobs.enqueue(
+            customer_id=customer_id,
+            payload=fields,
+            now=now or datetime.utcnow(),
+            idempotency_key=idempotency_key,
+            request_hash=request_hash,
+        )
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            if idempotency_key is not None:
+                # A concurrent retry queued the job between the lookup and the insert.
+                existing = self._jobs.find_by_key(customer_id=customer_id, key=idempotency_key)
+                if existing is not None:
+                    return self._replay(existing, request_hash)
+            return JobSubmission(status_code=401, errors={"customer": "Customer not found."})
+        return JobSubmission(job=job)
+
+    @staticmethod
+    def _replay(existing: OrderJob, request_hash: Optional[str]) -> JobSubmission:
+        """Answer a repeated key with its job, unless the key came with a different order."""
+        if existing.request_hash != request_hash:
+            return JobSubmission(
+                status_code=422,
+                errors={"idempotency_key": "This Idempotency-Key was already used for a different request."},
+            )
+        return JobSubmission(job=existing, replayed=True)
+
+    def get_job(self, job_id: int, *, customer_id: int) -> Tuple[Optional[OrderJob], Optional[Order]]:
+        """Return a customer's job and, once placed, its order summary."""
+        job = self._jobs.get(job_id)
+        if job is None or job.customer_id != customer_id:
+            return None, None
+        order = self._orders.get_order(job.order_id) if job.order_id else None
+        return job, order
+
+    def process_batch(self, worker_id: str, *, batch_size: int = 20, now: Optional[datetime] = None) -> int:
+        """Claim up to ``batch_size`` jobs and place each order; returns how many were claimed."""
+        jobs = self._jobs.claim_batch(
+            worker_id,
+            limit=batch_size,
+            now=now or datetime.utcnow(),
+            lease_seconds=self.LEASE_SECONDS,
+        )
+        for job in jobs:
+            self._process(job)
+        return len(jobs)
+
+    def _process(self, job: OrderJob) -> None:
+        """Place one queued order and settle the job in the same transaction."""
+        request = json.loads(job.payload)
+
+        def settle(order: Order) -> bool:
+            return self._jobs.mark_done(job, order_id=order.order_id, now=datetime.utcnow())
+
+        try:
+            order, errors = self._order_service.place_order(
+                customer_id=job.customer_id,
+                pizzas=request["pizzas"],
+                drinks=request["drinks"],
+                desserts=request["desserts"],
+                discount_code=request.get("discount_code"),
+                notes=request.get("notes"),
+                # Price as of when the customer checked out, but dispatch from now:
+                # drivers freed since then are eligible and retries see fresh availability.
+                requested_at=job.created_at,
+                dispatch_at=datetime.utcnow(),
+                on_persisted=settle,
+            )
+        except Exception:
+            logger.exception("Order job %s failed on attempt %s", job.job_id, job.attempts)
+            order, errors = None, {"server": "The order could not be processed."}
+
+        if order is not None or "conflict" in errors:
+            # Placed and settled atomically, or another worker owns the job now.
+            return
+        if set(errors) <= self.RETRYABLE_ERRORS or "server" in errors:
+            if job.attempts < self.MAX_ATTEMPTS:
+                delay = min(self.RETRY_DELAY_SECONDS * 2 ** (job.attempts - 1), self.MAX_RETRY_DELAY_SECONDS)
+                self._jobs.retry_later(job, errors=errors, available_at=datetime.utcnow() + timedelta(seconds=delay))
+                db.session.commit()
+                return
+        self._jobs.mark_failed(job, errors=errors, now=datetime.utcnow())
+        db.session.commit()
+
+
+__all__ = ["JobSubmission", "OrderQueueService"]
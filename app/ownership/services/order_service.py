@@ -2,20 +2,36 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
-from decimal import Decimal, ROUND_HALF_UP
-from typing import Dict, Iterable, List, Optional, Tuple
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import IntegrityError
 
+from app.integration.catalog_cache import (
+    CatalogCache,
+    MenuItemSnapshot,
+    PizzaSnapshot,
+    catalog_cache,
+)
 from app.integration.models import db
 from app.integration.models.customer import Customer
+from app.integration.models.discount import DiscountCode, normalize_discount_code
+from app.integration.models.menu_item import MenuItem
 from app.integration.models.order import Order, OrderItem
+from app.integration.read_routing import read_only, use_primary
 from app.integration.repositories.customer_repository import CustomerRepository
-from app.integration.repositories.delivery_repository import DeliveryRepository
 from app.integration.repositories.discount_repository import DiscountRepository
+from app.integration.repositories.earnings_rollup_repository import EarningsRollupRepository
 from app.integration.repositories.order_repository import OrderRepository
+from app.ownership.rules.pricing import from_cents, price_cart, to_cents
+from app.ownership.services.driver_dispatcher import (
+    DriverDispatcher,
+    DriverReservation,
+    driver_dispatcher,
+)
 
 
 @dataclass
@@ -26,10 +42,50 @@ class OrderRequestItem:
     quantity: int
 
 
+@dataclass
+class BulkOrderRequest:
+    """One parsed order submission, from a bulk batch or the order queue."""
+
+    customer_id: Optional[int]
+    pizzas: List[OrderRequestItem]
+    drinks: List[OrderRequestItem]
+    desserts: List[OrderRequestItem]
+    discount_code: Optional[str] = None
+    notes: Optional[str] = None
+
+
+@dataclass
+class BulkOrderResult:
+    """Outcome of one entry in a bulk submission: the stored order or its errors."""
+
+    index: int
+    order: Optional[Order] = None
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class PricedDraft:
+    """A validated checkout priced as an unsaved order, with what placing it needs."""
+
+    order: Order
+    customer: Customer
+    discount: Optional[DiscountCode]
+    discount_applied: bool
+    pizza_count: int
+
+
 class NoDriverAvailableError(RuntimeError):
     """Internal signal raised when no delivery driver can accept an order."""
 
 
+class DiscountCodeTakenError(RuntimeError):
+    """Internal signal raised when a concurrent order redeemed the code first."""
+
+
+class OrderSupersededError(RuntimeError):
+    """Internal signal raised when the caller's ``on_persisted`` check rejects the order."""
+
+
 class OrderService:
     """Handles placing orders, applying discounts, and assigning drivers."""
 
@@ -43,14 +99,20 @@ class OrderService:
         order_repository: Optional[OrderRepository] = None,
         customer_repository: Optional[CustomerRepository] = None,
         discount_repository: Optional[DiscountRepository] = None,
-        delivery_repository: Optional[DeliveryRepository] = None,
+        catalog: Optional[CatalogCache] = None,
+        earnings_repository: Optional[EarningsRollupRepository] = None,
+        dispatcher: Optional[DriverDispatcher] = None,
     ) -> None:
         """Store repository collaborators."""
         self._orders = order_repository or OrderRepository()
         self._customers = customer_repository or CustomerRepository()
         self._discounts = discount_repository or DiscountRepository()
-        self._delivery = delivery_repository or DeliveryRepository()
+        self._catalog = catalog or catalog_cache
+        self._earnings = earnings_repository or EarningsRollupRepository()
+        self._dispatcher = dispatcher or driver_dispatcher
 
+    # Checkout reads its own writes, so even read-only repository calls stay on the primary.
+    @use_primary()
     def place_order(
         self,
         *,
@@ -61,8 +123,303 @@ class OrderService:
         discount_code: Optional[str] = None,
         notes: Optional[str] = None,
         requested_at: Optional[datetime] = None,
+        dispatch_at: Optional[datetime] = None,
+        on_persisted: Optional[Callable[[Order], bool]] = None,
     ) -> Tuple[Optional[Order], Dict[str, str]]:
-        """Validate request data, build the order, and record any errors."""
+        """Validate request data, build the order, and record any errors.
+
+        Prices and codes are checked as of ``requested_at``; a driver must be free
+        at ``dispatch_at``, which defaults to ``requested_at``. ``on_persisted``
+        runs inside the order's transaction once it is priced; returning False
+        rolls the order back and reports a ``conflict`` error.
+        """
+        requested_at = requested_at or datetime.utcnow()
+        dispatch_at = dispatch_at or requested_at
+        priced, errors = self._price_request(
+            customer_id=customer_id,
+            pizzas=pizzas,
+            drinks=drinks,
+            desserts=desserts,
+            discount_code=discount_code,
+            notes=notes,
+            requested_at=requested_at,
+            placed_at=datetime.utcnow(),
+        )
+        if priced is None:
+            return None, errors
+        draft, customer, discount = priced.order, priced.customer, priced.discount
+
+        order: Optional[Order] = None
+        reservation: Optional[DriverReservation] = None
+
+        try:
+            # The conditional UPDATE decides the winner when checkouts race for one code.
+            if discount and priced.discount_applied and not self._discounts.redeem(
+                discount, on_date=requested_at.date()
+            ):
+                raise DiscountCodeTakenError()
+
+            reservation = self._dispatcher.reserve(
+                customer.postcode_id,
+                reference_time=dispatch_at,
+                busy_until=dispatch_at + timedelta(minutes=self.DRIVER_COOLDOWN_MINUTES),
+            )
+            if reservation is None:
+                raise NoDriverAvailableError()
+            draft.delivery_driver_id = reservation.driver_id
+
+            # Loyalty tracking: add purchased pizza count
+            customer.pizzas_ordered = (customer.pizzas_ordered or 0) + priced.pizza_count
+
+            # One INSERT for the order and one for all of its lines.
+            order = self._orders.insert_orders([draft])[0]
+            order_id = order.order_id
+
+            # Keep the staff earnings rollup in step with the committed order
+            self._earnings.record_order(
+                placed_at=order.placed_at,
+                gender=customer.gender,
+                birthdate=customer.birthdate,
+                postcode_id=order.delivery_postcode_id,
+                revenue=order.total_due,
+            )
+
+            if on_persisted is not None and not on_persisted(order):
+                raise OrderSupersededError()
+
+            db.session.commit()
+        except NoDriverAvailableError:
+            db.session.rollback()
+            self._dispatcher.cancel(reservation)
+            errors["delivery"] = "No delivery driver is available for the requested postcode at this time."
+            return None, errors
+        except DiscountCodeTakenError:
+            db.session.rollback()
+            self._dispatcher.cancel(reservation)
+            errors["discount_code"] = "Discount code is not valid or has already been used."
+            return None, errors
+        except OrderSupersededError:
+            db.session.rollback()
+            self._dispatcher.cancel(reservation)
+            errors["conflict"] = "The order was handled elsewhere."
+            return None, errors
+        except IntegrityError:
+            db.session.rollback()
+            self._dispatcher.cancel(reservation)
+            errors["database"] = "Could not persist the order due to a database constraint."
+            return None, errors
+        except Exception:
+            db.session.rollback()
+            self._dispatcher.cancel(reservation)
+            raise
+
+        if order is None:
+            raise RuntimeError("Order transaction completed without creating an order record.")
+
+        # Reload the summary graph in one round trip instead of lazy loads per attribute.
+        return self._orders.get_order(order_id), {}
+
+    @read_only()
+    def quote(
+        self,
+        *,
+        customer_id: int,
+        pizzas: Iterable[Dict[str, object]],
+        drinks: Iterable[Dict[str, object]] | None = None,
+        desserts: Iterable[Dict[str, object]] | None = None,
+        discount_code: Optional[str] = None,
+        notes: Optional[str] = None,
+        requested_at: Optional[datetime] = None,
+    ) -> Tuple[Optional[Order], Dict[str, str]]:
+        """Price a checkout exactly as ``place_order`` would, without storing anything.
+
+        The returned order is a detached draft with no id or driver. No code is
+        redeemed and no driver reserved, so placing the order may still fail.
+        Lookups may be answered by the replica and the catalog cache.
+        """
+        requested_at = requested_at or datetime.utcnow()
+        with db.session.no_autoflush:
+            priced, errors = self._price_request(
+                customer_id=customer_id,
+                pizzas=pizzas,
+                drinks=drinks,
+                desserts=desserts,
+                discount_code=discount_code,
+                notes=notes,
+                requested_at=requested_at,
+                placed_at=requested_at,
+            )
+        return (priced.order if priced is not None else None), errors
+
+    @use_primary()
+    def place_orders_bulk(
+        self,
+        submissions: Iterable[Dict[str, object]],
+        *,
+        requested_at: Optional[datetime] = None,
+    ) -> List[BulkOrderResult]:
+        """Place a batch of orders in one transaction, reporting each entry separately.
+
+        Customers, pizzas, menu items and discount codes are resolved once for the
+        whole batch. Entries are priced in submission order with the same rules as
+        ``place_order``, so loyalty counts and single-use codes carry over between
+        entries. Invalid entries are reported and skipped; the rest are inserted
+        together.
+        """
+        requested_at = requested_at or datetime.utcnow()
+        today = requested_at.date()
+        busy_until = requested_at + timedelta(minutes=self.DRIVER_COOLDOWN_MINUTES)
+
+        requests = [self.parse_request(raw) for raw in submissions]
+        results = [BulkOrderResult(index=index) for index in range(len(requests))]
+
+        customers = self._customers.get_by_ids(
+            {req.customer_id for req in requests if req.customer_id}
+        )
+        pizzas = self._resolve_pizzas(
+            {line.item_id for req in requests for line in req.pizzas}
+        )
+        menu_items = self._resolve_menu_items(
+            {line.item_id for req in requests for line in req.drinks + req.desserts}
+        )
+        discounts = self._discounts.find_by_codes(
+            {req.discount_code for req in requests if req.discount_code}
+        )
+
+        accepted: List[Tuple[BulkOrderResult, Order, Customer]] = []
+        reservations: List[DriverReservation] = []
+        try:
+            for req, result in zip(requests, results):
+                errors = result.errors
+                customer = customers.get(req.customer_id) if req.customer_id else None
+                if not customer:
+                    errors["customer"] = "Customer not found."
+                if not req.pizzas:
+                    errors["pizzas"] = "At least one pizza must be included in an order."
+                if errors:
+                    continue
+
+                pizza_lines, pizza_errors = self._load_pizza_lines(req.pizzas, pizzas)
+                drink_lines, drink_errors = self._load_menu_lines(
+                    req.drinks, expected_type="drink", items_by_id=menu_items
+                )
+                dessert_lines, dessert_errors = self._load_menu_lines(
+                    req.desserts, expected_type="dessert", items_by_id=menu_items
+                )
+                errors.update(pizza_errors)
+                errors.update(drink_errors)
+                errors.update(dessert_errors)
+
+                discount = discounts.get(normalize_discount_code(req.discount_code)) if req.discount_code else None
+                if req.discount_code and not (discount and discount.is_valid_today(today)):
+                    errors["discount_code"] = "Discount code is not valid or has already been used."
+                if errors:
+                    continue
+
+                # Price a detached draft; the repository inserts it with the rest of the batch.
+                draft = self._draft_order(customer, placed_at=requested_at, notes=req.notes)
+                self._add_lines(draft, pizza_lines, drink_lines + dessert_lines)
+                discount_applied = self._apply_pricing_rules(draft, customer, discount, today)
+                redeem_code = discount is not None and discount_applied
+
+                # The code is redeemed last, inside a savepoint, so an entry that fails
+                # either step leaves neither the driver nor the code claimed.
+                savepoint = db.session.begin_nested() if redeem_code else None
+                reservation = self._dispatcher.reserve(
+                    customer.postcode_id,
+                    reference_time=requested_at,
+                    busy_until=busy_until,
+                )
+                if reservation is None:
+                    if savepoint is not None:
+                        savepoint.rollback()
+                    errors["delivery"] = "No delivery driver is available for the requested postcode at this time."
+                    continue
+                if savepoint is not None:
+                    if not self._discounts.redeem(discount, on_date=today):
+                        savepoint.rollback()
+                        self._dispatcher.cancel(reservation)
+                        errors["discount_code"] = "Discount code is not valid or has already been used."
+                        continue
+                    savepoint.commit()
+                reservations.append(reservation)
+                draft.delivery_driver_id = reservation.driver_id
+
+                customer.pizzas_ordered = (customer.pizzas_ordered or 0) + sum(
+                    qty for _, qty in pizza_lines
+                )
+                accepted.append((result, draft, customer))
+
+            if accepted:
+                stored = self._orders.insert_orders([draft for _, draft, _ in accepted])
+                self._earnings.record_orders(
+                    [
+                        {
+                            "placed_at": order.placed_at,
+                            "gender": customer.gender,
+                            "birthdate": customer.birthdate,
+                            "postcode_id": order.delivery_postcode_id,
+                            "revenue": order.total_due,
+                        }
+                        for order, (_, _, customer) in zip(stored, accepted)
+                    ]
+                )
+                order_ids = [order.order_id for order in stored]
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            for reservation in reservations:
+                self._dispatcher.cancel(reservation)
+            for result, _, _ in accepted:
+                result.errors["database"] = "Could not persist the order due to a database constraint."
+            return results
+        except Exception:
+            db.session.rollback()
+            for reservation in reservations:
+                self._dispatcher.cancel(reservation)
+            raise
+
+        if accepted:
+            orders_by_id = self._orders.get_orders(order_ids)
+            for (result, _, _), order_id in zip(accepted, order_ids):
+                result.order = orders_by_id[order_id]
+        return results
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+
+    def parse_request(self, raw: object) -> BulkOrderRequest:
+        """Normalize one submitted order; malformed values surface as validation errors later."""
+        if not isinstance(raw, dict):
+            raw = {}
+        try:
+            customer_id = int(raw.get("customer_id"))
+        except (TypeError, ValueError):
+            customer_id = None
+        discount_code = raw.get("discount_code")
+        notes = raw.get("notes")
+        return BulkOrderRequest(
+            customer_id=customer_id,
+            pizzas=self._normalize_request_items(raw.get("pizzas") or []),
+            drinks=self._normalize_request_items(raw.get("drinks") or []),
+            desserts=self._normalize_request_items(raw.get("desserts") or []),
+            discount_code=discount_code if isinstance(discount_code, str) and discount_code.strip() else None,
+            notes=notes if isinstance(notes, str) else None,
+        )
+
+    def _price_request(
+        self,
+        *,
+        customer_id: int,
+        pizzas: Iterable[Dict[str, object]],
+        drinks: Iterable[Dict[str, object]] | None,
+        desserts: Iterable[Dict[str, object]] | None,
+        discount_code: Optional[str],
+        notes: Optional[str],
+        requested_at: datetime,
+        placed_at: datetime,
+    ) -> Tuple[Optional[PricedDraft], Dict[str, str]]:
+        """Validate one checkout and price it as a detached draft; only reads are issued."""
         errors: Dict[str, str] = {}
 
         customer = self._customers.get_by_id(customer_id)
@@ -79,8 +436,6 @@ class OrderService:
         if errors:
             return None, errors
 
-        requested_at = requested_at or datetime.utcnow()
-
         pizza_lines, pizza_errors = self._load_pizza_lines(pizza_requests)
         if pizza_errors:
             errors.update(pizza_errors)
@@ -97,99 +452,90 @@ class OrderService:
         if errors:
             return None, errors
 
-        total_pizza_count = sum(qty for _, qty in pizza_lines)
-        order: Optional[Order] = None
-
-        discount_applied = False
-
-        try:
-            session = db.session
-            with session.begin_nested():
-                order = self._orders.create_blank_order(
-                    customer_id=customer.customer_id,
-                    delivery_postcode_id=customer.postcode_id,
-                    notes=notes,
-                )
-
-                for pizza, quantity in pizza_lines:
-                    menu_price = pizza.menu_price
-                    assert menu_price is not None  # ensured in _load_pizza_lines
-                    self._orders.add_pizza_item(
-                        order,
-                        pizza=pizza,
-                        quantity=quantity,
-                        unit_price=menu_price.calculated_price,
-                    )
-
-                for menu_item, quantity in drink_lines + dessert_lines:
-                    self._orders.add_menu_item(
-                        order,
-                        menu_item=menu_item,
-                        quantity=quantity,
-                        unit_price=menu_item.base_price or Decimal("0"),
-                    )
-
-                # Persist newly added line items so relationship collections are stable
-                self._orders.persist()
-
-                # Birthday freebies (cheapest pizza + drink)
-                self._apply_birthday_rewards(order, customer, requested_at.date())
-
-                # Loyalty discount (10% off once customer hit threshold)
-                if customer.pizzas_ordered >= self.LOYALTY_THRESHOLD:
-                    self._apply_order_level_discount(order, self.LOYALTY_DISCOUNT)
-                    order.loyalty_discount_applied = True
-
-                # Additional discount code
-                if discount:
-                    order.discount_code = discount
-                    discount_amount = self._calculate_percentage_discount(order, discount.discount_multiplier())
-                    if discount_amount > Decimal("0"):
-                        self._apply_explicit_discount_amount(order, discount_amount)
-                        discount_applied = True
-
-                order.recalculate_totals()
-
-                assigned_driver = self._delivery.find_available_driver(
-                    customer.postcode_id,
-                    reference_time=requested_at,
-                )
-                if not assigned_driver:
-                    raise NoDriverAvailableError()
-
-                cooldown_until = requested_at + timedelta(minutes=self.DRIVER_COOLDOWN_MINUTES)
-                assigned_driver.unavailable_until = cooldown_until
-                assigned_driver.is_available = False
-                order.delivery_person = assigned_driver
-
-                # Loyalty tracking: add purchased pizza count
-                customer.pizzas_ordered = (customer.pizzas_ordered or 0) + total_pizza_count
-
-                if discount and discount_applied:
-                    self._discounts.mark_redeemed(discount)
-
-                order.recalculate_totals()
-
-            db.session.commit()
-        except NoDriverAvailableError:
-            db.session.rollback()
-            errors["delivery"] = "No delivery driver is available for the requested postcode at this time."
-            return None, errors
-        except IntegrityError:
-            db.session.rollback()
-            errors["database"] = "Could not persist the order due to a database constraint."
-            return None, errors
-        except Exception:
-            db.session.rollback()
-            raise
-
-        if order is None:
-            raise RuntimeError("Order transaction completed without creating an order record.")
-
-        return order, {}
-
-    # ------------------------------------------------------------------
-    # Internal helpers
+        # Price a detached draft; nothing reaches the session until its amounts are final.
+        draft = self._draft_order(customer, placed_at=placed_at, notes=notes)
+        self._add_lines(draft, pizza_lines, drink_lines + dessert_lines)
+        discount_applied = self._apply_pricing_rules(draft, customer, discount, requested_at.date())
+        return (
+            PricedDraft(
+                order=draft,
+                customer=customer,
+                discount=discount,
+                discount_applied=discount_applied,
+                pizza_count=sum(qty for _, qty in pizza_lines),
+            ),
+            {},
+        )
+
+    @staticmethod
+    def _draft_order(customer: Customer, *, placed_at: datetime, notes: Optional[str]) -> Order:
+        """Return an unpriced order for ``customer`` that is not part of the session."""
+        return Order(
+            customer_id=customer.customer_id,
+            delivery_postcode_id=customer.postcode_id,
+            status="new",
+            placed_at=placed_at,
+            notes=notes,
+            loyalty_discount_applied=False,
+            birthday_pizza_applied=False,
+            birthday_drink_applied=False,
+        )
+
+    def _add_lines(
+        self,
+        order: Order,
+        pizza_lines: List[Tuple[PizzaSnapshot | Row, int]],
+        menu_lines: List[Tuple[MenuItemSnapshot | MenuItem, int]],
+    ) -> None:
+        """Append priced pizza and menu item lines to the order."""
+        for pizza, quantity in pizza_lines:
+            self._orders.add_pizza_item(
+                order,
+                pizza=pizza,
+                quantity=quantity,
+                unit_price=pizza.calculated_price,
+            )
+
+        for menu_item, quantity in menu_lines:
+            self._orders.add_menu_item(
+                order,
+                menu_item=menu_item,
+                quantity=quantity,
+                unit_price=menu_item.base_price or Decimal("0"),
+            )
+
+    def _apply_pricing_rules(
+        self,
+        order: Order,
+        customer: Customer,
+        discount: Optional[DiscountCode],
+        today: date,
+    ) -> bool:
+        """Apply birthday, loyalty and discount-code rules; True when the code took effect."""
+        items = order.items
+        birthdate = customer.birthdate
+        priced = price_cart(
+            [(item.item_type, to_cents(item.unit_price), item.quantity) for item in items],
+            # Birthday freebies (cheapest pizza + drink)
+            birthday=bool(birthdate) and (birthdate.month, birthdate.day) == (today.month, today.day),
+            # Loyalty discount (10% off once customer hit threshold)
+            loyalty_rate=(
+                self.LOYALTY_DISCOUNT if (customer.pizzas_ordered or 0) >= self.LOYALTY_THRESHOLD else None
+            ),
+            # Additional discount code
+            code_rate=discount.discount_multiplier() if discount else None,
+        )
+        for item, cents in zip(items, priced.discounts):
+            item.discount_amount = from_cents(cents)
+        order.birthday_pizza_applied = priced.birthday_pizza
+        order.birthday_drink_applied = priced.birthday_drink
+        order.loyalty_discount_applied = priced.loyalty
+        if discount:
+            order.discount_code = discount
+        order.total_before_discounts = from_cents(priced.gross)
+        order.discount_total = from_cents(priced.discount_total)
+        order.total_due = from_cents(priced.total_due)
+        return priced.code_applied
 
     def _normalize_request_items(
         self,
@@ -212,22 +558,42 @@ class OrderService:
             normalized.append(OrderRequestItem(item_id=item_id, quantity=quantity))
         return normalized
 
+    def _resolve_pizzas(self, pizza_ids: Iterable[int]) -> Dict[int, PizzaSnapshot | Row]:
+        """Look up priced pizzas from the catalog cache, or the database when it is off."""
+        if self._catalog.enabled:
+            return self._catalog.pizzas(pizza_ids)
+        return self._orders.get_pizzas_with_prices(pizza_ids)
+
+    def _resolve_menu_items(self, item_ids: Iterable[int]) -> Dict[int, MenuItemSnapshot | MenuItem]:
+        """Look up menu items from the catalog cache, or the database when it is off."""
+        if self._catalog.enabled:
+            return self._catalog.menu_items(item_ids)
+        return {item.item_id: item for item in self._orders.get_menu_items(list(item_ids))}
+
     def _load_pizza_lines(
         self,
         requests: Iterable[OrderRequestItem],
-    ) -> Tuple[List[Tuple["Pizza", int]], Dict[str, str]]:
-        """Resolve pizzas and collect quantity pairs, noting missing items."""
-        from app.integration.models.pizza import Pizza
+        priced: Optional[Dict[int, PizzaSnapshot | Row]] = None,
+    ) -> Tuple[List[Tuple[PizzaSnapshot | Row, int]], Dict[str, str]]:
+        """Resolve pizzas and their prices in bulk, noting missing items.
 
-        lines: List[Tuple[Pizza, int]] = []
+        ``priced`` may carry pizzas already resolved for a whole batch.
+        """
         errors: Dict[str, str] = {}
+        id_map = defaultdict(int)
         for req in requests:
-            found = self._orders.get_pizza_with_price(req.item_id)
-            if not found:
+            id_map[req.item_id] += req.quantity
+
+        if priced is None:
+            priced = self._resolve_pizzas(id_map.keys())
+
+        lines: List[Tuple[PizzaSnapshot | Row, int]] = []
+        for pizza_id, quantity in id_map.items():
+            pizza = priced.get(pizza_id)
+            if not pizza:
                 errors.setdefault("pizzas", "One or more pizzas are unavailable.")
                 continue
-            pizza, _ = found
-            lines.append((pizza, req.quantity))
+            lines.append((pizza, quantity))
         return lines, errors
 
     def _load_menu_lines(
@@ -235,10 +601,12 @@ class OrderService:
         requests: Iterable[OrderRequestItem],
         *,
         expected_type: str,
-    ) -> Tuple[List[Tuple["MenuItem", int]], Dict[str, str]]:
-        """Resolve drink or dessert items, ensuring they match the expected type."""
-        from app.integration.models.menu_item import MenuItem
+        items_by_id: Optional[Dict[int, MenuItemSnapshot | MenuItem]] = None,
+    ) -> Tuple[List[Tuple[MenuItemSnapshot | MenuItem, int]], Dict[str, str]]:
+        """Resolve drink or dessert items, ensuring they match the expected type.
 
+        ``items_by_id`` may carry menu items already resolved for a whole batch.
+        """
         errors: Dict[str, str] = {}
         if not requests:
             return [], errors
@@ -247,10 +615,10 @@ class OrderService:
         for req in requests:
             id_map[req.item_id] += req.quantity
 
-        menu_items = self._orders.get_menu_items(id_map.keys())
-        items_by_id = {item.item_id: item for item in menu_items}
+        if items_by_id is None:
+            items_by_id = self._resolve_menu_items(id_map.keys())
 
-        lines: List[Tuple[MenuItem, int]] = []
+        lines: List[Tuple[MenuItemSnapshot | MenuItem, int]] = []
         for item_id, quantity in id_map.items():
             item = items_by_id.get(item_id)
             if not item or (item.type or "").lower() != expected_type:
@@ -260,62 +628,5 @@ class OrderService:
             lines.append((item, quantity))
         return lines, errors
 
-    def _apply_birthday_rewards(self, order: Order, customer: Customer, today: date) -> None:
-        """Apply birthday discount to qualifying pizza and drink items."""
-        birthdate = customer.birthdate
-        if not birthdate or (birthdate.month, birthdate.day) != (today.month, today.day):
-            return
-
-        pizza_items = [item for item in order.items if item.item_type == "pizza"]
-        drink_items = [item for item in order.items if item.item_type == "drink"]
-
-        if pizza_items:
-            target = min(pizza_items, key=lambda item: item.unit_price)
-            target.apply_discount(target.unit_price)
-            order.birthday_pizza_applied = True
-
-        if drink_items:
-            target = min(drink_items, key=lambda item: item.unit_price)
-            target.apply_discount(target.unit_price)
-            order.birthday_drink_applied = True
-
-    def _apply_order_level_discount(self, order: Order, percentage: Decimal) -> None:
-        """Distribute a percentage discount across line items."""
-        gross = sum((item.unit_price * item.quantity for item in order.items), Decimal("0"))
-        existing_discounts = sum((item.discount_amount for item in order.items), Decimal("0"))
-        base = gross - existing_discounts
-        if base <= Decimal("0"):
-            return
-        amount = (base * percentage).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        if amount <= Decimal("0"):
-            return
-        self._apply_explicit_discount_amount(order, amount)
-
-    def _calculate_percentage_discount(self, order: Order, percentage: Decimal) -> Decimal:
-        """Return the value (in eur) represented by the percentage discount."""
-        gross = sum((item.unit_price * item.quantity for item in order.items), Decimal("0"))
-        existing_discounts = sum((item.discount_amount for item in order.items), Decimal("0"))
-        base = gross - existing_discounts
-        if base <= Decimal("0"):
-            return Decimal("0")
-        return (base * percentage).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-
-    def _apply_explicit_discount_amount(self, order: Order, amount: Decimal) -> None:
-        
-        remaining = amount
-        for item in sorted(
-            order.items,
-            key=lambda itm: itm.unit_price * itm.quantity - itm.discount_amount,
-            reverse=True,
-        ):
-            available = (item.unit_price * item.quantity) - item.discount_amount
-            if available <= Decimal("0"):
-                continue
-            apply = min(available, remaining)
-            item.apply_discount(apply)
-            remaining -= apply
-            if remaining <= Decimal("0"):
-                break
-
 
-__all__ = ["OrderService"]
+__all__ = ["BulkOrderRequest", "BulkOrderResult", "OrderService"]
@@ -0,0 +1,139 @@
+"""Flask CLI commands for operational database tasks."""
+from __future__ import annotations
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+
+def register_commands(app) -> None:
+    """Attach the maintenance commands to the Flask CLI."""
+    app.cli.add_command(rebuild_earnings_rollup)
+    app.cli.add_command(check_report_plans)
+    app.cli.add_command(migrate_schema)
+    app.cli.add_command(load_sql)
+    app.cli.add_command(order_worker)
+    app.cli.add_command(purge_idempotency_keys)
+    app.cli.add_command(export_orders)
+
+
+@click.command("rebuild-earnings-rollup")
+@click.option("--year", type=int, default=None, help="Only rebuild this year (requires --month).")
+@click.option("--month", type=click.IntRange(1, 12), default=None, help="Only rebuild this month.")
+@with_appcontext
+def rebuild_earnings_rollup(year: int | None, month: int | None) -> None:
+    """Backfill the monthly earnings rollup from order history."""
+    from app.integration.database_manager import DatabaseManager
+
+    if bool(year) != bool(month):
+        raise click.UsageError("--year and --month must be given together.")
+    written = DatabaseManager(current_app).rebuild_earnings_rollup(year=year, month=month)
+    click.echo(f"Wrote {written} earnings rollup rows.")
+
+
+@click.command("check-report-plans")
+@with_appcontext
+def check_report_plans() -> None:
+    """Fail when a reporting query's plan falls back to a full table scan."""
+    from app.integration.query_plans import full_table_scans
+    from app.integration.repositories.reporting_repository import ReportingRepository
+
+    failures = 0
+    for name, statement in ReportingRepository().plan_check_queries().items():
+        scans = full_table_scans(statement)
+        if scans:
+            failures += 1
+            click.echo(f"FULL SCAN  {name}: {', '.join(scans)}")
+        else:
+            click.echo(f"ok         {name}")
+    if failures:
+        raise SystemExit(1)
+
+
+@click.command("migrate-schema")
+@click.option("--reset", is_flag=True, help="Drop and reseed the order tables first.")
+@click.option("--force", is_flag=True, help="Migrate even when the schema fingerprint is unchanged.")
+@with_appcontext
+def migrate_schema(reset: bool, force: bool) -> None:
+    """Reconcile tables, views and seed data, then record the schema fingerprint."""
+    from app.integration.database_manager import DatabaseManager
+
+    manager = DatabaseManager(current_app)
+    if not (reset or force) and manager.schema_is_current():
+        click.echo("Schema is up to date.")
+        return
+    fingerprint = manager.migrate(reset=reset)
+    click.echo(f"Schema migrated to {fingerprint[:12]}.")
+
+
+@click.command("load-sql")
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option("--batch-size", type=click.IntRange(1), default=1000, show_default=True,
+              help="Rows per executemany call.")
+@click.option("--commit-rows", type=click.IntRange(1), default=10000, show_default=True,
+              help="Commit after this many inserted rows.")
+@with_appcontext
+def load_sql(paths: tuple[str, ...], batch_size: int, commit_rows: int) -> None:
+    """Stream SQL files or dumps into the database and report rows per second."""
+    from app.integration.database_manager import DatabaseManager
+
+    manager = DatabaseManager(current_app)
+    for path in paths:
+        report = manager.execute_sql_file(path, batch_size=batch_size, commit_rows=commit_rows)
+        click.echo(f"{path}: {report}")
+
+
+@click.command("order-worker")
+@click.option("--processes", type=click.IntRange(1), default=1, show_default=True,
+              help="Worker processes to run.")
+@click.option("--batch-size", type=click.IntRange(1), default=20, show_default=True,
+              help="Jobs claimed per round trip.")
+@click.option("--poll-interval", type=click.FloatRange(0), default=1.0, show_default=True,
+              help="Seconds to wait when the queue is empty.")
+@click.option("--once", is_flag=True, help="Exit once the queue is drained.")
+def order_worker(processes: int, batch_size: int, poll_interval: float, once: bool) -> None:
+    """Place orders accepted by POST /orders/async."""
+    from app.presentation.order_worker import start_workers
+
+    failed = start_workers(processes, batch_size=batch_size, poll_interval=poll_interval, once=once)
+    if failed:
+        raise SystemExit(1)
+
+
+@click.command("purge-idempotency-keys")
+@with_appcontext
+def purge_idempotency_keys() -> None:
+    """Delete stored Idempotency-Key responses past their retention period."""
+    from app.ownership.services.idempotency_service import IdempotencyService
+
+    removed = IdempotencyService().purge_expired()
+    click.echo(f"Removed {removed} expired idempotency keys.")
+
+
+@click.command("export-orders")
+@click.option("--format", "fmt", type=click.Choice(["ndjson", "csv"]), default="ndjson", show_default=True)
+@click.option("--start", type=click.DateTime(["%Y-%m-%d"]), default=None, help="First day to include.")
+@click.option("--end", type=click.DateTime(["%Y-%m-%d"]), default=None, help="Last day to include.")
+@click.option("--output", type=click.Path(dir_okay=False, writable=True), default="-", show_default=True,
+              help="File to write, or - for stdout.")
+@click.option("--gzip", "compress", is_flag=True, help="Gzip the output.")
+@click.option("--page-size", type=click.IntRange(1), default=1000, show_default=True,
+              help="Orders read per keyset page.")
+@with_appcontext
+def export_orders(fmt, start, end, output, compress, page_size) -> None:
+    """Stream orders and their lines to a file for analytics."""
+    from app.ownership.services.order_export_service import OrderExportService
+
+    chunks = OrderExportService().export(
+        fmt,
+        start=start.date() if start else None,
+        end=end.date() if end else None,
+        compress=compress,
+        page_size=page_size,
+    )
+    with click.open_file(output, "wb") as stream:
+        for chunk in chunks:
+            stream.write(chunk)
+
+
+__all__ = ["register_commands"]
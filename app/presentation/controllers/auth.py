@@ -11,12 +11,19 @@ from flask import (
     url_for,
 )
 
-from app.ownership.services.customer_service import CustomerService
+from app.presentation.lazy import LazyService
 
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
-_service = CustomerService()
+
+def _build_service():
+    from app.ownership.services.customer_service import CustomerService
+
+    return CustomerService()
+
+
+_service = LazyService(_build_service)
 
 
 @auth_bp.get("/login")
@@ -1,16 +1,41 @@
 """Customer API endpoints."""
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, url_for
 
-from app.ownership.services.customer_service import CustomerService
+from app.presentation.lazy import LazyService
 
 customers_bp = Blueprint("customers", __name__, url_prefix="/customers")
 
-_service = CustomerService()
+
+def _build_service():
+    from app.ownership.services.customer_service import CustomerService
+
+    return CustomerService()
+
+
+_service = LazyService(_build_service)
 
 @customers_bp.get("/")
 def list_customers():
-    """Return a list of registered customers."""
-    return jsonify(_service.list_customers())
+    """Return one page of registered customers.
+
+    Pages are selected with ``after_id`` (the last id already seen) and
+    ``limit``; the next page is advertised in a ``Link`` header and
+    ``X-Next-After-Id``. ``include_total=1`` adds ``X-Total-Count-Estimate``.
+    """
+    after_id = request.args.get("after_id", default=0, type=int)
+    limit = request.args.get("limit", default=_service.DEFAULT_PAGE_SIZE, type=int)
+    if after_id < 0 or limit < 1:
+        return jsonify({"errors": {"pagination": "after_id must be >= 0 and limit >= 1."}}), 400
+
+    customers, next_after_id = _service.list_customers(after_id=after_id, limit=limit)
+    response = jsonify(customers)
+    if next_after_id is not None:
+        next_url = url_for("customers.list_customers", after_id=next_after_id, limit=limit)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+        response.headers["X-Next-After-Id"] = str(next_after_id)
+    if request.args.get("include_total") == "1":
+        response.headers["X-Total-Count-Estimate"] = str(_service.estimate_customer_count())
+    return response
 
 
 @customers_bp.post("/login")
@@ -1,9 +1,10 @@
 """Menu presentation endpoints."""
 from pathlib import Path
 
-from flask import Blueprint, jsonify, render_template, current_app, render_template_string
+from flask import Blueprint, current_app, jsonify, render_template, render_template_string, session
 
-from app.ownership.services.menu_service import MenuService
+from app.presentation.lazy import LazyService
+from app.presentation.response_cache import ResponseCache, conditional_response
 
 TEMPLATES_DIR = Path(__file__).resolve().parents[2] / "templates"
 
@@ -14,32 +15,66 @@ menu_bp = Blueprint(
     template_folder=str(TEMPLATES_DIR)
 )
 
-_service = MenuService()
+
+def _build_service():
+    from app.ownership.services.menu_service import MenuService
+
+    return MenuService()
+
+
+_service = LazyService(_build_service)
+# Bodies are rebuilt whenever the catalog cache hands out a new snapshot.
+_responses = ResponseCache()
+
 
 @menu_bp.get("/")
 def get_menu_json():
     """Return the menu as JSON for API consumers."""
-    return jsonify(_service.menu_overview())
+    snapshot = _service.catalog_snapshot()
+    cached = _cached_body("json", snapshot, lambda: jsonify(_service.menu_overview(snapshot)).get_data())
+    return conditional_response(
+        cached,
+        mimetype="application/json",
+        max_age=current_app.config["MENU_MAX_AGE"],
+    )
 
 @menu_bp.get("/html")
 def get_menu_html():
     """Render the menu page with pizzas and categorized extras."""
-    # for debugging
-    current_app.logger.info(f"Jinja search paths: {current_app.jinja_loader.searchpath}")
-    current_app.logger.info(f"Menu blueprint template_folder: {TEMPLATES_DIR}")
-
-    sections = _service.build_sections()
-    drinks = sections.category("drink")
-    desserts = sections.category("dessert")
-
-    return render_template(
-        "menu.html",
-        pizzas=sections.pizzas,
-        drinks=drinks,
-        desserts=desserts,
-        other_extras={k: v for k, v in sections.extras_by_type.items() if k not in {"drink", "dessert"}},
+    snapshot = _service.catalog_snapshot()
+
+    def render():
+        sections = _service.build_sections(snapshot)
+        return render_template(
+            "menu.html",
+            pizzas=sections.pizzas,
+            drinks=sections.category("drink"),
+            desserts=sections.category("dessert"),
+            other_extras={k: v for k, v in sections.extras_by_type.items() if k not in {"drink", "dessert"}},
+        )
+
+    # The page greets the logged-in customer, so each viewer gets their own entry.
+    viewer = (session.get("customer_id"), session.get("customer_name"))
+    if session.get("_flashes"):
+        # Rendering consumes flashed messages; such a page is never reused.
+        cached = ResponseCache.render(snapshot, render)
+    else:
+        cached = _cached_body(("html", viewer), snapshot, render)
+    return conditional_response(
+        cached,
+        mimetype="text/html",
+        max_age=current_app.config["MENU_MAX_AGE"],
+        private=True,
+        vary=("Cookie",),
     )
 
 @menu_bp.get("/test")
 def menu_test():
     return render_template_string("<h1>Menu test works</h1>")
+
+
+def _cached_body(key, snapshot, render):
+    """Reuse a rendered body while its catalog snapshot is current."""
+    if not _service.cacheable:
+        return ResponseCache.render(snapshot, render)
+    return _responses.get_or_render(key, snapshot, render)
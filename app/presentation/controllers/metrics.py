@@ -0,0 +1,26 @@
+"""Prometheus scrape endpoint for request, SQL and connection pool instrumentation."""
+from __future__ import annotations
+
+from flask import Blueprint, Response, abort, current_app
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.get("/metrics")
+def prometheus_metrics():
+    """Expose request, SQL, slow-query and connection pool metrics in Prometheus text format."""
+    from app.integration.models import db
+    from app.integration.read_routing import replica_router
+    from app.presentation.instrumentation import render_database_metrics
+
+    instrumentation = current_app.extensions.get("instrumentation")
+    if instrumentation is None:
+        abort(404)
+    return Response(
+        instrumentation.registry.render_prometheus()
+        + render_database_metrics(replica_router.pool_stats(db.engines), replica_router.stats()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+__all__ = ["metrics_bp"]
@@ -1,56 +1,258 @@
 """HTTP endpoints for placing and inspecting orders."""
 from __future__ import annotations
 
+import json
 from datetime import datetime
 from decimal import Decimal
 
-from flask import Blueprint, jsonify, request, session
+from typing import TYPE_CHECKING
 
-from app.integration.models.order import Order, OrderItem
-from app.ownership.services.order_service import OrderService
+from flask import Blueprint, current_app, jsonify, request, session, url_for
+
+from app.presentation.lazy import LazyService
+
+if TYPE_CHECKING:
+    from app.integration.models.order import Order, OrderItem
+    from app.integration.models.order_job import OrderJob
 
 orders_bp = Blueprint("orders", __name__, url_prefix="/orders")
-_service = OrderService()
+
+
+def _build_service():
+    from app.ownership.services.order_service import OrderService
+
+    return OrderService()
+
+
+def _build_queue_service():
+    from app.ownership.services.order_queue_service import OrderQueueService
+
+    return OrderQueueService(order_service=_service.resolve())
+
+
+def _build_idempotency_service():
+    from app.ownership.services.idempotency_service import IdempotencyService
+
+    return IdempotencyService(ttl_seconds=current_app.config["IDEMPOTENCY_TTL"])
+
+
+_service = LazyService(_build_service)
+_queue_service = LazyService(_build_queue_service)
+_idempotency = LazyService(_build_idempotency_service)
+
+MAX_BULK_ORDERS = 500
+# Seconds a client should wait before polling a pending job again.
+JOB_POLL_SECONDS = 2
 
 
 @orders_bp.post("/")
 def create_order():
     """Process an order submission and return the order summary."""
     payload = request.get_json(silent=True) or {}
-    customer_id = session.get("customer_id") or payload.get("customer_id")
-    if not customer_id:
-        return (
-            jsonify({"errors": {"auth": "Please log in or create an account before checking out."}}),
-            401,
+    customer_id, failure = _checkout_customer(payload)
+    if failure is not None:
+        return failure
+
+    key = request.headers.get("Idempotency-Key")
+    if key is None:
+        order, errors = _place_order(customer_id, payload)
+        if errors:
+            return _order_errors(errors)
+        return jsonify(_serialize_order(order)), 201
+
+    claim = _idempotency.begin(customer_id=customer_id, key=key, payload=payload)
+    if claim.errors:
+        return jsonify({"errors": claim.errors}), claim.status_code
+    if claim.record is None:
+        body = claim.body if claim.body is not None else _serialize_order(claim.order)
+        response = jsonify(body)
+        response.status_code = claim.status_code
+        response.headers["Idempotent-Replayed"] = "true"
+        return response
+
+    try:
+        order, errors = _place_order(
+            customer_id,
+            payload,
+            on_persisted=lambda placed: _idempotency.attach_order(claim.record, placed),
         )
+    except Exception:
+        _idempotency.release(claim.record)
+        raise
+    if errors:
+        # Nothing was stored, so a retry with the same key may run again.
+        _idempotency.release(claim.record)
+        return _order_errors(errors)
+
+    body = _serialize_order(order)
+    _idempotency.complete(claim.record, status_code=201, body=body)
+    return jsonify(body), 201
+
+
+@orders_bp.post("/quote")
+def quote_order():
+    """Price a cart with the checkout rules without placing the order."""
+    payload = request.get_json(silent=True) or {}
+    customer_id, failure = _checkout_customer(payload)
+    if failure is not None:
+        return failure
+
+    order, errors = _service.quote(
+        customer_id=customer_id,
+        pizzas=payload.get("pizzas", []),
+        drinks=payload.get("drinks", []),
+        desserts=payload.get("desserts", []),
+        discount_code=payload.get("discount_code"),
+        notes=payload.get("notes"),
+        requested_at=datetime.utcnow(),
+    )
+    if errors:
+        return _order_errors(errors)
+    return jsonify(_serialize_order(order)), 200
+
+
+@orders_bp.post("/async")
+def create_order_async():
+    """Accept an order for background placement and point at its status."""
+    payload = request.get_json(silent=True) or {}
+    customer_id, failure = _checkout_customer(payload)
+    if failure is not None:
+        return failure
 
+    submission = _queue_service.submit(
+        customer_id=customer_id,
+        payload=payload,
+        idempotency_key=request.headers.get("Idempotency-Key"),
+    )
+    if submission.errors:
+        return jsonify({"errors": submission.errors}), submission.status_code
+
+    body = _serialize_job(submission.job, None)
+    response = jsonify(body)
+    response.status_code = submission.status_code
+    response.headers["Location"] = body["status_url"]
+    response.headers["Retry-After"] = str(JOB_POLL_SECONDS)
+    if submission.replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+
+@orders_bp.get("/jobs/<int:job_id>")
+def get_order_job(job_id: int):
+    """Report the progress of an order accepted by ``POST /orders/async``."""
+    # Polling is authorized like submission: the session, or the customer_id the job was sent with.
+    customer_id = session.get("customer_id") or request.args.get("customer_id")
+    if not customer_id:
+        return jsonify({"errors": {"auth": "Please log in to view your orders."}}), 401
     try:
         customer_id = int(customer_id)
     except (TypeError, ValueError):
         return jsonify({"errors": {"customer": "Invalid customer identifier."}}), 400
 
-    pizzas = payload.get("pizzas", [])
-    drinks = payload.get("drinks", [])
-    desserts = payload.get("desserts", [])
-    discount_code = payload.get("discount_code")
-    notes = payload.get("notes")
+    job, order = _queue_service.get_job(job_id, customer_id=customer_id)
+    if job is None:
+        return jsonify({"errors": {"job": "Order job not found."}}), 404
+
+    response = jsonify(_serialize_job(job, order))
+    if job.status in ("queued", "processing"):
+        response.headers["Retry-After"] = str(JOB_POLL_SECONDS)
+    return response
+
+
+@orders_bp.post("/bulk")
+def create_orders_bulk():
+    """Place a batch of orders and report the outcome of each entry."""
+    payload = request.get_json(silent=True) or {}
+    submissions = payload.get("orders") if isinstance(payload, dict) else None
+    if not isinstance(submissions, list) or not submissions:
+        return jsonify({"errors": {"orders": "Provide a non-empty list of orders."}}), 400
+    if len(submissions) > MAX_BULK_ORDERS:
+        return (
+            jsonify({"errors": {"orders": f"At most {MAX_BULK_ORDERS} orders can be submitted at once."}}),
+            413,
+        )
 
-    order, errors = _service.place_order(
+    results = _service.place_orders_bulk(submissions, requested_at=datetime.utcnow())
+    created = sum(1 for result in results if result.order is not None)
+    body = {
+        "created": created,
+        "failed": len(results) - created,
+        "results": [
+            {
+                "index": result.index,
+                "order": _serialize_order(result.order) if result.order is not None else None,
+                "errors": result.errors,
+            }
+            for result in results
+        ],
+    }
+    if created == len(results):
+        status_code = 201
+    elif created:
+        status_code = 207
+    else:
+        status_code = 400
+    return jsonify(body), status_code
+
+
+def _place_order(customer_id: int, payload: dict, **options):
+    """Place the order described by a checkout payload."""
+    return _service.place_order(
         customer_id=customer_id,
-        pizzas=pizzas,
-        drinks=drinks,
-        desserts=desserts,
-        discount_code=discount_code,
-        notes=notes,
+        pizzas=payload.get("pizzas", []),
+        drinks=payload.get("drinks", []),
+        desserts=payload.get("desserts", []),
+        discount_code=payload.get("discount_code"),
+        notes=payload.get("notes"),
         requested_at=datetime.utcnow(),
+        **options,
     )
-    if errors:
-        status_code = 400
-        if "customer" in errors and "not found" in errors["customer"].lower():
-            status_code = 401
-        return jsonify({"errors": errors}), status_code
 
-    return jsonify(_serialize_order(order)), 201
+
+def _order_errors(errors: dict):
+    """Map placement errors to an error response."""
+    status_code = 400
+    if "customer" in errors and "not found" in errors["customer"].lower():
+        status_code = 401
+    elif "conflict" in errors:
+        status_code = 409
+    return jsonify({"errors": errors}), status_code
+
+
+def _checkout_customer(payload: dict):
+    """Return the checking-out customer's id, or an error response to send instead."""
+    customer_id = session.get("customer_id") or payload.get("customer_id")
+    if not customer_id:
+        return None, (
+            jsonify({"errors": {"auth": "Please log in or create an account before checking out."}}),
+            401,
+        )
+
+    try:
+        return int(customer_id), None
+    except (TypeError, ValueError):
+        return None, (jsonify({"errors": {"customer": "Invalid customer identifier."}}), 400)
+
+
+def _serialize_job(job: OrderJob, order: Order | None) -> dict:
+    """Convert a queued order job into its status document."""
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "created_at": job.created_at.isoformat(),
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "status_url": _job_status_url(job),
+        "errors": json.loads(job.errors) if job.errors else None,
+        "order": _serialize_order(order) if order is not None else None,
+    }
+
+
+def _job_status_url(job: OrderJob) -> str:
+    """Polling URL for a job; without a session it carries the submitting customer's id."""
+    if session.get("customer_id"):
+        return url_for("orders.get_order_job", job_id=job.job_id)
+    return url_for("orders.get_order_job", job_id=job.job_id, customer_id=job.customer_id)
 
 
 def _serialize_order(order: Order) -> dict:
@@ -1,16 +1,33 @@
 """Staff reporting endpoints and dashboard views."""
 from __future__ import annotations
 
+from datetime import date
 from decimal import Decimal
 from typing import Any, Dict
 
-from flask import Blueprint, jsonify, render_template, request
+from flask import Blueprint, Response, jsonify, render_template, request, stream_with_context
 
-from app.ownership.services.reporting_service import ReportingService
+from app.presentation.lazy import LazyService
 
 reports_bp = Blueprint("reports", __name__, url_prefix="/reports")
 
-_service = ReportingService()
+
+def _build_service():
+    from app.ownership.services.reporting_service import ReportingService
+
+    return ReportingService()
+
+
+def _build_export_service():
+    from app.ownership.services.order_export_service import OrderExportService
+
+    return OrderExportService()
+
+
+_service = LazyService(_build_service)
+_export_service = LazyService(_build_export_service)
+
+EXPORT_MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
 
 
 @reports_bp.get("/")
@@ -55,6 +72,36 @@ def earnings():
     return jsonify(_convert_nested(data))
 
 
+@reports_bp.get("/orders/export")
+def export_orders():
+    """Stream order history with its lines as NDJSON or CSV.
+
+    ``start`` and ``end`` are inclusive ISO dates; the body is gzip-encoded
+    when the client accepts it.
+    """
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in EXPORT_MIMETYPES:
+        return jsonify({"errors": {"format": "Use format=ndjson or format=csv."}}), 400
+    try:
+        start = _parse_date(request.args.get("start"))
+        end = _parse_date(request.args.get("end"))
+    except ValueError:
+        return jsonify({"errors": {"period": "Dates must look like YYYY-MM-DD."}}), 400
+
+    compress = request.accept_encodings["gzip"] > 0
+    chunks = _export_service.export(fmt, start=start, end=end, compress=compress)
+    response = Response(stream_with_context(chunks), mimetype=EXPORT_MIMETYPES[fmt])
+    response.headers["Content-Disposition"] = f"attachment; filename=orders.{fmt}"
+    response.vary.add("Accept-Encoding")
+    if compress:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+def _parse_date(value: str | None) -> date | None:
+    return date.fromisoformat(value) if value else None
+
+
 def _convert_list(rows: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
     return [{key: _convert_value(value) for key, value in row.items()} for row in rows]
 
@@ -0,0 +1,329 @@
+"""Per-request SQL and latency instrumentation exported in Prometheus text format."""
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import Flask, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+slow_query_logger = logging.getLogger("app.slow_query")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\(\s*(?:\?|%s|:\w+)(?:\s*,\s*(?:\?|%s|:\w+))*\s*\)")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|:\w+|\?")
+_WHITESPACE = re.compile(r"\s+")
+
+RequestKey = Tuple[str, str, str]
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a SQL statement so executions differing only in values group together."""
+    text = _STRING_LITERAL.sub("?", statement)
+    text = _PLACEHOLDER.sub("?", text)
+    text = _NUMBER_LITERAL.sub("?", text)
+    text = _PARAM_LIST.sub("(?+)", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def fingerprint_id(normalized: str) -> str:
+    """Return a short stable identifier for a normalized statement."""
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+
+
+@dataclass
+class RequestStats:
+    """Counters collected while a single request is being handled."""
+
+    started_at: float = field(default_factory=time.perf_counter)
+    statements: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+    orm_objects: int = 0
+
+
+@dataclass
+class EndpointTotals:
+    """Aggregated counters for one endpoint, method and status."""
+
+    requests: int = 0
+    latency_seconds: float = 0.0
+    statements: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+    orm_objects: int = 0
+    buckets: List[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+
+
+@dataclass
+class SlowQueryTotals:
+    """Aggregated counters for one slow statement fingerprint."""
+
+    statement: str
+    count: int = 0
+    seconds: float = 0.0
+
+
+class MetricsRegistry:
+    """Thread-safe store of request and slow-query totals."""
+
+    def __init__(self) -> None:
+        """Start with empty totals."""
+        self._lock = threading.Lock()
+        self._endpoints: Dict[RequestKey, EndpointTotals] = defaultdict(EndpointTotals)
+        self._slow_queries: Dict[str, SlowQueryTotals] = {}
+
+    def observe_request(self, key: RequestKey, stats: RequestStats, latency: float) -> None:
+        """Fold one finished request into the endpoint totals."""
+        with self._lock:
+            totals = self._endpoints[key]
+            totals.requests += 1
+            totals.latency_seconds += latency
+            totals.statements += stats.statements
+            totals.db_seconds += stats.db_seconds
+            totals.rows += stats.rows
+            totals.orm_objects += stats.orm_objects
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if latency <= bound:
+                    totals.buckets[index] += 1
+
+    def observe_slow_query(self, normalized: str, seconds: float) -> str:
+        """Count a slow statement under its fingerprint and return the fingerprint id."""
+        key = fingerprint_id(normalized)
+        with self._lock:
+            totals = self._slow_queries.get(key)
+            if totals is None:
+                totals = self._slow_queries[key] = SlowQueryTotals(statement=normalized)
+            totals.count += 1
+            totals.seconds += seconds
+        return key
+
+    def snapshot(self) -> Tuple[Dict[RequestKey, EndpointTotals], Dict[str, SlowQueryTotals]]:
+        """Return copies of the current totals."""
+        with self._lock:
+            endpoints = {
+                key: EndpointTotals(
+                    requests=value.requests,
+                    latency_seconds=value.latency_seconds,
+                    statements=value.statements,
+                    db_seconds=value.db_seconds,
+                    rows=value.rows,
+                    orm_objects=value.orm_objects,
+                    buckets=list(value.buckets),
+                )
+                for key, value in self._endpoints.items()
+            }
+            slow = {
+                key: SlowQueryTotals(statement=value.statement, count=value.count, seconds=value.seconds)
+                for key, value in self._slow_queries.items()
+            }
+        return endpoints, slow
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        endpoints, slow = self.snapshot()
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        family("http_requests_total", "counter", "Requests handled, by endpoint, method and status.")
+        for key, totals in sorted(endpoints.items()):
+            lines.append(f"http_requests_total{{{_labels(key)}}} {totals.requests}")
+
+        family("http_request_duration_seconds", "histogram", "Total request latency.")
+        for key, totals in sorted(endpoints.items()):
+            labels = _labels(key)
+            for bound, count in zip(LATENCY_BUCKETS, totals.buckets):
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {totals.requests}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {totals.latency_seconds:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {totals.requests}")
+
+        for name, attribute, help_text, precise in (
+            ("http_request_db_statements_total", "statements", "SQL statements issued while handling requests.", False),
+            ("http_request_db_seconds_total", "db_seconds", "Time spent executing SQL while handling requests.", True),
+            ("http_request_db_rows_total", "rows", "Rows fetched by queries or affected by writes.", False),
+            ("http_request_orm_objects_total", "orm_objects", "ORM instances loaded from query results.", False),
+        ):
+            family(name, "counter", help_text)
+            for key, totals in sorted(endpoints.items()):
+                value = getattr(totals, attribute)
+                rendered = f"{value:.6f}" if precise else str(value)
+                lines.append(f"{name}{{{_labels(key)}}} {rendered}")
+
+        family("db_slow_queries_total", "counter", "Statements slower than the slow-query threshold, by fingerprint.")
+        for key, totals in sorted(slow.items()):
+            lines.append(f'db_slow_queries_total{{fingerprint="{key}"}} {totals.count}')
+        family("db_slow_query_seconds_total", "counter", "Time spent in slow statements, by fingerprint.")
+        for key, totals in sorted(slow.items()):
+            lines.append(f'db_slow_query_seconds_total{{fingerprint="{key}"}} {totals.seconds:.6f}')
+
+        return "\n".join(lines) + "\n"
+
+
+class Instrumentation:
+    """Wire SQLAlchemy and Flask hooks into a metrics registry."""
+
+    def __init__(self, *, slow_query_ms: float = 0.0, registry: Optional[MetricsRegistry] = None) -> None:
+        """Create the hooks; ``slow_query_ms`` of zero disables the slow-query log."""
+        self.registry = registry or MetricsRegistry()
+        self.slow_query_seconds = slow_query_ms / 1000.0
+        self._engines: List[Engine] = []
+
+    def init_app(self, app: Flask, engines: Iterable[Engine]) -> None:
+        """Register request hooks on ``app`` and cursor hooks on every engine."""
+        app.extensions["instrumentation"] = self
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        for engine in engines:
+            self.watch_engine(engine)
+        if not event.contains(Session, "loaded_as_persistent", _count_loaded_object):
+            event.listen(Session, "loaded_as_persistent", _count_loaded_object)
+
+    def watch_engine(self, engine: Engine) -> None:
+        """Time every statement executed through ``engine``."""
+        if engine in self._engines:
+            return
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.append(engine)
+
+    def _start_request(self) -> None:
+        g._request_stats = RequestStats()
+
+    def _finish_request(self, response):
+        stats: Optional[RequestStats] = g.pop("_request_stats", None)
+        if stats is None:
+            return response
+        latency = time.perf_counter() - stats.started_at
+        key = (request.endpoint or "unmatched", request.method, str(response.status_code))
+        self.registry.observe_request(key, stats, latency)
+        return response
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("_query_started", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info.get("_query_started")
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+
+        stats = _current_stats()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+            if cursor.description is not None and context is not None:
+                # Drivers such as sqlite3 report no rowcount for SELECT, so count
+                # rows as the result fetches them instead.
+                context.cursor = _CountingCursor(cursor, stats)
+            else:
+                rowcount = getattr(cursor, "rowcount", -1)
+                if rowcount and rowcount > 0:
+                    stats.rows += rowcount
+
+        if self.slow_query_seconds and elapsed >= self.slow_query_seconds:
+            normalized = fingerprint(statement)
+            key = self.registry.observe_slow_query(normalized, elapsed)
+            slow_query_logger.warning(
+                "slow query %s %.1fms endpoint=%s: %s",
+                key,
+                elapsed * 1000.0,
+                request.endpoint if has_request_context() else "-",
+                normalized,
+            )
+
+
+class _CountingCursor:
+    """DB-API cursor proxy that adds every row fetched through it to a request's stats."""
+
+    def __init__(self, cursor, stats: RequestStats) -> None:
+        self._cursor = cursor
+        self._stats = stats
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._stats.rows += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._stats.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._stats.rows += len(rows)
+        return rows
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
+
+
+def render_database_metrics(pools: Dict[str, Dict[str, int]], routing: Dict[str, object]) -> str:
+    """Render per-bind pool gauges and replica routing counters in Prometheus text format."""
+    lines: List[str] = [
+        "# HELP db_pool_connections Connections in each bind's pool, by state.",
+        "# TYPE db_pool_connections gauge",
+    ]
+    for bind, gauges in sorted(pools.items()):
+        for state, value in sorted(gauges.items()):
+            lines.append(f'db_pool_connections{{bind="{_escape(bind)}",state="{state}"}} {value}')
+    lines.append("# HELP db_read_only_statements_total Read-only statements by routing outcome.")
+    lines.append("# TYPE db_read_only_statements_total counter")
+    for outcome, count in sorted(routing["reads"].items()):
+        lines.append(f'db_read_only_statements_total{{outcome="{outcome}"}} {count}')
+    lines.append("# HELP db_replica_healthy Whether the replica is reachable and within the lag limit.")
+    lines.append("# TYPE db_replica_healthy gauge")
+    lines.append(f"db_replica_healthy {int(bool(routing['healthy']))}")
+    if routing["lag_seconds"] is not None:
+        lines.append("# HELP db_replica_lag_seconds Age of the heartbeat row on the replica at the last check.")
+        lines.append("# TYPE db_replica_lag_seconds gauge")
+        lines.append(f"db_replica_lag_seconds {routing['lag_seconds']:.3f}")
+    return "\n".join(lines) + "\n"
+
+
+def _current_stats() -> Optional[RequestStats]:
+    """Return the stats of the request being handled on this thread, if any."""
+    if not has_request_context():
+        return None
+    return g.get("_request_stats")
+
+
+def _count_loaded_object(session, instance) -> None:
+    stats = _current_stats()
+    if stats is not None:
+        stats.orm_objects += 1
+
+
+def _labels(key: RequestKey) -> str:
+    endpoint, method, status = (_escape(value) for value in key)
+    return f'endpoint="{endpoint}",method="{method}",status="{status}"'
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+__all__ = [
+    "Instrumentation",
+    "MetricsRegistry",
+    "RequestStats",
+    "fingerprint",
+    "fingerprint_id",
+    "render_database_metrics",
+]
@@ -0,0 +1,40 @@
+"""Deferred construction of services used by the controllers."""
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Optional
+
+
+class LazyService:
+    """Proxy that builds its service on first attribute access.
+
+    Controllers pass a factory that imports the service module inside the
+    function, so importing a blueprint does not import its dependency chain.
+    """
+
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        """Remember the factory without calling it."""
+        self._factory = factory
+        self._instance: Optional[Any] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """True once the service has been built."""
+        return self._instance is not None
+
+    def resolve(self) -> Any:
+        """Return the service, building it on the first call."""
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+                instance = self._instance
+        return instance
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+
+__all__ = ["LazyService"]
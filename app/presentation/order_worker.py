@@ -0,0 +1,59 @@
+"""Worker processes that place orders accepted by ``POST /orders/async``."""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import socket
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def run_worker(*, batch_size: int = 20, poll_interval: float = 1.0, once: bool = False) -> int:
+    """Drain the order queue in this process; returns how many jobs it claimed.
+
+    Each process builds its own app so no database connections are shared
+    across a fork. With ``once`` the worker stops as soon as the queue is empty.
+    """
+    from app.config.app_factory import create_app
+    from app.ownership.services.order_queue_service import OrderQueueService
+
+    app = create_app()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    processed = 0
+    with app.app_context():
+        service = OrderQueueService()
+        logger.info("Order worker %s started", worker_id)
+        while True:
+            claimed = service.process_batch(worker_id, batch_size=batch_size)
+            processed += claimed
+            if claimed:
+                continue
+            if once:
+                return processed
+            time.sleep(poll_interval)
+
+
+def start_workers(processes: int, *, batch_size: int = 20, poll_interval: float = 1.0, once: bool = False) -> int:
+    """Run ``processes`` workers side by side and wait for them; returns the failed count."""
+    if processes <= 1:
+        run_worker(batch_size=batch_size, poll_interval=poll_interval, once=once)
+        return 0
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(
+            target=run_worker,
+            kwargs={"batch_size": batch_size, "poll_interval": poll_interval, "once": once},
+            name=f"order-worker-{index}",
+        )
+        for index in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(1 for worker in workers if worker.exitcode)
+
+
+__all__ = ["run_worker", "start_workers"]
@@ -0,0 +1,91 @@
+"""Rendered response bodies reused until the data behind them changes."""
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Optional, Tuple
+
+from flask import Response, request
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    """A rendered body, its strong ETag and the source object it was built from."""
+
+    source: object
+    body: bytes
+    etag: str
+
+
+class ResponseCache:
+    """Keep rendered bodies keyed by endpoint and viewer, bounded by ``max_entries``.
+
+    An entry is reused only while the caller passes the very ``source`` object
+    it was rendered from (for example a catalog snapshot), so replacing the
+    source invalidates every body built from it without any bookkeeping.
+    """
+
+    def __init__(self, *, max_entries: int = 256) -> None:
+        """Create an empty cache."""
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, CachedBody]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key: Hashable, source: object, render: Callable[[], str | bytes]) -> CachedBody:
+        """Return the cached body for ``key`` or render and store a new one."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.source is source:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+        entry = self.render(source, render)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def render(source: object, render: Callable[[], str | bytes]) -> CachedBody:
+        """Render a body without storing it."""
+        body = render()
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        return CachedBody(source=source, body=body, etag=hashlib.sha256(body).hexdigest()[:32])
+
+    def clear(self) -> None:
+        """Drop every stored body."""
+        with self._lock:
+            self._entries.clear()
+
+
+def conditional_response(
+    cached: CachedBody,
+    *,
+    mimetype: str,
+    max_age: int = 0,
+    private: bool = False,
+    vary: Optional[Tuple[str, ...]] = None,
+) -> Response:
+    """Build a response with ETag and Cache-Control; 304 when the client's copy matches."""
+    response = Response(cached.body, mimetype=mimetype)
+    response.set_etag(cached.etag)
+    if private:
+        response.cache_control.private = True
+    else:
+        response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    response.cache_control.must_revalidate = True
+    for header in vary or ():
+        response.vary.add(header)
+    return response.make_conditional(request)
+
+
+__all__ = ["CachedBody", "ResponseCache", "conditional_response"]
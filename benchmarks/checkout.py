@@ -0,0 +1,321 @@
+"""Checkout, menu and reporting benchmark against a generated SQLite dataset.
+
+Run with ``python -m benchmarks.checkout``. Results are written as JSON so runs
+from different commits can be compared with ``--compare``.
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class OperationResult:
+    """Timings and query counts collected for one benchmarked operation."""
+
+    name: str
+    concurrency: int
+    latencies: List[float] = field(default_factory=list)
+    queries: List[int] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+    wall_seconds: float = 0.0
+
+    def summary(self) -> Dict[str, object]:
+        """Return throughput, latency percentiles and query counts."""
+        calls = len(self.latencies)
+        failed = sum(self.errors.values())
+        ordered = sorted(self.latencies)
+        latency = {f"p{p}": percentile(ordered, p) * 1000.0 for p in PERCENTILES}
+        latency["mean"] = (sum(ordered) / calls * 1000.0) if calls else 0.0
+        latency["max"] = (ordered[-1] * 1000.0) if calls else 0.0
+        return {
+            "calls": calls,
+            "errors": failed,
+            "error_kinds": dict(self.errors),
+            "concurrency": self.concurrency,
+            "wall_seconds": self.wall_seconds,
+            "throughput_per_second": (calls - failed) / self.wall_seconds if self.wall_seconds else 0.0,
+            "latency_ms": latency,
+            "queries": {
+                "total": sum(self.queries),
+                "mean": (sum(self.queries) / calls) if calls else 0.0,
+                "max": max(self.queries, default=0),
+            },
+        }
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+class QueryCounter:
+    """Count statements executed on an engine, per thread."""
+
+    def __init__(self, engine) -> None:
+        """Attach the cursor hook to ``engine``."""
+        from sqlalchemy import event
+
+        self._local = threading.local()
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def reset(self) -> None:
+        """Start counting from zero on the calling thread."""
+        self._local.count = 0
+
+    @property
+    def count(self) -> int:
+        """Statements executed on the calling thread since ``reset``."""
+        return getattr(self._local, "count", 0)
+
+    def _count(self, *args) -> None:
+        self._local.count = getattr(self._local, "count", 0) + 1
+
+
+def run_operation(
+    app,
+    counter: QueryCounter,
+    name: str,
+    call: Callable[[int], Optional[str]],
+    *,
+    iterations: int,
+    concurrency: int,
+) -> OperationResult:
+    """Invoke ``call(i)`` ``iterations`` times across ``concurrency`` threads.
+
+    Each call gets its own application context, like a request would. ``call``
+    returns None on success or a short error label; exceptions are labelled
+    with their type.
+    """
+    result = OperationResult(name=name, concurrency=concurrency)
+    lock = threading.Lock()
+
+    def invoke(index: int) -> None:
+        with app.app_context():
+            counter.reset()
+            started = time.perf_counter()
+            try:
+                error = call(index)
+            except Exception as exc:
+                error = type(exc).__name__
+            elapsed = time.perf_counter() - started
+            queries = counter.count
+        with lock:
+            result.latencies.append(elapsed)
+            result.queries.append(queries)
+            if error:
+                result.errors[error] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(invoke, range(iterations)))
+    result.wall_seconds = time.perf_counter() - started
+    return result
+
+
+def build_workload(spec, seed: int) -> Dict[str, Callable[[int], Optional[str]]]:
+    """Return the benchmarked callables keyed by operation name."""
+    from app.integration.models import db
+    from app.integration.models.menu_item import MenuItem
+    from app.ownership.services.menu_service import MenuService
+    from app.ownership.services.order_service import OrderService
+    from app.ownership.services.reporting_service import ReportingService
+    from sqlalchemy import select
+
+    orders = OrderService()
+    menu = MenuService()
+    reports = ReportingService()
+    drinks = list(db.session.scalars(select(MenuItem.item_id).where(MenuItem.type == "drink")))
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+    # Each order is requested well after the previous one, so drivers are free again.
+    clock = itertools.count()
+    clock_start = datetime.utcnow()
+    spacing = timedelta(minutes=OrderService.DRIVER_COOLDOWN_MINUTES + 1)
+
+    def place_order(_: int) -> Optional[str]:
+        with rng_lock:
+            customer_id = rng.randint(1, spec.customers)
+            pizzas = [
+                {"pizza_id": rng.randint(1, spec.pizzas), "quantity": rng.choice((1, 1, 2))}
+                for _ in range(rng.choice((1, 2, 3)))
+            ]
+            extras = [{"item_id": rng.choice(drinks), "quantity": 1}] if drinks and rng.random() < 0.5 else []
+            requested_at = clock_start + spacing * next(clock)
+        order, errors = orders.place_order(
+            customer_id=customer_id,
+            pizzas=pizzas,
+            drinks=extras,
+            requested_at=requested_at,
+        )
+        if errors:
+            return ",".join(sorted(errors))
+        return None if order is not None else "no_order"
+
+    last_month = (datetime.utcnow().replace(day=1) - timedelta(days=1)).date()
+
+    return {
+        "place_order": place_order,
+        "menu_build_sections": lambda _: menu.build_sections() and None,
+        "report_undelivered_orders": lambda _: reports.undelivered_orders() and None,
+        "report_top_pizzas_last_month": lambda _: reports.top_pizzas_last_month() and None,
+        "report_monthly_earnings": lambda _: reports.monthly_earnings(
+            year=last_month.year, month=last_month.month
+        ) and None,
+    }
+
+
+def git_revision() -> Optional[str]:
+    """Return the current commit hash, if the tree is a git checkout."""
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def compare(previous: Dict[str, object], current: Dict[str, object]) -> List[str]:
+    """Describe throughput and latency changes between two result files."""
+    lines = [f"compared with {previous['meta'].get('git_revision') or 'unknown revision'}"]
+    for name, now in current["operations"].items():
+        before = previous["operations"].get(name)
+        if before is None:
+            lines.append(f"{name:<30} new")
+            continue
+        lines.append(
+            f"{name:<30} throughput {_delta(before['throughput_per_second'], now['throughput_per_second'])}"
+            f"  p95 {_delta(before['latency_ms']['p95'], now['latency_ms']['p95'])}"
+            f"  queries/call {before['queries']['mean']:.1f} -> {now['queries']['mean']:.1f}"
+        )
+    return lines
+
+
+def _delta(before: float, after: float) -> str:
+    if not before:
+        return f"{after:.1f}"
+    return f"{before:.1f} -> {after:.1f} ({(after - before) / before:+.0%})"
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Generate the dataset, run every operation and write the JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--customers", type=int, default=2000)
+    parser.add_argument("--pizzas", type=int, default=40)
+    parser.add_argument("--drivers", type=int, default=60)
+    parser.add_argument("--postcodes", type=int, default=25)
+    parser.add_argument("--history-days", type=int, default=730, help="days of order history")
+    parser.add_argument("--orders-per-day", type=int, default=40)
+    parser.add_argument("--iterations", type=int, default=500, help="calls per operation")
+    parser.add_argument("--concurrency", type=int, default=4, help="worker threads per operation")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--database", help="SQLite file to use (default: a temporary file)")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/checkout-<rev>-<time>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        database = Path(args.database or Path(scratch) / "checkout.db").resolve()
+        os.environ["DB_URL"] = f"sqlite:///{database}"
+        os.environ.setdefault("SECRET_KEY", "benchmark")
+        sys.path.insert(0, str(ROOT))
+        results = _run(args)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / (
+        f"checkout-{(results['meta']['git_revision'] or 'worktree')[:12]}-"
+        f"{datetime.utcnow():%Y%m%dT%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, sort_keys=True))
+
+    print(f"{'operation':<30} {'calls':>6} {'errors':>6} {'ops/s':>9} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8}")
+    for name, summary in results["operations"].items():
+        latency = summary["latency_ms"]
+        print(
+            f"{name:<30} {summary['calls']:>6} {summary['errors']:>6} "
+            f"{summary['throughput_per_second']:>9.1f} {latency['p50']:>8.2f} "
+            f"{latency['p95']:>8.2f} {latency['p99']:>8.2f} {summary['queries']['mean']:>8.1f}"
+        )
+    print(f"results written to {output}")
+    if args.compare:
+        previous = json.loads(Path(args.compare).read_text())
+        print("\n".join(compare(previous, results)))
+    return 0
+
+
+def _run(args) -> Dict[str, object]:
+    from sqlalchemy import text
+
+    from app.config.app_factory import create_app
+    from app.integration.models import db
+    from benchmarks.dataset import DatasetSpec, generate_dataset
+
+    spec = DatasetSpec(
+        customers=args.customers,
+        pizzas=args.pizzas,
+        drivers=args.drivers,
+        postcodes=args.postcodes,
+        history_days=args.history_days,
+        orders_per_day=args.orders_per_day,
+        seed=args.seed,
+    )
+    app = create_app()
+    with app.app_context():
+        # WAL lets the read benchmarks run alongside the writer, as MySQL would.
+        db.session.execute(text("PRAGMA journal_mode=WAL"))
+        started = time.perf_counter()
+        dataset = generate_dataset(spec)
+        generated_in = time.perf_counter() - started
+        counter = QueryCounter(db.engine)
+        workload = build_workload(spec, args.seed)
+
+    operations = {}
+    for name, call in workload.items():
+        result = run_operation(
+            app, counter, name, call, iterations=args.iterations, concurrency=args.concurrency
+        )
+        operations[name] = result.summary()
+
+    return {
+        "meta": {
+            "benchmark": "checkout",
+            "git_revision": git_revision(),
+            "recorded_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "dataset_seconds": generated_in,
+        },
+        "dataset": {"spec": spec.to_dict(), "rows": dataset.to_dict()},
+        "operations": operations,
+    }
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""Check the in-memory column store against the SQL reports and time both.
+
+Run with ``python -m benchmarks.columnar_reports``. Exits non-zero when any
+earnings or top-pizza result differs between the two engines.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Generate a dataset, compare every report month and print timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--customers", type=int, default=5000)
+    parser.add_argument("--history-days", type=int, default=120)
+    parser.add_argument("--orders-per-day", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=20, help="timed dashboard builds per engine")
+    parser.add_argument("--database-url", help="database to use (default: a temporary SQLite file)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        os.environ["DB_URL"] = args.database_url or f"sqlite:///{Path(scratch) / 'columnar.db'}"
+        os.environ.setdefault("SECRET_KEY", "benchmark")
+        sys.path.insert(0, str(ROOT))
+        return _run(args)
+
+
+def _run(args) -> int:
+    from sqlalchemy import update
+
+    from app.config.app_factory import create_app
+    from app.integration.columnar_reports import ColumnarOrderStore
+    from app.integration.models import db
+    from app.integration.models.customer import Customer
+    from app.integration.models.order import Order
+    from app.integration.repositories.earnings_rollup_repository import DIMENSIONS, EarningsRollupRepository
+    from app.integration.repositories.reporting_repository import ReportingRepository
+    from app.ownership.services.order_service import OrderService
+    from benchmarks.dataset import DatasetSpec, generate_dataset
+
+    app = create_app()
+    failures = 0
+    with app.app_context():
+        spec = DatasetSpec(
+            customers=args.customers,
+            history_days=args.history_days,
+            orders_per_day=args.orders_per_day,
+            drivers=max(40, args.customers // 50),
+        )
+        summary = generate_dataset(spec)
+        # Exercise the exclusions: some failed orders and customers without a gender.
+        db.session.execute(update(Order).where(Order.order_id % 17 == 0).values(status="failed"))
+        db.session.execute(update(Customer).where(Customer.customer_id % 11 == 0).values(gender=" "))
+        EarningsRollupRepository().rebuild()
+        db.session.commit()
+        print(f"dataset: {summary.orders} orders, {summary.order_items} lines")
+
+        sql = ReportingRepository(columnar=ColumnarOrderStore(enabled=False))
+        store = ColumnarOrderStore(enabled=True, refresh_seconds=0)
+        columnar = ReportingRepository(columnar=store)
+
+        failures += _compare(sql, columnar, DIMENSIONS, args.history_days)
+
+        # New orders must show up through an incremental load.
+        service = OrderService()
+        placed = 0
+        for customer_id in range(1, 41):
+            order, _ = service.place_order(
+                customer_id=customer_id,
+                pizzas=[{"pizza_id": 1 + customer_id % 5, "quantity": 2}],
+                drinks=[{"item_id": 1, "quantity": 1}],
+            )
+            placed += order is not None
+        print(f"placed {placed} new orders")
+        failures += _compare(sql, columnar, DIMENSIONS, 1)
+        print(f"store: {store.stats()}")
+
+        for label, repository in (("sql", sql), ("columnar", columnar)):
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                _dashboard(repository)
+            elapsed = (time.perf_counter() - started) / args.repeat * 1000
+            print(f"{label:9} {elapsed:8.2f} ms per dashboard")
+
+    print("OK" if not failures else f"{failures} mismatches")
+    return 1 if failures else 0
+
+
+def _compare(sql, columnar, dimensions, days: int) -> int:
+    """Compare every month touched by the last ``days`` days plus the top pizzas."""
+    failures = 0
+    months = sorted({(d.year, d.month) for d in (datetime.utcnow() - timedelta(days=n) for n in range(days + 1))})
+    for year, month in months:
+        for dimension in dimensions:
+            method = f"earnings_by_{dimension}"
+            expected = getattr(sql, method)(year, month)
+            actual = getattr(columnar, method)(year, month)
+            if _normalized(expected) != _normalized(actual):
+                failures += 1
+                print(f"MISMATCH {method} {year}-{month:02d}\n  sql      {expected}\n  columnar {actual}")
+    for limit in (3, 10, 50):
+        expected = sql.fetch_top_pizzas_last_month(limit=limit)
+        actual = columnar.fetch_top_pizzas_last_month(limit=limit)
+        if _normalized(expected) != _normalized(actual):
+            failures += 1
+            print(f"MISMATCH top_pizzas limit={limit}\n  sql      {expected}\n  columnar {actual}")
+    print(f"compared {len(months)} months: {'ok' if not failures else 'FAIL'}")
+    return failures
+
+
+def _normalized(rows):
+    return [{key: str(value) for key, value in row.items()} for row in rows]
+
+
+def _dashboard(repository) -> None:
+    today = datetime.utcnow()
+    repository.earnings_by_gender(today.year, today.month)
+    repository.earnings_by_age_group(today.year, today.month)
+    repository.earnings_by_postcode(today.year, today.month)
+    repository.fetch_top_pizzas_last_month(limit=3)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+"""Synthetic dataset generator built on the application models."""
+from __future__ import annotations
+
+import random
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Dict, List
+
+from sqlalchemy import delete, insert, select
+
+from app.integration.models import db
+from app.integration.models.customer import Customer
+from app.integration.models.delivery import DeliveryPerson, DeliveryPersonPostcode
+from app.integration.models.discount import DiscountCode
+from app.integration.models.idempotency import IdempotencyKey
+from app.integration.models.ingredient import Ingredient
+from app.integration.models.menu_item import MenuItem
+from app.integration.models.order import Order, OrderItem
+from app.integration.models.order_job import OrderJob
+from app.integration.models.pizza import Pizza, PizzaIngredient, PizzaMenuPrice
+from app.integration.models.postcode import Postcode
+from app.integration.models.reporting import MonthlyEarningsRollup
+
+# Children first, so foreign keys are satisfied when enforcement is on.
+_TABLES_TO_CLEAR = (
+    OrderJob,
+    IdempotencyKey,
+    OrderItem,
+    Order,
+    MonthlyEarningsRollup,
+    PizzaMenuPrice,
+    PizzaIngredient,
+    Pizza,
+    Ingredient,
+    MenuItem,
+    DiscountCode,
+    Customer,
+    DeliveryPersonPostcode,
+    Postcode,
+    DeliveryPerson,
+)
+
+_OPEN_STATUSES = ("new", "preparing", "dispatched")
+_GENDERS = ("female", "male", "other")
+_INSERT_CHUNK = 5000
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Sizes of the generated dataset; the same spec and seed give the same rows."""
+
+    customers: int = 2000
+    pizzas: int = 40
+    ingredients: int = 60
+    drinks: int = 12
+    desserts: int = 8
+    postcodes: int = 25
+    drivers: int = 60
+    postcodes_per_driver: int = 3
+    history_days: int = 730
+    orders_per_day: int = 40
+    seed: int = 2025
+
+    def to_dict(self) -> Dict[str, int]:
+        """Return the spec as plain JSON-friendly values."""
+        return asdict(self)
+
+
+@dataclass
+class DatasetSummary:
+    """Row counts written by ``generate_dataset``."""
+
+    customers: int = 0
+    pizzas: int = 0
+    ingredients: int = 0
+    menu_items: int = 0
+    postcodes: int = 0
+    drivers: int = 0
+    orders: int = 0
+    order_items: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        """Return the counts as a plain dict."""
+        return asdict(self)
+
+
+def generate_dataset(spec: DatasetSpec, *, now: datetime | None = None) -> DatasetSummary:
+    """Replace the catalogue, customers, drivers and order history with synthetic rows.
+
+    Must run inside an application context. Menu prices and the earnings rollup
+    are rebuilt afterwards and in-process caches are invalidated.
+    """
+    from app.integration.catalog_cache import invalidate_catalog_caches
+    from app.integration.columnar_reports import columnar_reports
+    from app.integration.repositories.earnings_rollup_repository import EarningsRollupRepository
+    from app.integration.repositories.menu_price_repository import MenuPriceRepository
+    from app.ownership.services.driver_dispatcher import invalidate_driver_dispatchers
+
+    rng = random.Random(spec.seed)
+    now = (now or datetime.utcnow()).replace(microsecond=0)
+    summary = DatasetSummary()
+
+    for model in _TABLES_TO_CLEAR:
+        db.session.execute(delete(model))
+
+    summary.postcodes = _insert(Postcode, _postcodes(spec))
+    summary.drivers = _insert(DeliveryPerson, _drivers(spec))
+    _insert(DeliveryPersonPostcode, _driver_zones(spec, rng, now))
+    summary.customers = _insert(Customer, _customers(spec, rng, now.date()))
+    summary.ingredients = _insert(Ingredient, _ingredients(spec, rng))
+    summary.pizzas = _insert(Pizza, _pizzas(spec))
+    _insert(PizzaIngredient, _pizza_ingredients(spec, rng))
+    summary.menu_items = _insert(MenuItem, _menu_items(spec, rng))
+    MenuPriceRepository().refresh()
+
+    prices = {
+        row.pizza_id: (row.pizza_name, row.calculated_price)
+        for row in db.session.execute(
+            select(PizzaMenuPrice.pizza_id, PizzaMenuPrice.pizza_name, PizzaMenuPrice.calculated_price)
+        )
+    }
+    extras = [
+        (row.item_id, row.name, row.type, row.base_price)
+        for row in db.session.execute(
+            select(MenuItem.item_id, MenuItem.name, MenuItem.type, MenuItem.base_price)
+        )
+    ]
+    orders, items = _history(spec, rng, now, prices, extras)
+    summary.orders = _insert(Order, orders)
+    summary.order_items = _insert(OrderItem, items)
+
+    EarningsRollupRepository().rebuild()
+    db.session.commit()
+    invalidate_catalog_caches()
+    invalidate_driver_dispatchers()
+    columnar_reports.invalidate()
+    return summary
+
+
+def _insert(model, rows: List[Dict[str, object]]) -> int:
+    """Insert ``rows`` with chunked executemany calls and return how many were written."""
+    for start in range(0, len(rows), _INSERT_CHUNK):
+        db.session.execute(insert(model), rows[start:start + _INSERT_CHUNK])
+    return len(rows)
+
+
+def _postcodes(spec: DatasetSpec) -> List[Dict[str, object]]:
+    return [
+        {"postcode_id": index, "postcode": f"{1000 + index}"}
+        for index in range(1, spec.postcodes + 1)
+    ]
+
+
+def _drivers(spec: DatasetSpec) -> List[Dict[str, object]]:
+    return [
+        {
+            "delivery_driver_id": index,
+            "name": f"Driver {index}",
+            "is_available": True,
+            "unavailable_until": None,
+        }
+        for index in range(1, spec.drivers + 1)
+    ]
+
+
+def _driver_zones(spec: DatasetSpec, rng: random.Random, now: datetime) -> List[Dict[str, object]]:
+    """Give every driver a few postcodes, making sure each postcode has a driver."""
+    links = set()
+    for driver_id in range(1, spec.drivers + 1):
+        # Round-robin first so every postcode is covered, then random extra zones.
+        zones = {(driver_id - 1) % spec.postcodes + 1}
+        for postcode_id in rng.sample(range(1, spec.postcodes + 1), spec.postcodes):
+            if len(zones) >= spec.postcodes_per_driver:
+                break
+            zones.add(postcode_id)
+        links.update((driver_id, postcode_id) for postcode_id in zones)
+    return [
+        {"delivery_driver_id": driver_id, "postcode_id": postcode_id, "assigned_at": now}
+        for driver_id, postcode_id in sorted(links)
+    ]
+
+
+def _customers(spec: DatasetSpec, rng: random.Random, today: date) -> List[Dict[str, object]]:
+    """Customers aged 18-80 whose birthdays are spread evenly over the calendar year."""
+    rows = []
+    for index in range(1, spec.customers + 1):
+        day_of_year = ((index - 1) * 365) // spec.customers
+        birth_year = today.year - rng.randint(18, 80)
+        birthdate = date(birth_year, 1, 1) + timedelta(days=day_of_year)
+        rows.append(
+            {
+                "customer_id": index,
+                "name": f"Customer {index}",
+                "gender": rng.choice(_GENDERS),
+                "birthdate": min(birthdate, today),
+                "postcode_id": rng.randint(1, spec.postcodes),
+                "street_number": rng.randint(1, 250),
+                "street_name": f"Street {rng.randint(1, 400)}",
+                "email_address": f"customer{index}@bench.example",
+                "phone_number": f"06{index:08d}",
+                "username": f"customer{index}",
+                "password": None,
+                "can_birthday": True,
+                "can_discount": False,
+                "pizzas_ordered": 0,
+            }
+        )
+    return rows
+
+
+def _ingredients(spec: DatasetSpec, rng: random.Random) -> List[Dict[str, object]]:
+    rows = []
+    for index in range(1, spec.ingredients + 1):
+        is_meat = rng.random() < 0.25
+        is_dairy = not is_meat and rng.random() < 0.25
+        rows.append(
+            {
+                "ingredient_id": index,
+                "name": f"Ingredient {index}",
+                "cost": Decimal(rng.randint(10, 180)) / 100,
+                "is_meat": is_meat,
+                "is_dairy": is_dairy,
+                "is_vegan": not (is_meat or is_dairy),
+            }
+        )
+    return rows
+
+
+def _pizzas(spec: DatasetSpec) -> List[Dict[str, object]]:
+    return [{"pizza_id": index, "pizza_name": f"Pizza {index}"} for index in range(1, spec.pizzas + 1)]
+
+
+def _pizza_ingredients(spec: DatasetSpec, rng: random.Random) -> List[Dict[str, object]]:
+    """Three to seven distinct ingredients per pizza."""
+    rows = []
+    for pizza_id in range(1, spec.pizzas + 1):
+        count = min(rng.randint(3, 7), spec.ingredients)
+        for ingredient_id in rng.sample(range(1, spec.ingredients + 1), count):
+            rows.append(
+                {
+                    "pizza_id": pizza_id,
+                    "ingredient_id": ingredient_id,
+                    "quantity": Decimal(rng.choice((1, 1, 1, 2))),
+                    "quantity_unit": "portion",
+                }
+            )
+    return rows
+
+
+def _menu_items(spec: DatasetSpec, rng: random.Random) -> List[Dict[str, object]]:
+    rows = []
+    for kind, count in (("drink", spec.drinks), ("dessert", spec.desserts)):
+        for index in range(1, count + 1):
+            rows.append(
+                {
+                    "name": f"{kind.title()} {index}",
+                    "type": kind,
+                    "base_price": Decimal(rng.randint(150, 650)) / 100,
+                    "is_vegan": rng.random() < 0.4,
+                    "is_vegetarian": True,
+                    "active": True,
+                }
+            )
+    return rows
+
+
+def _history(
+    spec: DatasetSpec,
+    rng: random.Random,
+    now: datetime,
+    prices: Dict[int, tuple],
+    extras: List[tuple],
+) -> tuple[List[Dict[str, object]], List[Dict[str, object]]]:
+    """Orders placed between 11:00 and 22:00 on each of the last ``history_days`` days.
+
+    Orders from the last 24 hours are still open, so the undelivered report has work.
+    """
+    pizza_ids = sorted(prices)
+    orders: List[Dict[str, object]] = []
+    items: List[Dict[str, object]] = []
+    order_id = 0
+    start = datetime.combine(now.date() - timedelta(days=spec.history_days - 1), time())
+    for day in range(spec.history_days):
+        opening = start + timedelta(days=day, hours=11)
+        for _ in range(spec.orders_per_day):
+            placed_at = opening + timedelta(minutes=rng.randint(0, 11 * 60))
+            if placed_at > now:
+                continue
+            order_id += 1
+            customer_id = rng.randint(1, spec.customers)
+            total = Decimal("0.00")
+            for _ in range(rng.choice((1, 1, 2, 2, 3))):
+                pizza_id = rng.choice(pizza_ids)
+                name, price = prices[pizza_id]
+                quantity = rng.choice((1, 1, 1, 2))
+                total += price * quantity
+                items.append(_item_row(order_id, "pizza", pizza_id, None, name, quantity, price))
+            if extras and rng.random() < 0.6:
+                item_id, name, kind, price = rng.choice(extras)
+                total += price
+                items.append(_item_row(order_id, kind, None, item_id, name, 1, price))
+            recent = now - placed_at < timedelta(days=1)
+            orders.append(
+                {
+                    "order_id": order_id,
+                    "customer_id": customer_id,
+                    "delivery_postcode_id": rng.randint(1, spec.postcodes),
+                    "delivery_driver_id": rng.randint(1, spec.drivers),
+                    "status": rng.choice(_OPEN_STATUSES) if recent else "delivered",
+                    "placed_at": placed_at,
+                    "total_before_discounts": total,
+                    "discount_total": Decimal("0.00"),
+                    "total_due": total,
+                    "loyalty_discount_applied": False,
+                    "birthday_pizza_applied": False,
+                    "birthday_drink_applied": False,
+                    "notes": None,
+                }
+            )
+    return orders, items
+
+
+def _item_row(order_id, item_type, pizza_id, menu_item_id, description, quantity, unit_price):
+    return {
+        "order_id": order_id,
+        "item_type": item_type,
+        "pizza_id": pizza_id,
+        "menu_item_id": menu_item_id,
+        "description": description,
+        "quantity": quantity,
+        "unit_price": unit_price,
+        "discount_amount": Decimal("0.00"),
+    }
+
+
+__all__ = ["DatasetSpec", "DatasetSummary", "generate_dataset"]
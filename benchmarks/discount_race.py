@@ -0,0 +1,99 @@
+"""Fire parallel checkouts at one single-use discount code and check only one wins.
+
+Run with ``python -m benchmarks.discount_race``. Exits non-zero when the code
+was redeemed more than once (or never).
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+
+RACE_CODE = "RACE-ONCE"
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Generate a small dataset, race the checkouts and report the outcome."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checkouts", type=int, default=32, help="parallel checkouts using the code")
+    parser.add_argument("--rounds", type=int, default=5, help="fresh codes to race for")
+    parser.add_argument("--database-url", help="database to use (default: a temporary SQLite file)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        os.environ["DB_URL"] = args.database_url or f"sqlite:///{Path(scratch) / 'race.db'}"
+        os.environ.setdefault("SECRET_KEY", "benchmark")
+        sys.path.insert(0, str(ROOT))
+        failures = _race(args.checkouts, args.rounds)
+    return 1 if failures else 0
+
+
+def _race(checkouts: int, rounds: int) -> int:
+    from sqlalchemy import select
+
+    from app.config.app_factory import create_app
+    from app.integration.models import db
+    from app.integration.models.discount import DiscountCode
+    from app.ownership.services.order_service import OrderService
+    from benchmarks.dataset import DatasetSpec, generate_dataset
+
+    # Enough drivers that every checkout would succeed were it not for the code.
+    spec = DatasetSpec(customers=checkouts, drivers=checkouts * 2, postcodes=1, history_days=1, orders_per_day=1)
+    app = create_app()
+    service = OrderService()
+    failures = 0
+
+    for round_number in range(1, rounds + 1):
+        code = f"{RACE_CODE}-{round_number}"
+        with app.app_context():
+            if round_number == 1:
+                generate_dataset(spec)
+            db.session.add(DiscountCode(code=code, discount_value=10, is_active=True))
+            db.session.commit()
+
+        barrier = threading.Barrier(checkouts)
+        requested_at = datetime.utcnow() + timedelta(days=round_number)
+
+        def checkout(customer_id: int) -> str:
+            with app.app_context():
+                barrier.wait()
+                try:
+                    order, errors = service.place_order(
+                        customer_id=customer_id,
+                        pizzas=[{"pizza_id": 1, "quantity": 1}],
+                        # Mixed case on purpose: lookups must normalize.
+                        discount_code=code.lower() if customer_id % 2 else code,
+                        requested_at=requested_at,
+                    )
+                except Exception as exc:
+                    return type(exc).__name__
+                if errors:
+                    return ",".join(sorted(errors))
+                return "redeemed" if order.discount_code_id else "placed_without_code"
+
+        with ThreadPoolExecutor(max_workers=checkouts) as pool:
+            outcomes = Counter(pool.map(checkout, range(1, checkouts + 1)))
+
+        with app.app_context():
+            stored = db.session.execute(
+                select(DiscountCode.is_active, DiscountCode.redeemed_at).where(DiscountCode.code == code)
+            ).one()
+        winners = outcomes["redeemed"]
+        ok = winners == 1 and not stored.is_active and stored.redeemed_at is not None
+        failures += not ok
+        print(f"round {round_number}: {'ok  ' if ok else 'FAIL'} {dict(outcomes)}")
+
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Count statements and loaded rows for login, checkout and customer listing.
+
+Run with ``python -m benchmarks.loading``. Exits non-zero when an operation
+issues more statements or loads more ORM rows than its budget, which is how
+eager relationship loading creeping back into a hot path shows up.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# (statements, ORM rows loaded) each operation may use with a warm catalog and dispatcher.
+BUDGETS: Dict[str, Tuple[int, int]] = {
+    "login": (1, 1),
+    "customer_by_id": (1, 1),
+    "checkout": (9, 4),
+    "customer_listing": (1, 0),
+}
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Generate a dataset with order history, run each operation once and check its counts."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--customers", type=int, default=200)
+    parser.add_argument("--orders-per-day", type=int, default=40, help="history that eager loading would drag in")
+    parser.add_argument("--database-url", help="database to use (default: a temporary SQLite file)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        os.environ["DB_URL"] = args.database_url or f"sqlite:///{Path(scratch) / 'loading.db'}"
+        os.environ.setdefault("SECRET_KEY", "benchmark")
+        sys.path.insert(0, str(ROOT))
+        failures = _measure(args.customers, args.orders_per_day)
+    return 1 if failures else 0
+
+
+def _measure(customers: int, orders_per_day: int) -> int:
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    from app.config.app_factory import create_app
+    from app.integration.models import db
+    from app.integration.repositories.customer_repository import CustomerRepository
+    from app.ownership.services.customer_service import CustomerService
+    from app.ownership.services.order_service import OrderService
+    from benchmarks.dataset import DatasetSpec, generate_dataset
+
+    spec = DatasetSpec(customers=customers, history_days=60, orders_per_day=orders_per_day)
+    app = create_app()
+    counts = {"statements": 0, "rows": 0}
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+        counts["statements"] += 1
+
+    def count_row(session, instance) -> None:
+        counts["rows"] += 1
+
+    with app.app_context():
+        generate_dataset(spec)
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", count_statement)
+        # The customer with the longest history is the one eager loading hurts most.
+        customer_id = db.session.execute(
+            db.text("SELECT Customer_ID FROM orders GROUP BY Customer_ID ORDER BY COUNT(*) DESC LIMIT 1")
+        ).scalar_one()
+        drink_id = db.session.execute(db.text("SELECT MIN(item_id) FROM menu_items WHERE type = 'drink'")).scalar_one()
+        db.session.remove()
+
+    customer_repository = CustomerRepository()
+    order_service = OrderService()
+
+    def checkout() -> object:
+        order, errors = order_service.place_order(
+            customer_id=customer_id,
+            pizzas=[{"pizza_id": 1, "quantity": 2}],
+            drinks=[{"item_id": drink_id, "quantity": 1}],
+        )
+        if errors:
+            raise RuntimeError(f"checkout failed: {errors}")
+        return order
+
+    operations: Dict[str, Callable[[], object]] = {
+        "login": lambda: customer_repository.get_by_username(f"customer{customer_id}"),
+        "customer_by_id": lambda: customer_repository.get_by_id(customer_id),
+        "checkout": checkout,
+        "customer_listing": lambda: CustomerService().list_customers(after_id=0),
+    }
+
+    event.listen(Session, "loaded_as_persistent", count_row)
+    failures = 0
+    try:
+        with app.app_context():
+            # Hydrate the catalog cache and driver dispatcher outside the measurement.
+            checkout()
+            db.session.remove()
+        for name, operation in operations.items():
+            with app.app_context():
+                counts.update(statements=0, rows=0)
+                operation()
+                measured = (counts["statements"], counts["rows"])
+                db.session.remove()
+            statement_budget, row_budget = BUDGETS[name]
+            ok = measured[0] <= statement_budget and measured[1] <= row_budget
+            failures += not ok
+            print(
+                f"{name:18} {'ok  ' if ok else 'FAIL'} statements {measured[0]:3} (budget {statement_budget:3})"
+                f"  rows {measured[1]:4} (budget {row_budget:4})"
+            )
+    finally:
+        event.remove(Session, "loaded_as_persistent", count_row)
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(main())
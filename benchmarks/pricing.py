@@ -0,0 +1,201 @@
+"""Check the integer-cent pricing engine against the Decimal rules it replaced and time both.
+
+Run with ``python -m benchmarks.pricing``. Exits non-zero when any randomly
+generated cart is priced differently by the two engines.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from decimal import ROUND_HALF_UP, Decimal
+from typing import List, Optional, Tuple
+
+from app.ownership.rules.pricing import from_cents, price_cart, to_cents
+
+LOYALTY_RATE = Decimal("0.10")
+KINDS = ("pizza", "pizza", "pizza", "drink", "drink", "dessert")
+
+
+@dataclass
+class _Line:
+    """Stand-in for ``OrderItem`` plus the ``apply_discount`` helper the Decimal rules used."""
+
+    item_type: str
+    unit_price: Decimal
+    quantity: int
+    discount_amount: Decimal = Decimal("0.00")
+
+    def apply_discount(self, amount: Decimal) -> None:
+        if amount <= 0:
+            return
+        self.discount_amount = min(self.unit_price * self.quantity, self.discount_amount + amount)
+
+
+@dataclass
+class _Order:
+    """Stand-in for ``Order`` with its pricing flags and totals."""
+
+    items: List[_Line]
+    birthday_pizza_applied: bool = False
+    birthday_drink_applied: bool = False
+    loyalty_discount_applied: bool = False
+    total_before_discounts: Decimal = Decimal("0.00")
+    discount_total: Decimal = Decimal("0.00")
+    total_due: Decimal = Decimal("0.00")
+    code_applied: bool = field(default=False)
+
+
+def decimal_pricing(order: _Order, *, birthday: bool, loyalty: bool, code_rate: Optional[Decimal]) -> None:
+    """The Decimal rules ``OrderService`` used before the integer-cent engine, kept as the reference."""
+    if birthday:
+        pizza_items = [item for item in order.items if item.item_type == "pizza"]
+        drink_items = [item for item in order.items if item.item_type == "drink"]
+        if pizza_items:
+            target = min(pizza_items, key=lambda item: item.unit_price)
+            target.apply_discount(target.unit_price)
+            order.birthday_pizza_applied = True
+        if drink_items:
+            target = min(drink_items, key=lambda item: item.unit_price)
+            target.apply_discount(target.unit_price)
+            order.birthday_drink_applied = True
+
+    if loyalty:
+        amount = _decimal_percentage(order, LOYALTY_RATE)
+        if amount > Decimal("0"):
+            _decimal_allocate(order, amount)
+        order.loyalty_discount_applied = True
+
+    if code_rate is not None:
+        amount = _decimal_percentage(order, code_rate)
+        if amount > Decimal("0"):
+            _decimal_allocate(order, amount)
+            order.code_applied = True
+
+    gross = sum((item.unit_price * item.quantity for item in order.items), Decimal("0.00"))
+    discounts = sum((item.discount_amount for item in order.items), Decimal("0.00"))
+    order.total_before_discounts = gross.quantize(Decimal("0.01"))
+    order.discount_total = discounts.quantize(Decimal("0.01"))
+    order.total_due = (gross - discounts).quantize(Decimal("0.01"))
+
+
+def _decimal_percentage(order: _Order, percentage: Decimal) -> Decimal:
+    gross = sum((item.unit_price * item.quantity for item in order.items), Decimal("0"))
+    existing_discounts = sum((item.discount_amount for item in order.items), Decimal("0"))
+    base = gross - existing_discounts
+    if base <= Decimal("0"):
+        return Decimal("0")
+    return (base * percentage).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def _decimal_allocate(order: _Order, amount: Decimal) -> None:
+    remaining = amount
+    for item in sorted(
+        order.items,
+        key=lambda itm: itm.unit_price * itm.quantity - itm.discount_amount,
+        reverse=True,
+    ):
+        available = (item.unit_price * item.quantity) - item.discount_amount
+        if available <= Decimal("0"):
+            continue
+        apply = min(available, remaining)
+        item.apply_discount(apply)
+        remaining -= apply
+        if remaining <= Decimal("0"):
+            break
+
+
+def cent_pricing(order: _Order, *, birthday: bool, loyalty: bool, code_rate: Optional[Decimal]) -> None:
+    """What ``OrderService._apply_pricing_rules`` now does, conversions included."""
+    priced = price_cart(
+        [(item.item_type, to_cents(item.unit_price), item.quantity) for item in order.items],
+        birthday=birthday,
+        loyalty_rate=LOYALTY_RATE if loyalty else None,
+        code_rate=code_rate,
+    )
+    for item, cents in zip(order.items, priced.discounts):
+        item.discount_amount = from_cents(cents)
+    order.birthday_pizza_applied = priced.birthday_pizza
+    order.birthday_drink_applied = priced.birthday_drink
+    order.loyalty_discount_applied = priced.loyalty
+    order.code_applied = priced.code_applied
+    order.total_before_discounts = from_cents(priced.gross)
+    order.discount_total = from_cents(priced.discount_total)
+    order.total_due = from_cents(priced.total_due)
+
+
+def random_case(rng: random.Random) -> Tuple[List[Tuple[str, Decimal, int]], dict]:
+    """A cart plus rule switches, biased towards ties, free items and awkward rates."""
+    price_pool = [Decimal(rng.randint(0, 3000)).scaleb(-2) for _ in range(rng.randint(1, 4))]
+    lines = []
+    for _ in range(rng.randint(1, 10)):
+        if rng.random() < 0.6:
+            price = rng.choice(price_pool)
+        else:
+            price = Decimal(rng.choice((0, 1, 5, 99, 100, 101, 1999, 2500, rng.randint(0, 5000)))).scaleb(-2)
+        lines.append((rng.choice(KINDS), price, rng.choice((1, 1, 1, 2, 3, rng.randint(1, 20)))))
+    code_rate = None
+    if rng.random() < 0.7:
+        value = rng.choice(
+            (Decimal("5"), Decimal("10"), Decimal("15"), Decimal("100"), Decimal("0"), Decimal("-5"),
+             Decimal("150"), Decimal(rng.randint(0, 99999)).scaleb(-2))
+        )
+        code_rate = value / Decimal(100)
+    options = {"birthday": rng.random() < 0.4, "loyalty": rng.random() < 0.5, "code_rate": code_rate}
+    return lines, options
+
+
+def _order(lines) -> _Order:
+    return _Order(items=[_Line(kind, price, quantity) for kind, price, quantity in lines])
+
+
+def _outcome(order: _Order):
+    return (
+        [item.discount_amount for item in order.items],
+        order.total_before_discounts,
+        order.discount_total,
+        order.total_due,
+        order.birthday_pizza_applied,
+        order.birthday_drink_applied,
+        order.loyalty_discount_applied,
+        order.code_applied,
+    )
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Compare both engines on random carts, then time them on the same carts."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=200000, help="random carts to compare")
+    parser.add_argument("--timed", type=int, default=50000, help="carts priced per timing run")
+    parser.add_argument("--seed", type=int, default=2024)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    failures = 0
+    for index in range(args.cases):
+        lines, options = random_case(rng)
+        expected, actual = _order(lines), _order(lines)
+        decimal_pricing(expected, **options)
+        cent_pricing(actual, **options)
+        if _outcome(expected) != _outcome(actual):
+            failures += 1
+            if failures <= 5:
+                print(f"MISMATCH case {index} {lines} {options}\n  decimal {_outcome(expected)}\n  cents   {_outcome(actual)}")
+    print(f"compared {args.cases} carts: {'ok' if not failures else f'{failures} mismatches'}")
+
+    cases = [random_case(rng) for _ in range(args.timed)]
+    for label, engine in (("decimal", decimal_pricing), ("cents", cent_pricing)):
+        orders = [_order(lines) for lines, _ in cases]
+        started = time.perf_counter()
+        for order, (_, options) in zip(orders, cases):
+            engine(order, **options)
+        elapsed = time.perf_counter() - started
+        print(f"{label:8} {elapsed / len(cases) * 1e6:8.2f} us per order")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
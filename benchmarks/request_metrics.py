@@ -0,0 +1,74 @@
+"""Check that /metrics reports the rows read by SELECT-only endpoints.
+
+Run with ``python -m benchmarks.request_metrics``. Exits non-zero when an
+endpoint that only reads reports no rows, which is what happens when rows are
+taken from a driver rowcount that is not set for SELECT (sqlite3 reports -1).
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Endpoints that only read, with the request that exercises each.
+READ_ONLY_ENDPOINTS = {
+    "customers.list_customers": "/customers/?limit=25",
+    "menu.get_menu_json": "/menu/",
+}
+
+_ROWS_SAMPLE = re.compile(r'^http_request_db_rows_total\{endpoint="([^"]+)",method="GET",status="200"\} (\d+)$')
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Generate a small dataset, call each read-only endpoint and read back its row counter."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="database to use (default: a temporary SQLite file)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        os.environ["DB_URL"] = args.database_url or f"sqlite:///{Path(scratch) / 'metrics.db'}"
+        os.environ.setdefault("SECRET_KEY", "benchmark")
+        os.environ["METRICS_ENABLED"] = "1"
+        sys.path.insert(0, str(ROOT))
+        failures = _check()
+    return 1 if failures else 0
+
+
+def _check() -> int:
+    from app.config.app_factory import create_app
+    from benchmarks.dataset import DatasetSpec, generate_dataset
+
+    app = create_app()
+    with app.app_context():
+        generate_dataset(DatasetSpec(customers=100, history_days=1, orders_per_day=1))
+
+    client = app.test_client()
+    for path in READ_ONLY_ENDPOINTS.values():
+        response = client.get(path)
+        if response.status_code != 200:
+            print(f"GET {path} answered {response.status_code}")
+            return 1
+
+    rows: Dict[str, int] = {}
+    for line in client.get("/metrics").get_data(as_text=True).splitlines():
+        match = _ROWS_SAMPLE.match(line)
+        if match:
+            rows[match.group(1)] = int(match.group(2))
+
+    failures = 0
+    for endpoint in READ_ONLY_ENDPOINTS:
+        counted = rows.get(endpoint, 0)
+        ok = counted > 0
+        failures += not ok
+        print(f"{endpoint:28} {'ok  ' if ok else 'FAIL'} rows {counted}")
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Measure worker boot time in eager and lazy application modes.
+
+Run with ``python -m benchmarks.startup``. Each worker is a fresh interpreter
+so module import costs are measured from a cold ``sys.modules``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+
+MODES = {"eager": "0", "lazy": "1"}
+
+# Executed inside each worker; prints one JSON line with its timings.
+_WORKER = """
+import json, sys, time
+started = time.perf_counter()
+from app.config.app_factory import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+booted_modules = len(sys.modules)
+response = app.test_client().get(sys.argv[1])
+finished = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000.0,
+    "create_app_ms": (created - imported) * 1000.0,
+    "first_request_ms": (finished - created) * 1000.0,
+    "time_to_first_request_ms": (finished - started) * 1000.0,
+    "status": response.status_code,
+    "modules_at_boot": booted_modules,
+    "modules_after_request": len(sys.modules),
+}))
+"""
+
+METRICS = (
+    "import_ms", "create_app_ms", "first_request_ms", "time_to_first_request_ms",
+    "modules_at_boot", "modules_after_request",
+)
+
+
+def _worker_env(database_url: str, lazy: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update(
+        DB_URL=database_url,
+        LAZY_APP=lazy,
+        SECRET_KEY="benchmark",
+        RESET_DB_ON_STARTUP="0",
+    )
+    return env
+
+
+def prepare_database(database_url: str) -> None:
+    """Migrate the benchmark database once so workers only compare fingerprints."""
+    _run(
+        [sys.executable, "-c", "from app.config.app_factory import create_app; create_app()"],
+        cwd=ROOT,
+        env=_worker_env(database_url, "0"),
+    )
+
+
+def run_worker(database_url: str, lazy: str, path: str) -> Dict[str, float]:
+    """Boot one worker process and return its timings."""
+    completed = _run([sys.executable, "-c", _WORKER, path], cwd=ROOT, env=_worker_env(database_url, lazy))
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _run(command: List[str], **kwargs) -> subprocess.CompletedProcess:
+    """Run a child interpreter, surfacing its stderr when it fails."""
+    completed = subprocess.run(command, capture_output=True, text=True, **kwargs)
+    if completed.returncode != 0:
+        raise SystemExit(f"worker failed with exit code {completed.returncode}:\n{completed.stderr}")
+    return completed
+
+
+def summarize(samples: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """Return median, min and max for every metric."""
+    return {
+        metric: {
+            "median": statistics.median(sample[metric] for sample in samples),
+            "min": min(sample[metric] for sample in samples),
+            "max": max(sample[metric] for sample in samples),
+        }
+        for metric in METRICS
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Parse arguments, run the workers and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=5, help="worker processes per mode")
+    parser.add_argument("--path", default="/menu/", help="URL requested by each worker")
+    parser.add_argument("--database-url", help="database to boot against (default: the app's DB_URL)")
+    parser.add_argument("--json", action="store_true", help="print raw samples and summary as JSON")
+    args = parser.parse_args(argv)
+
+    from app.config.app_config import AppConfig
+
+    database_url = args.database_url or AppConfig().database_uri
+    prepare_database(database_url)
+    results = {}
+    for mode, lazy in MODES.items():
+        samples = [run_worker(database_url, lazy, args.path) for _ in range(args.workers)]
+        results[mode] = {"samples": samples, "summary": summarize(samples)}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{args.workers} workers per mode, first request GET {args.path}")
+    print(f"{'mode':<6} {'metric':<26} {'median':>10} {'min':>10} {'max':>10}")
+    for mode, result in results.items():
+        for metric, values in result["summary"].items():
+            print(
+                f"{mode:<6} {metric:<26} {values['median']:>10.1f} {values['min']:>10.1f} {values['max']:>10.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    status = main()
+    print(f"done in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    sys.exit(status)